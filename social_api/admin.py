@@ -1,7 +1,10 @@
 from django.contrib import admin
 
-from social_api.models import Post, Like, Comment
+from social_api.models import Post, Like, Comment, Hashtag, MediaBlob, ScheduledPost
 
 admin.site.register(Post)
 admin.site.register(Like)
 admin.site.register(Comment)
+admin.site.register(Hashtag)
+admin.site.register(MediaBlob)
+admin.site.register(ScheduledPost)
@@ -0,0 +1,166 @@
+"""
+Async variants of the read-heavy endpoints.
+
+Under ASGI these views await the database instead of holding a worker
+thread for the whole request, so slow clients don't tie up the thread pool.
+They render the same JSON as the DRF views they mirror, which remain the
+primary API; see ``manage.py benchmark_async`` for how the two compare.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.views import View
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    NotAuthenticated,
+    Throttled,
+)
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from social_media_api.replicas import AsyncReplicaReadsMixin
+from .conditional import (
+    apost_validators,
+    not_modified,
+    post_list_etag,
+    set_validators,
+)
+from .fieldsets import get_fieldset, narrow_queryset
+from .models import Post, Comment
+from .pagination import CommentCursorPagination, PostCursorPagination
+from .serializers import CommentSerializer, PostDetailSerializer, PostListSerializer
+from .views import filter_comments, filter_posts
+
+
+class AsyncAPIView(View):
+    """
+    The parts of ``APIView`` that read-only async handlers need: the
+    configured authentication and throttles, and DRF-style JSON errors.
+    """
+
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+    login_required = True
+    serializer_class = None
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request)
+        try:
+            await self.initial(request)
+            response = await super().dispatch(request, *args, **kwargs)
+        except (APIException, Http404) as exc:
+            response = self.handle_exception(request, exc)
+        if isinstance(response, Response):
+            response = self.finalize(response)
+        return response
+
+    async def initial(self, request):
+        # Authenticators and throttles read the database and cache
+        # synchronously.
+        request.user, request.auth = await sync_to_async(self.authenticate)(request)
+        if self.login_required and not request.user.is_authenticated:
+            raise NotAuthenticated()
+        await self.check_throttles(request)
+
+    def authenticate(self, request):
+        for authenticator in self.get_authenticators():
+            result = authenticator.authenticate(request)
+            if result is not None:
+                return result
+        return AnonymousUser(), None
+
+    async def check_throttles(self, request):
+        durations = []
+        for throttle in self.get_throttles():
+            if not await sync_to_async(throttle.allow_request)(request, self):
+                durations.append(throttle.wait())
+        if durations:
+            durations = [duration for duration in durations if duration is not None]
+            raise Throttled(max(durations, default=None))
+
+    def get_authenticators(self):
+        return [auth() for auth in self.authentication_classes]
+
+    def get_throttles(self):
+        return [throttle() for throttle in self.throttle_classes]
+
+    def get_serializer_context(self, request):
+        return {"request": request, "view": self}
+
+    def get_serializer(self, request, *args, **kwargs):
+        """Like ``SparseFieldsetMixin``, honour ``?fields=`` and ``?expand=``."""
+        kwargs.update(get_fieldset(request, self.serializer_class) or {})
+        kwargs["context"] = self.get_serializer_context(request)
+        return self.serializer_class(*args, **kwargs)
+
+    def filter_fields(self, request, queryset, ordering_field=None):
+        # Expanded relations must be joined in: async code can't lazy-load.
+        if get_fieldset(request, self.serializer_class) is None:
+            return queryset
+        return narrow_queryset(queryset, self.get_serializer(request), ordering_field)
+
+    def handle_exception(self, request, exc):
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            exc.auth_header = self.get_authenticators()[0].authenticate_header(request)
+        return exception_handler(exc, {"view": self, "request": request})
+
+    def finalize(self, response):
+        response.accepted_renderer = JSONRenderer()
+        response.accepted_media_type = "application/json"
+        response.renderer_context = {}
+        return response.render()
+
+
+class PostListView(AsyncReplicaReadsMixin, AsyncAPIView):
+    serializer_class = PostListSerializer
+
+    async def get(self, request):
+        queryset = filter_posts(
+            Post.objects.all(), request.user, request.query_params, listing=True
+        )
+        paginator = PostCursorPagination()
+        queryset = self.filter_fields(request, queryset, paginator.ordering_field)
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        etag = post_list_etag(request, page, paginator.has_next)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
+        serializer = self.get_serializer(request, page, many=True)
+        return set_validators(paginator.get_paginated_response(serializer.data), etag)
+
+
+class PostDetailView(AsyncReplicaReadsMixin, AsyncAPIView):
+    serializer_class = PostDetailSerializer
+
+    async def get(self, request, pk):
+        validators = await apost_validators(request, pk)
+        if validators is None:
+            raise Http404
+        response = not_modified(request, *validators)
+        if response is not None:
+            return response
+
+        try:
+            post = await self.filter_fields(request, Post.objects.all()).aget(pk=pk)
+        except Post.DoesNotExist:
+            raise Http404
+        serializer = self.get_serializer(request, post)
+        return set_validators(Response(serializer.data), *validators)
+
+
+class CommentListView(AsyncReplicaReadsMixin, AsyncAPIView):
+    serializer_class = CommentSerializer
+
+    async def get(self, request):
+        queryset = filter_comments(Comment.objects.all(), request.query_params)
+        paginator = CommentCursorPagination()
+        queryset = self.filter_fields(request, queryset, paginator.ordering_field)
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(request, page, many=True)
+        return paginator.get_paginated_response(serializer.data)
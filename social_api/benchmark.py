@@ -0,0 +1,855 @@
+"""
+Query-count and latency benchmark for every API route.
+
+``seed()`` fills the database with synthetic users, posts, likes, comments
+and follows; ``run()`` replays each endpoint through the test client and
+records SQL query counts, p50/p95 latency and response size. Reports are
+plain JSON so they can be diffed across commits with ``compare()``.
+``compare_modes()`` serves endpoints with async variants to many concurrent
+clients and reports the throughput of both. ``seed_user_search()`` fills
+the users table alone, at the million-user scale typeahead search is meant
+for. Use them through ``manage.py benchmark_api``, ``benchmark_async`` and
+``benchmark_user_search``.
+"""
+
+import asyncio
+import io
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import timedelta
+from dataclasses import dataclass
+from statistics import median
+from typing import Callable
+from unittest import mock
+from urllib.parse import quote
+
+from asgiref.sync import async_to_sync
+from celery.app.task import Task
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.storage import storages
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connections as databases
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import get_resolver, reverse
+from django.utils import timezone
+from PIL import Image
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from social_api.async_views import AsyncAPIView
+from social_api.export import export_path
+from social_api.models import Post, Like, Comment, ScheduledPost
+from social_api.search import get_search_backend
+from social_api.tasks import backfill_timeline, export_user_data
+from user.models import Follow, UserSearchToken
+from user.search import index_users
+from user.utils import search_tokens
+
+User = get_user_model()
+
+PASSWORD = "benchmark-password"
+NAMESPACES = {"social_api": "social", "user": "user"}
+HASHTAGS = ["django", "python", "celery", "redis", "sqlite", "api", "news", "cats"]
+WORDS = (
+    "the quick brown fox jumps over lazy dog while shipping fast scalable "
+    "social media posts with comments likes and followers every day"
+).split()
+NAME_SYLLABLES = (
+    "an bel cor da el fi gar ho is jo ka lu mar ne ol pe qui ro sa ti ul vi "
+    "wen xa yo zel"
+).split()
+# A common prefix, a rarer one, two words and a miss.
+USER_SEARCH_QUERIES = ("mar", "marelo", "kalu maro", "qqq")
+
+
+@dataclass
+class Endpoint:
+    name: str
+    route: str
+    method: str
+    build: Callable
+    format: str = "json"
+    # Send the body as-is with this content type instead of rendering it.
+    content_type: str = None
+
+
+def seed(users=100, posts=1000, likes=5000, comments=2000, follows=1000, seed=0):
+    """Create a synthetic data set and return the context endpoints need."""
+    rng = random.Random(seed)
+    password = make_password(PASSWORD)
+
+    User.objects.bulk_create(
+        [
+            User(email=f"bench{i}@example.com", password=password, bio=random_text(rng))
+            for i in range(users)
+        ],
+        batch_size=1000,
+    )
+    user_ids = list(User.objects.order_by("pk").values_list("pk", flat=True))
+    viewer_id = user_ids[0]
+
+    Post.objects.bulk_create(
+        [
+            Post(
+                author_id=rng.choice(user_ids),
+                content=random_text(rng),
+                hashtags=" ".join(rng.sample(HASHTAGS, 2)),
+            )
+            for _ in range(posts)
+        ],
+        batch_size=1000,
+    )
+    post_rows = list(Post.objects.values_list("pk", "author_id"))
+    search = get_search_backend()
+    for post in Post.objects.only("hashtags", "content").iterator():
+        post.sync_hashtags()
+        search.index("post", post.pk, post.content)
+
+    Like.objects.bulk_create(
+        [
+            Like(user_id=rng.choice(user_ids), post_id=rng.choice(post_rows)[0])
+            for _ in range(likes)
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    Comment.objects.bulk_create(
+        [
+            Comment(
+                user_id=rng.choice(user_ids),
+                post_id=rng.choice(post_rows)[0],
+                content=random_text(rng),
+            )
+            for _ in range(comments)
+        ],
+        batch_size=1000,
+    )
+    Comment.objects.set_root_paths()
+    for comment in Comment.objects.only("content").iterator():
+        search.index("comment", comment.pk, comment.content)
+    call_command("recount_post_counters", stdout=io.StringIO())
+
+    # The viewer follows a tenth of the accounts so the following feed is busy.
+    edges = {(viewer_id, followee) for followee in user_ids[1 : users // 10 + 2]}
+    while len(edges) < follows and users > 1:
+        follower, followee = rng.sample(user_ids, 2)
+        edges.add((follower, followee))
+    Follow.objects.bulk_create(
+        [Follow(follower_id=a, followee_id=b) for a, b in edges],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    User.objects.update(
+        followers_count=count_edges("followee"),
+        following_count=count_edges("follower"),
+    )
+    index_users(User.objects.all())
+    for follower, followee in edges:
+        backfill_timeline(follower, followee)
+
+    viewer = User.objects.get(pk=viewer_id)
+    others = [pk for pk in user_ids if pk != viewer_id]
+    return {
+        "rng": rng,
+        "viewer": viewer,
+        "other_ids": others,
+        "post_ids": [pk for pk, author in post_rows if author != viewer_id],
+        "volumes": {
+            "users": users,
+            "posts": posts,
+            "likes": Like.objects.count(),
+            "comments": comments,
+            "follows": Follow.objects.count(),
+        },
+    }
+
+
+def seed_user_search(users=1_000_000, seed=0, batch_size=5000):
+    """
+    Create ``users`` users with synthetic names and bios, and their search
+    tokens, and return the context ``run()`` needs. Nothing else is seeded.
+    """
+    rng = random.Random(seed)
+    password = make_password(PASSWORD)
+    for start in range(0, users, batch_size):
+        batch = []
+        for i in range(start, min(start + batch_size, users)):
+            first = "".join(rng.choices(NAME_SYLLABLES, k=2))
+            last = "".join(rng.choices(NAME_SYLLABLES, k=3))
+            batch.append(
+                User(
+                    email=f"{first}.{last}{i}@example.com",
+                    password=password,
+                    first_name=first.title(),
+                    last_name=last.title(),
+                    bio=random_text(rng, words=6),
+                    followers_count=int(rng.paretovariate(1.5)) - 1,
+                )
+            )
+        # bulk_create() skips signals; index the batch like index_users().
+        batch = User.objects.bulk_create(batch)
+        UserSearchToken.objects.bulk_create(
+            [
+                UserSearchToken(
+                    user=user,
+                    token=token,
+                    weight=weight,
+                    followers_count=user.followers_count,
+                )
+                for user in batch
+                for token, weight in search_tokens(user).items()
+            ],
+            batch_size=batch_size,
+        )
+    return {
+        "rng": rng,
+        "viewer": User.objects.order_by("pk").first(),
+        "volumes": {"users": users, "tokens": UserSearchToken.objects.count()},
+    }
+
+
+USER_SEARCH_ENDPOINTS = [
+    Endpoint(
+        f"user search {query!r}",
+        "user:user-search",
+        "GET",
+        lambda c, query=query: (url("user:user-search") + f"?q={quote(query)}", None),
+    )
+    for query in USER_SEARCH_QUERIES
+]
+
+
+def count_edges(field):
+    counts = (
+        Follow.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def random_text(rng, words=12):
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return f"{text} #{rng.choice(HASHTAGS)}"
+
+
+def other_post(ctx):
+    return ctx["rng"].choice(ctx["post_ids"])
+
+
+def fresh_user(ctx):
+    return User.objects.create(
+        email=f"fresh{time.perf_counter_ns()}@example.com",
+        password=make_password(PASSWORD),
+    )
+
+
+def fresh_post(ctx, author=None):
+    author = author or User.objects.get(pk=ctx["rng"].choice(ctx["other_ids"]))
+    return Post.objects.create(author=author, content=random_text(ctx["rng"]))
+
+
+def sample_image():
+    buffer = io.BytesIO()
+    Image.new("RGB", (1200, 900), "teal").save(buffer, format="JPEG")
+    return SimpleUploadedFile("bench.jpg", buffer.getvalue(), "image/jpeg")
+
+
+def fresh_comment(ctx):
+    return Comment.objects.create(
+        user=ctx["viewer"], post_id=other_post(ctx), content="benchmark comment"
+    )
+
+
+def fresh_scheduled_post(ctx):
+    return ScheduledPost.objects.create(
+        author=ctx["viewer"],
+        content=random_text(ctx["rng"]),
+        publish_at=timezone.now() + timedelta(hours=1),
+    )
+
+
+def fresh_refresh_token(ctx):
+    return str(RefreshToken.for_user(ctx["viewer"]))
+
+
+def stored_export(ctx):
+    file_name = "benchmark.csv.gz"
+    name = export_path(ctx["viewer"].id, file_name)
+    if not storages["exports"].exists(name):
+        export_user_data(ctx["viewer"].id, "csv", name)
+    return file_name
+
+
+def url(route, *args):
+    return reverse(route, args=args)
+
+
+ENDPOINTS = [
+    Endpoint(
+        "api root",
+        "social_api:api-root",
+        "GET",
+        lambda c: (url("social_api:api-root"), None),
+    ),
+    Endpoint(
+        "posts list",
+        "social_api:post-list",
+        "GET",
+        lambda c: (url("social_api:post-list"), None),
+    ),
+    Endpoint(
+        "posts list by id",
+        "social_api:post-list",
+        "GET",
+        lambda c: (url("social_api:post-list") + f"?post={other_post(c)}", None),
+    ),
+    Endpoint(
+        "posts list by date",
+        "social_api:post-list",
+        "GET",
+        lambda c: (
+            url("social_api:post-list") + f"?date={time.strftime('%Y-%m-%d')}",
+            None,
+        ),
+    ),
+    Endpoint(
+        "posts list liked",
+        "social_api:post-list",
+        "GET",
+        lambda c: (url("social_api:post-list") + "?liked", None),
+    ),
+    Endpoint(
+        "posts list by hashtags",
+        "social_api:post-list",
+        "GET",
+        lambda c: (url("social_api:post-list") + "?hashtags=django,python", None),
+    ),
+    Endpoint(
+        "posts list following",
+        "social_api:post-list",
+        "GET",
+        lambda c: (url("social_api:post-list") + "?filter_by=following", None),
+    ),
+    Endpoint(
+        "posts list own",
+        "social_api:post-list",
+        "GET",
+        lambda c: (url("social_api:post-list") + "?filter_by=own", None),
+    ),
+    Endpoint(
+        "posts list sparse",
+        "social_api:post-list",
+        "GET",
+        lambda c: (url("social_api:post-list") + "?fields=id,content", None),
+    ),
+    Endpoint(
+        "posts list expand",
+        "social_api:post-list",
+        "GET",
+        lambda c: (url("social_api:post-list") + "?expand=author", None),
+    ),
+    Endpoint(
+        "posts retrieve",
+        "social_api:post-detail",
+        "GET",
+        lambda c: (url("social_api:post-detail", other_post(c)), None),
+    ),
+    Endpoint(
+        "async posts list",
+        "social_api:async-post-list",
+        "GET",
+        lambda c: (url("social_api:async-post-list"), None),
+    ),
+    Endpoint(
+        "async posts list following",
+        "social_api:async-post-list",
+        "GET",
+        lambda c: (url("social_api:async-post-list") + "?filter_by=following", None),
+    ),
+    Endpoint(
+        "async posts retrieve",
+        "social_api:async-post-detail",
+        "GET",
+        lambda c: (url("social_api:async-post-detail", other_post(c)), None),
+    ),
+    Endpoint(
+        "posts create",
+        "social_api:post-list",
+        "POST",
+        lambda c: (
+            url("social_api:post-list"),
+            {"content": "bench #django", "hashtags": "api"},
+        ),
+    ),
+    Endpoint(
+        "posts delete",
+        "social_api:post-detail",
+        "DELETE",
+        lambda c: (url("social_api:post-detail", fresh_post(c, c["viewer"]).pk), None),
+    ),
+    Endpoint(
+        "posts upload image",
+        "social_api:post-upload-image",
+        "POST",
+        lambda c: (
+            url("social_api:post-upload-image", fresh_post(c, c["viewer"]).pk),
+            {"post_picture": sample_image()},
+        ),
+        format="multipart",
+    ),
+    Endpoint(
+        "posts import",
+        "social_api:post-import-posts",
+        "POST",
+        lambda c: (
+            url("social_api:post-import-posts"),
+            "\n".join(
+                json.dumps({"content": random_text(c["rng"])}) for _ in range(50)
+            ),
+        ),
+        content_type="application/x-ndjson",
+    ),
+    Endpoint(
+        "posts schedule",
+        "social_api:post-schedule-post-creation",
+        "POST",
+        lambda c: (
+            url("social_api:post-schedule-post-creation"),
+            {"content": "later", "delay_minutes": 5},
+        ),
+    ),
+    Endpoint(
+        "scheduled posts list",
+        "social_api:scheduledpost-list",
+        "GET",
+        lambda c: (url("social_api:scheduledpost-list"), None),
+    ),
+    Endpoint(
+        "scheduled posts retrieve",
+        "social_api:scheduledpost-detail",
+        "GET",
+        lambda c: (
+            url("social_api:scheduledpost-detail", fresh_scheduled_post(c).pk),
+            None,
+        ),
+    ),
+    Endpoint(
+        "scheduled posts update",
+        "social_api:scheduledpost-detail",
+        "PATCH",
+        lambda c: (
+            url("social_api:scheduledpost-detail", fresh_scheduled_post(c).pk),
+            {"content": "edited"},
+        ),
+    ),
+    Endpoint(
+        "scheduled posts cancel",
+        "social_api:scheduledpost-detail",
+        "DELETE",
+        lambda c: (
+            url("social_api:scheduledpost-detail", fresh_scheduled_post(c).pk),
+            None,
+        ),
+    ),
+    Endpoint(
+        "likes create",
+        "social_api:like-list",
+        "POST",
+        lambda c: (url("social_api:like-list"), {"post": fresh_post(c).pk}),
+    ),
+    Endpoint(
+        "likes delete",
+        "social_api:like-detail",
+        "DELETE",
+        lambda c: (
+            url(
+                "social_api:like-detail",
+                Like.objects.create(user=c["viewer"], post=fresh_post(c)).post_id,
+            ),
+            None,
+        ),
+    ),
+    Endpoint(
+        "likes batch",
+        "social_api:like-batch",
+        "POST",
+        lambda c: (
+            url("social_api:like-batch"),
+            {"like": [fresh_post(c).pk for _ in range(10)]},
+        ),
+    ),
+    Endpoint(
+        "comments list",
+        "social_api:comment-list",
+        "GET",
+        lambda c: (url("social_api:comment-list") + f"?post={other_post(c)}", None),
+    ),
+    Endpoint(
+        "async comments list",
+        "social_api:async-comment-list",
+        "GET",
+        lambda c: (
+            url("social_api:async-comment-list") + f"?post={other_post(c)}",
+            None,
+        ),
+    ),
+    Endpoint(
+        "comments threads",
+        "social_api:comment-threads",
+        "GET",
+        lambda c: (url("social_api:comment-threads") + f"?post={other_post(c)}", None),
+    ),
+    Endpoint(
+        "comments thread",
+        "social_api:comment-thread",
+        "GET",
+        lambda c: (url("social_api:comment-thread", fresh_comment(c).pk), None),
+    ),
+    Endpoint(
+        "comments create",
+        "social_api:comment-list",
+        "POST",
+        lambda c: (
+            url("social_api:comment-list"),
+            {"post": other_post(c), "content": "hi"},
+        ),
+    ),
+    Endpoint(
+        "comments retrieve",
+        "social_api:comment-detail",
+        "GET",
+        lambda c: (url("social_api:comment-detail", fresh_comment(c).pk), None),
+    ),
+    Endpoint(
+        "comments update",
+        "social_api:comment-detail",
+        "PATCH",
+        lambda c: (
+            url("social_api:comment-detail", fresh_comment(c).pk),
+            {"content": "edited"},
+        ),
+    ),
+    Endpoint(
+        "comments delete",
+        "social_api:comment-detail",
+        "DELETE",
+        lambda c: (url("social_api:comment-detail", fresh_comment(c).pk), None),
+    ),
+    Endpoint(
+        "search",
+        "social_api:search",
+        "GET",
+        lambda c: (url("social_api:search") + "?q=quick+fox", None),
+    ),
+    Endpoint(
+        "export ndjson",
+        "social_api:export",
+        "GET",
+        lambda c: (url("social_api:export"), None),
+    ),
+    Endpoint(
+        "export csv",
+        "social_api:export",
+        "GET",
+        lambda c: (url("social_api:export") + "?export_format=csv", None),
+    ),
+    Endpoint(
+        "export background",
+        "social_api:export",
+        "POST",
+        lambda c: (url("social_api:export"), {"export_format": "csv"}),
+    ),
+    Endpoint(
+        "export download",
+        "social_api:export-download",
+        "GET",
+        lambda c: (url("social_api:export-download", stored_export(c)), None),
+    ),
+    Endpoint(
+        "user register",
+        "user:create",
+        "POST",
+        lambda c: (
+            url("user:create"),
+            {"email": f"new{time.perf_counter_ns()}@example.com", "password": PASSWORD},
+        ),
+    ),
+    Endpoint(
+        "token obtain",
+        "user:token_obtain_pair",
+        "POST",
+        lambda c: (
+            url("user:token_obtain_pair"),
+            {"email": c["viewer"].email, "password": PASSWORD},
+        ),
+    ),
+    Endpoint(
+        "token refresh",
+        "user:token_refresh",
+        "POST",
+        lambda c: (url("user:token_refresh"), {"refresh": fresh_refresh_token(c)}),
+    ),
+    Endpoint(
+        "token verify",
+        "user:token_verify",
+        "POST",
+        lambda c: (url("user:token_verify"), {"token": fresh_refresh_token(c)}),
+    ),
+    Endpoint("me", "user:manage", "GET", lambda c: (url("user:manage"), None)),
+    Endpoint(
+        "me update",
+        "user:manage",
+        "PATCH",
+        lambda c: (url("user:manage"), {"bio": "updated"}),
+    ),
+    Endpoint(
+        "profiles list",
+        "user:profile",
+        "GET",
+        lambda c: (url("user:profile") + "?email=bench1", None),
+    ),
+    Endpoint(
+        "user search",
+        "user:user-search",
+        "GET",
+        lambda c: (url("user:user-search") + "?q=bench1", None),
+    ),
+    Endpoint(
+        "profile retrieve",
+        "user:user-profile",
+        "GET",
+        lambda c: (url("user:user-profile", c["viewer"].email), None),
+    ),
+    Endpoint(
+        "async profile retrieve",
+        "user:async-user-profile",
+        "GET",
+        lambda c: (url("user:async-user-profile", c["viewer"].email), None),
+    ),
+    Endpoint(
+        "profile update",
+        "user:user-profile",
+        "PATCH",
+        lambda c: (url("user:user-profile", c["viewer"].email), {"bio": "patched"}),
+    ),
+    Endpoint(
+        "profile delete",
+        "user:user-profile",
+        "DELETE",
+        lambda c: (url("user:user-profile", fresh_user(c).email), None),
+    ),
+    Endpoint(
+        "follow",
+        "user:follow-unfollow",
+        "POST",
+        lambda c: (url("user:follow-unfollow"), {"email": fresh_user(c).email}),
+    ),
+    Endpoint(
+        "unfollow",
+        "user:follow-unfollow",
+        "DELETE",
+        lambda c: (url("user:follow-unfollow"), {"email": followed_user(c).email}),
+    ),
+    Endpoint(
+        "following list",
+        "user:follow-unfollow",
+        "GET",
+        lambda c: (url("user:follow-unfollow") + "?view_type=following", None),
+    ),
+    Endpoint(
+        "followers list",
+        "user:follow-unfollow",
+        "GET",
+        lambda c: (url("user:follow-unfollow") + "?view_type=followers", None),
+    ),
+    Endpoint(
+        "logout",
+        "user:logout",
+        "POST",
+        lambda c: (url("user:logout"), {"refresh": fresh_refresh_token(c)}),
+    ),
+]
+
+
+def followed_user(ctx):
+    user = fresh_user(ctx)
+    ctx["viewer"].follow(user)
+    return user
+
+
+# Endpoints with an async variant, for compare_modes().
+ASYNC_VARIANTS = {
+    "posts list": "async posts list",
+    "posts list following": "async posts list following",
+    "posts retrieve": "async posts retrieve",
+    "comments list": "async comments list",
+    "profile retrieve": "async profile retrieve",
+}
+
+
+def run(ctx, iterations=20, endpoints=None):
+    """Replay every endpoint ``iterations`` times and return per-endpoint stats."""
+    client = APIClient()
+    access = str(RefreshToken.for_user(ctx["viewer"]).access_token)
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    results = {}
+    # Throttling would reject most of the replayed requests, and queued
+    # Celery tasks run on workers, not inside the request being measured.
+    with mock.patch.object(APIView, "check_throttles"), mock.patch.object(
+        AsyncAPIView, "check_throttles"
+    ), mock.patch.object(
+        Task, "apply_async"
+    ), tempfile.TemporaryDirectory() as media_root, override_settings(
+        MEDIA_ROOT=media_root,
+        STORAGES={
+            **settings.STORAGES,
+            "exports": {
+                "BACKEND": "django.core.files.storage.FileSystemStorage",
+                "OPTIONS": {"location": os.path.join(media_root, "exports")},
+            },
+        },
+    ):
+        for endpoint in endpoints or ENDPOINTS:
+            results[endpoint.name] = measure(client, ctx, endpoint, iterations)
+    return results
+
+
+def measure(client, ctx, endpoint, iterations):
+    queries, latencies, sizes, statuses = [], [], [], set()
+    request = getattr(client, endpoint.method.lower())
+    for _ in range(iterations):
+        path, data = endpoint.build(ctx)
+        with capture_queries() as captured:
+            start = time.perf_counter()
+            if endpoint.content_type:
+                response = request(path, data, content_type=endpoint.content_type)
+            else:
+                response = request(path, data, format=endpoint.format)
+            content = (
+                b"".join(response.streaming_content)
+                if response.streaming
+                else response.content
+            )
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(sum(map(len, captured)))
+        sizes.append(len(content))
+        statuses.add(response.status_code)
+    return {
+        "route": endpoint.route,
+        "method": endpoint.method,
+        "queries": max(queries),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "bytes": int(median(sizes)),
+        "status": sorted(statuses),
+    }
+
+
+@contextmanager
+def capture_queries():
+    """Capture the queries of every database, replicas included."""
+    # The log is capped; once seeding fills it, new queries don't add up.
+    for alias in databases:
+        databases[alias].queries_log.clear()
+    with ExitStack() as stack:
+        yield [
+            stack.enter_context(CaptureQueriesContext(databases[alias]))
+            for alias in databases
+        ]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def compare_modes(ctx, connections=50, requests=500):
+    """
+    Serve each endpoint in ``ASYNC_VARIANTS`` and its async variant to
+    ``connections`` concurrent clients, and return the requests per second
+    of both.
+    """
+    endpoints = {endpoint.name: endpoint for endpoint in ENDPOINTS}
+    access = str(RefreshToken.for_user(ctx["viewer"]).access_token)
+    client = AsyncClient()
+    headers = {"Authorization": f"Bearer {access}"}
+
+    results = {}
+    with mock.patch.object(APIView, "check_throttles"), mock.patch.object(
+        AsyncAPIView, "check_throttles"
+    ):
+        for sync_name, async_name in ASYNC_VARIANTS.items():
+            results[sync_name] = {}
+            for mode, name in (("sync", sync_name), ("async", async_name)):
+                paths = [endpoints[name].build(ctx)[0] for _ in range(requests)]
+                results[sync_name][mode] = async_to_sync(throughput)(
+                    client, paths, headers, connections
+                )
+    return results
+
+
+async def throughput(client, paths, headers, connections):
+    pending = iter(paths)
+    statuses = set()
+
+    async def connection():
+        for path in pending:
+            response = await client.get(path, headers=headers)
+            statuses.add(response.status_code)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(connection() for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    return {"rps": round(len(paths) / elapsed, 1), "status": sorted(statuses)}
+
+
+def uncovered_routes(endpoints=None):
+    """Named routes of the social and user APIs no endpoint exercises."""
+    covered = {endpoint.route for endpoint in endpoints or ENDPOINTS}
+    resolver = get_resolver()
+    missing = []
+    for app_name, namespace in NAMESPACES.items():
+        names = resolver.namespace_dict[namespace][1].reverse_dict.keys()
+        for name in sorted(name for name in names if isinstance(name, str)):
+            if f"{app_name}:{name}" not in covered:
+                missing.append(f"{app_name}:{name}")
+    return missing
+
+
+def compare(report, baseline, latency_tolerance=0.25):
+    """
+    Return ``(regressions, warnings)`` against a baseline report.
+
+    More SQL queries than the baseline is a regression; p95 latency above
+    the baseline by more than ``latency_tolerance`` is only a warning, as
+    timings are noisy across machines.
+    """
+    regressions, warnings = [], []
+    for name, result in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if before is None:
+            continue
+        if result["queries"] > before["queries"]:
+            regressions.append(
+                f"{name}: {before['queries']} -> {result['queries']} queries"
+            )
+        if result["p95_ms"] > before["p95_ms"] * (1 + latency_tolerance):
+            warnings.append(f"{name}: p95 {before['p95_ms']}ms -> {result['p95_ms']}ms")
+    return regressions, warnings
@@ -0,0 +1,32 @@
+"""
+Bookkeeping for posts created with ``bulk_create``.
+
+``bulk_create`` skips ``Post.save()`` and its signals, so the hashtag links
+and search entries they maintain are handled here, a batch at a time.
+"""
+
+from .models import Hashtag, PostHashtag
+from .search import get_search_backend
+from .utils import parse_hashtags
+
+
+def index_posts(posts):
+    """Link hashtags and index the content of newly created ``posts``."""
+    tags = {post.pk: parse_hashtags(post.hashtags, post.content) for post in posts}
+    names = set().union(*tags.values())
+    if names:
+        Hashtag.objects.bulk_create(
+            [Hashtag(name=name) for name in names], ignore_conflicts=True
+        )
+        hashtag_ids = dict(
+            Hashtag.objects.filter(name__in=names).values_list("name", "id")
+        )
+        PostHashtag.objects.bulk_create(
+            [
+                PostHashtag(post_id=post_id, hashtag_id=hashtag_ids[name])
+                for post_id, post_names in tags.items()
+                for name in post_names
+            ],
+            ignore_conflicts=True,
+        )
+    get_search_backend().index_many("post", [(post.pk, post.content) for post in posts])
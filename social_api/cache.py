@@ -0,0 +1,66 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+POST_VERSION_KEY = "post:{post_id}:version"
+POST_DETAIL_KEY = "post:{post_id}:v{version}:entry"
+LOCK_POLL_INTERVAL = 0.05
+
+
+def get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock rather than 1 so an evicted version key can't
+        # bring back entries cached under an older version.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def get_post_version(post_id):
+    return get_version(POST_VERSION_KEY.format(post_id=post_id))
+
+
+def invalidate_post(post_id):
+    """Orphan every cached representation of the post by bumping its version."""
+    bump_version(POST_VERSION_KEY.format(post_id=post_id))
+
+
+def get_post_detail(post_id, build):
+    """
+    Return the cached representation of a post, calling ``build`` on a miss.
+
+    Only one caller recomputes a missing entry; concurrent callers wait for
+    it for up to POST_DETAIL_LOCK_TIMEOUT seconds before building their own.
+    """
+    key = POST_DETAIL_KEY.format(post_id=post_id, version=get_post_version(post_id))
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, timeout=settings.POST_DETAIL_LOCK_TIMEOUT):
+        try:
+            data = build()
+            cache.set(key, data, timeout=settings.POST_DETAIL_CACHE_TIMEOUT)
+        finally:
+            cache.delete(lock_key)
+        return data
+
+    deadline = time.monotonic() + settings.POST_DETAIL_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        data = cache.get(key)
+        if data is not None:
+            return data
+        if cache.get(lock_key) is None:
+            break
+    return build()
@@ -0,0 +1,130 @@
+"""
+Validators for conditional GET requests.
+
+Each helper works out an ETag (and a Last-Modified date where there is a
+timestamp to derive it from) without serializing anything, so a client
+whose copy is current gets a 304 for the price of a version lookup or one
+small query.
+"""
+
+import hashlib
+
+from django.db.models import OuterRef, Subquery
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .models import Post, Like, Comment
+
+USER_ETAG_FIELDS = (
+    "pk",
+    "email",
+    "bio",
+    "profile_picture",
+    "profile_picture_renditions",
+    "is_staff",
+    "followers_count",
+    "following_count",
+)
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def not_modified(request, etag, last_modified=None):
+    """Return a 304 response if the client's copy is current, else None."""
+    if request.method not in ("GET", "HEAD"):
+        return None
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified and int(last_modified.timestamp()),
+    )
+
+
+def set_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def latest(model, field):
+    return Subquery(
+        model.objects.filter(post=OuterRef("pk"))
+        .order_by(f"-{field}")
+        .values(field)[:1]
+    )
+
+
+def post_state(post_id):
+    return (
+        Post.objects.filter(pk=post_id)
+        .annotate(
+            last_like=latest(Like, "created_at"),
+            last_comment=latest(Comment, "created_at"),
+        )
+        .values_list(
+            "updated_at",
+            "likes_count",
+            "comments_count",
+            "last_like",
+            "last_comment",
+        )
+    )
+
+
+def post_validators(request, post_id):
+    """Return ``(etag, last_modified)`` for a post, or None if it is missing."""
+    try:
+        post_id = int(post_id)
+    except ValueError:
+        return None
+    return validators_from_state(request, post_id, post_state(post_id).first())
+
+
+async def apost_validators(request, post_id):
+    return validators_from_state(request, post_id, await post_state(post_id).afirst())
+
+
+def validators_from_state(request, post_id, row):
+    if row is None:
+        return None
+    updated_at, _, _, last_like, last_comment = row
+    last_modified = max(
+        value for value in (updated_at, last_like, last_comment) if value
+    )
+    return make_etag("post", post_id, row, request.GET.urlencode()), last_modified
+
+
+def loaded_state(instance):
+    # Sparse fieldsets defer columns; only what was loaded is rendered.
+    deferred = instance.get_deferred_fields()
+    return [
+        getattr(instance, field.attname)
+        for field in instance._meta.concrete_fields
+        if field.attname not in deferred
+    ]
+
+
+def post_list_etag(request, page, has_next):
+    """
+    Tag a posts listing with the rows on its page, so posts, likes and
+    comments elsewhere on the site don't change it.
+    """
+    rows = []
+    for post in page:
+        rows.append(loaded_state(post))
+        if Post.author.is_cached(post):
+            rows.append(loaded_state(post.author))
+    return make_etag("posts", request.user.id, request.get_full_path(), rows, has_next)
+
+
+def user_etag(request, user):
+    # Sparse fieldsets defer columns; the tag only covers what was loaded.
+    deferred = user.get_deferred_fields()
+    return make_etag(
+        "user",
+        request.GET.urlencode(),
+        *(getattr(user, field) for field in USER_ETAG_FIELDS if field not in deferred),
+    )
@@ -0,0 +1,99 @@
+"""
+Streaming export of everything a user has written.
+
+``export_records()`` chains generators over the user's posts, comments and
+likes, each read with ``.iterator()`` so only one chunk of rows is in memory
+at a time. The renderers turn that stream of dicts into NDJSON or CSV lines,
+which can be sent as a ``StreamingHttpResponse`` or written to a file.
+"""
+
+import csv
+import json
+import re
+from datetime import timedelta
+from itertools import chain
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import Post, Comment, Like
+
+EXPORT_FORMATS = ("ndjson", "csv")
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+CSV_COLUMNS = ("type", "id", "post", "content", "hashtags", "created_at")
+# Spreadsheets evaluate cells starting with one of these as a formula.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+EXPORT_FILE_NAME = re.compile(r"[\w-]+\.(?:%s)\.gz" % "|".join(EXPORT_FORMATS))
+
+
+def export_records(user):
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    posts = (
+        Post.objects.filter(author=user)
+        .order_by("pk")
+        .values("id", "content", "hashtags", "created_at")
+        .iterator(chunk_size=chunk_size)
+    )
+    comments = (
+        Comment.objects.filter(user=user)
+        .order_by("pk")
+        .values("id", "post", "content", "created_at")
+        .iterator(chunk_size=chunk_size)
+    )
+    likes = (
+        Like.objects.filter(user=user)
+        .order_by("pk")
+        .values("id", "post", "created_at")
+        .iterator(chunk_size=chunk_size)
+    )
+    return chain(
+        ({"type": "post", **row} for row in posts),
+        ({"type": "comment", **row} for row in comments),
+        ({"type": "like", **row} for row in likes),
+    )
+
+
+def render_ndjson(records):
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+
+
+class Echo:
+    """File-like object that hands back what ``csv.writer`` writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def neutralize_formula(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def render_csv(records):
+    writer = csv.DictWriter(Echo(), fieldnames=CSV_COLUMNS)
+    yield writer.writeheader()
+    for record in records:
+        yield writer.writerow(
+            {column: neutralize_formula(value) for column, value in record.items()}
+        )
+
+
+RENDERERS = {"ndjson": render_ndjson, "csv": render_csv}
+
+
+def render_export(user, export_format):
+    """Return an iterator of text chunks for ``export_format``."""
+    return RENDERERS[export_format](export_records(user))
+
+
+def export_path(user_id, file_name):
+    """Name in export storage of a background export, under its owner."""
+    return f"{user_id}/{file_name}"
+
+
+def export_expiry_cutoff():
+    """Background exports last written before this have expired."""
+    return timezone.now() - timedelta(seconds=settings.EXPORT_RETENTION)
@@ -0,0 +1,122 @@
+"""
+Sparse fieldsets: ``?fields=id,content`` and ``?expand=author``.
+
+The serializer mixin drops the fields that weren't asked for and swaps
+expanded ones for nested serializers. The view mixin passes the query
+parameters on and narrows the SQL to the columns the trimmed serializer
+reads, so a client asking for two fields doesn't pay for the whole row.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+def parse_names(value):
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Accept ``fields`` and ``expand`` keyword arguments.
+
+    ``Meta.expandable_fields`` maps a field name to the dotted path of the
+    serializer rendering it when expanded. The path is imported lazily, so
+    apps can expand into each other's serializers without circular imports.
+    """
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        expandable = getattr(self.Meta, "expandable_fields", {})
+        unknown = set(expand) - set(expandable)
+        if unknown:
+            raise ValidationError({"expand": f"Cannot expand {format_names(unknown)}."})
+        for name in expand:
+            self.fields[name] = import_string(expandable[name])(read_only=True)
+
+        if fields:
+            unknown = set(fields) - set(self.fields)
+            if unknown:
+                raise ValidationError({"fields": f"Unknown {format_names(unknown)}."})
+            # Expanded fields are rendered whether or not they are listed.
+            for name in set(self.fields) - set(fields) - set(expand):
+                self.fields.pop(name)
+
+
+def get_columns(serializer):
+    """
+    Return the columns read by a model serializer's fields, and the
+    relations that nested serializers need joined in.
+    """
+    model = serializer.Meta.model
+    columns, related = {model._meta.pk.name}, []
+    for field in serializer.fields.values():
+        name = field.source.split(".")[0]
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.concrete or model_field.many_to_many:
+            continue
+        columns.add(name)
+        if isinstance(field, serializers.ModelSerializer):
+            related.append(model_field.name)
+            nested, _ = get_columns(field)
+            columns.update(f"{model_field.name}__{column}" for column in nested)
+    return columns, related
+
+
+def format_names(names):
+    return ", ".join(sorted(names))
+
+
+def get_fieldset(request, serializer_class):
+    """
+    Return the ``fields`` and ``expand`` arguments a read request asks
+    ``serializer_class`` for, or None to render every field.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+    fields = parse_names(request.query_params.get("fields"))
+    expand = parse_names(request.query_params.get("expand"))
+    if not fields and not expand:
+        return None
+    if not issubclass(serializer_class, SparseFieldsetSerializerMixin):
+        return None
+    return {"fields": fields, "expand": expand}
+
+
+def narrow_queryset(queryset, serializer, ordering_field=None):
+    """Load only the columns ``serializer`` renders, joining expanded ones."""
+    columns, related = get_columns(serializer)
+    if ordering_field:
+        columns.add(ordering_field)
+    return queryset.select_related(*related).only(*columns)
+
+
+class SparseFieldsetMixin:
+    """
+    Pass ``?fields=`` and ``?expand=`` to the serializer of read requests,
+    and load only the columns it renders.
+    """
+
+    def get_fieldset(self):
+        return get_fieldset(self.request, self.get_serializer_class())
+
+    def get_serializer(self, *args, **kwargs):
+        fieldset = self.get_fieldset()
+        if fieldset is not None:
+            kwargs.update(fieldset)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_fieldset() is None:
+            return queryset
+
+        return narrow_queryset(
+            queryset,
+            self.get_serializer(),
+            getattr(self.paginator, "ordering_field", None),
+        )
@@ -0,0 +1,75 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Longest edge, in pixels, of each rendition.
+RENDITIONS = {"thumb": 150, "feed": 640, "full": 1600}
+FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+QUALITY = 82
+# The original is kept as the source of future renditions.
+ORIGINAL_QUALITY = 95
+
+
+def render_renditions(field_file):
+    """
+    Resize an uploaded image into every rendition and format.
+
+    The orientation stored in EXIF is applied to the pixels, and the
+    metadata itself is dropped. Returns ``{rendition: {format: name}}`` with
+    the storage names of the saved files.
+    """
+    with field_file.open("rb") as source:
+        image = Image.open(source)
+        image.load()
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    base, _ = os.path.splitext(field_file.name)
+    renditions = {}
+    for name, size in RENDITIONS.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+        renditions[name] = {}
+        for extension, image_format in FORMATS.items():
+            output = resized
+            if image_format == "JPEG" and has_alpha:
+                output = Image.new("RGB", resized.size, "white")
+                output.paste(resized, mask=resized.getchannel("A"))
+            buffer = BytesIO()
+            output.save(buffer, format=image_format, quality=QUALITY)
+            renditions[name][extension] = field_file.storage.save(
+                f"{base}-{name}.{extension}", ContentFile(buffer.getvalue())
+            )
+    return renditions
+
+
+def strip_metadata(uploaded_file):
+    """
+    Re-encode an uploaded image in its own format without EXIF (e.g. GPS
+    coordinates) or other metadata, keeping only the colour profile.
+
+    The EXIF orientation is applied to the pixels before it is dropped.
+    """
+    uploaded_file.seek(0)
+    image = Image.open(uploaded_file)
+    image.load()
+    image_format = image.format
+    icc_profile = image.info.get("icc_profile")
+    options = {}
+    if getattr(image, "n_frames", 1) > 1:
+        options["save_all"] = True
+    else:
+        image = ImageOps.exif_transpose(image)
+    if icc_profile:
+        options["icc_profile"] = icc_profile
+
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, quality=ORIGINAL_QUALITY, **options)
+    return ContentFile(buffer.getvalue(), name=uploaded_file.name)
+
+
+def rendition_names(renditions):
+    return [name for formats in renditions.values() for name in formats.values()]
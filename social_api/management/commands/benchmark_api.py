@@ -0,0 +1,114 @@
+import json
+import subprocess
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from social_api import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and record SQL query counts, p50/p95 "
+        "latency and response size for every API endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--posts", type=int, default=1000)
+        parser.add_argument("--likes", type=int, default=5000)
+        parser.add_argument("--comments", type=int, default=2000)
+        parser.add_argument("--follows", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Requests per endpoint (default: 20).",
+        )
+        parser.add_argument(
+            "--output",
+            default="bench_output.json",
+            help="Where to write the JSON report (default: bench_output.json).",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="Report from an earlier commit; fail if any endpoint now "
+            "runs more SQL queries.",
+        )
+        parser.add_argument(
+            "--latency-tolerance",
+            type=float,
+            default=0.25,
+            help="Warn when p95 latency grows by more than this fraction.",
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            ctx = benchmark.seed(
+                users=options["users"],
+                posts=options["posts"],
+                likes=options["likes"],
+                comments=options["comments"],
+                follows=options["follows"],
+                seed=options["seed"],
+            )
+            results = benchmark.run(ctx, iterations=options["iterations"])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            "meta": {
+                "commit": self.get_commit(),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "iterations": options["iterations"],
+                "volumes": ctx["volumes"],
+            },
+            "endpoints": results,
+        }
+        with open(options["output"], "w") as report_file:
+            json.dump(report, report_file, indent=2)
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<26} {result['method']:<6} {result['queries']:>4} queries "
+                f"p50 {result['p50_ms']:>8.2f}ms p95 {result['p95_ms']:>8.2f}ms "
+                f"{result['bytes']:>8}B {result['status']}"
+            )
+        for route in benchmark.uncovered_routes():
+            self.stderr.write(self.style.WARNING(f"Route not benchmarked: {route}"))
+        self.stdout.write(f"Report written to {options['output']}")
+
+        if options["baseline"]:
+            with open(options["baseline"]) as baseline_file:
+                baseline = json.load(baseline_file)
+            regressions, warnings = benchmark.compare(
+                report, baseline, options["latency_tolerance"]
+            )
+            for warning in warnings:
+                self.stderr.write(self.style.WARNING(warning))
+            if regressions:
+                raise CommandError(
+                    "Query count regressions:\n" + "\n".join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS("No query count regressions."))
+
+    def get_commit(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
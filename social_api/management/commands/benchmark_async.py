@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from social_api import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and compare the throughput of the sync "
+        "endpoints and their async variants under concurrent connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100)
+        parser.add_argument("--posts", type=int, default=1000)
+        parser.add_argument("--likes", type=int, default=5000)
+        parser.add_argument("--comments", type=int, default=2000)
+        parser.add_argument("--follows", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--connections",
+            type=int,
+            default=50,
+            help="Concurrent clients (default: 50).",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Requests per endpoint and mode (default: 500).",
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            ctx = benchmark.seed(
+                users=options["users"],
+                posts=options["posts"],
+                likes=options["likes"],
+                comments=options["comments"],
+                follows=options["follows"],
+                seed=options["seed"],
+            )
+            results = benchmark.compare_modes(
+                ctx,
+                connections=options["connections"],
+                requests=options["requests"],
+            )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        for name, modes in results.items():
+            sync, async_ = modes["sync"], modes["async"]
+            self.stdout.write(
+                f"{name:<20} sync {sync['rps']:>8.1f} req/s {sync['status']} "
+                f"async {async_['rps']:>8.1f} req/s {async_['status']}"
+            )
@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from social_api import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with users only, a million by default, "
+        "and record the latency of typeahead user search."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1_000_000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Requests per query (default: 20).",
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            start = time.perf_counter()
+            ctx = benchmark.seed_user_search(
+                users=options["users"], seed=options["seed"]
+            )
+            self.stdout.write(
+                f"Seeded {ctx['volumes']['users']} users and "
+                f"{ctx['volumes']['tokens']} tokens in "
+                f"{time.perf_counter() - start:.0f}s"
+            )
+            results = benchmark.run(
+                ctx,
+                iterations=options["iterations"],
+                endpoints=benchmark.USER_SEARCH_ENDPOINTS,
+            )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<26} {result['queries']:>4} queries "
+                f"p50 {result['p50_ms']:>8.2f}ms p95 {result['p95_ms']:>8.2f}ms "
+                f"{result['bytes']:>8}B {result['status']}"
+            )
@@ -0,0 +1,76 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from social_api.models import Post, Like, Comment
+
+
+def count_subquery(model):
+    counts = (
+        model.objects.filter(post=OuterRef("pk"))
+        .order_by()
+        .values("post")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+class Command(BaseCommand):
+    help = "Recompute likes_count/comments_count on posts and repair drifted rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of posts checked per query (default: 1000).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted posts without writing the fixes.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+        checked = repaired = 0
+        last_pk = 0
+
+        while True:
+            batch = list(
+                Post.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .only("pk", "likes_count", "comments_count")
+                .annotate(
+                    actual_likes=count_subquery(Like),
+                    actual_comments=count_subquery(Comment),
+                )[:batch_size]
+            )
+            if not batch:
+                break
+
+            drifted = []
+            for post in batch:
+                if (
+                    post.likes_count != post.actual_likes
+                    or post.comments_count != post.actual_comments
+                ):
+                    post.likes_count = post.actual_likes
+                    post.comments_count = post.actual_comments
+                    drifted.append(post)
+
+            if drifted and not dry_run:
+                Post.objects.bulk_update(drifted, ["likes_count", "comments_count"])
+
+            checked += len(batch)
+            repaired += len(drifted)
+            last_pk = batch[-1].pk
+
+        verb = "Found" if dry_run else "Repaired"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} posts. {verb} {repaired} drifted counters."
+            )
+        )
@@ -0,0 +1,117 @@
+# Generated by Django 5.0.7 on 2026-10-18 20:44
+
+import re
+from itertools import islice
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# Frozen copy of social_api.utils.parse_hashtags, so later changes to the
+# app's parsing can't change what this migration does.
+HASHTAG_MAX_LENGTH = 100
+HASHTAG_FIELD_RE = re.compile(r"\w+")
+CONTENT_HASHTAG_RE = re.compile(r"#(\w+)")
+
+
+def parse_hashtags(hashtags=None, content=None):
+    names = set(HASHTAG_FIELD_RE.findall(hashtags or ""))
+    names.update(CONTENT_HASHTAG_RE.findall(content or ""))
+    return sorted({name.lower()[:HASHTAG_MAX_LENGTH] for name in names})
+
+
+def index_existing_hashtags(apps, schema_editor):
+    Post = apps.get_model("social_api", "Post")
+    Hashtag = apps.get_model("social_api", "Hashtag")
+    PostHashtag = apps.get_model("social_api", "PostHashtag")
+
+    posts = Post.objects.only("hashtags", "content").iterator(chunk_size=BATCH_SIZE)
+    while batch := list(islice(posts, BATCH_SIZE)):
+        post_names = {
+            post.pk: parse_hashtags(post.hashtags, post.content) for post in batch
+        }
+        names = {name for post_tags in post_names.values() for name in post_tags}
+        Hashtag.objects.bulk_create(
+            [Hashtag(name=name) for name in names], ignore_conflicts=True
+        )
+        hashtag_ids = dict(
+            Hashtag.objects.filter(name__in=names).values_list("name", "id")
+        )
+        PostHashtag.objects.bulk_create(
+            [
+                PostHashtag(post_id=post_id, hashtag_id=hashtag_ids[name])
+                for post_id, post_tags in post_names.items()
+                for name in post_tags
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_api", "0008_timelineentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Hashtag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="PostHashtag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "hashtag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="post_hashtags",
+                        to="social_api.hashtag",
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="post_hashtags",
+                        to="social_api.post",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("hashtag", "post")},
+            },
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="tags",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="posts",
+                through="social_api.PostHashtag",
+                to="social_api.hashtag",
+            ),
+        ),
+        migrations.RunPython(index_existing_hashtags, migrations.RunPython.noop),
+    ]
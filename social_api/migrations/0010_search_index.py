@@ -0,0 +1,54 @@
+# Generated by Django 5.0.7 on 2026-10-18 20:50
+
+from django.db import migrations
+
+SQLITE_TABLE = "social_api_search_index"
+POSTGRES_INDEXES = {
+    "social_api_post_content_fts": "social_api_post",
+    "social_api_comment_content_fts": "social_api_comment",
+}
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {SQLITE_TABLE} USING fts5("
+            "kind UNINDEXED, object_id UNINDEXED, content, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        # rowid = pk * 2 + kind, matching SQLiteSearchBackend.rowid().
+        schema_editor.execute(
+            f"INSERT INTO {SQLITE_TABLE} (rowid, kind, object_id, content) "
+            "SELECT id * 2, 'post', id, content FROM social_api_post"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {SQLITE_TABLE} (rowid, kind, object_id, content) "
+            "SELECT id * 2 + 1, 'comment', id, content FROM social_api_comment"
+        )
+    elif vendor == "postgresql":
+        for name, table in POSTGRES_INDEXES.items():
+            schema_editor.execute(
+                f"CREATE INDEX {name} ON {table} USING gin "
+                "(to_tsvector('english'::regconfig, COALESCE(content, '')))"
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {SQLITE_TABLE}")
+    elif vendor == "postgresql":
+        for name in POSTGRES_INDEXES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_api", "0009_hashtag_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
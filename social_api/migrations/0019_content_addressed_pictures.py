@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-18 23:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social_api", "0018_delete_expired_exports_schedule"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="post_picture",
+            field=models.ImageField(blank=True, null=True, upload_to=""),
+        ),
+    ]
@@ -1,17 +1,112 @@
 import os
 import uuid
+from collections import Counter
 
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Count, Q, Value, Window
+from django.db.models.functions import Cast, Concat, Greatest, LPad, RowNumber
 from django.utils.text import slugify
 
+from .storage import is_blob, iter_blobs
+from .utils import HASHTAG_MAX_LENGTH, keyset_after, parse_hashtags
+
 
 def post_image_file_path(instance, filename):
+    # Referenced by migration 0004; pictures are now stored by content digest.
     _, extension = os.path.splitext(filename)
     filename = f"{slugify(instance.author.username)}-{uuid.uuid4()}{extension}"
     return os.path.join("uploads/post_pics", filename)
 
 
+class PostQuerySet(models.QuerySet):
+    # Set by home_timeline() to the user and the queryset it narrowed.
+    timeline = None
+
+    def _clone(self):
+        clone = super()._clone()
+        clone.timeline = self.timeline
+        return clone
+
+    def adjust_counter(self, field, delta):
+        """Atomically add ``delta`` to a denormalized counter, never below zero."""
+        return self.update(**{field: Greatest(F(field) + delta, 0)})
+
+    def home_timeline(self, user):
+        """
+        Posts of the accounts ``user`` follows.
+
+        Regular authors are read from the materialized timeline; authors
+        with too many followers to fan out to are merged in on read. Pages
+        come from ``timeline_page()``, so apply other filters first.
+        """
+        timeline = TimelineEntry.objects.filter(user=user).values("post_id")
+        high_follower_authors = user.following.filter(
+            followers_count__gt=settings.TIMELINE_FANOUT_FOLLOWER_LIMIT
+        )
+        queryset = self.filter(Q(pk__in=timeline) | Q(author__in=high_follower_authors))
+        queryset.timeline = (user, self)
+        return queryset
+
+    def timeline_page(self, after, limit):
+        """
+        The ``limit`` newest posts of a ``home_timeline()`` past the
+        ``(created_at, pk)`` key ``after``.
+
+        The materialized timeline and the posts of high-follower authors are
+        each read with a range scan on their own index and merged, so the
+        posts table is only read for the rows of the page.
+        """
+        entries, authors = self._timeline_sources(after, limit)
+        candidates = list(entries)
+        authors = list(authors)
+        if authors:
+            candidates += self._timeline_author_posts(authors, after, limit)
+        return self._timeline_merge(candidates, limit)
+
+    async def atimeline_page(self, after, limit):
+        """Like ``timeline_page()``, reading the candidates with the async ORM."""
+        entries, authors = self._timeline_sources(after, limit)
+        candidates = [row async for row in entries]
+        authors = [pk async for pk in authors]
+        if authors:
+            posts = self._timeline_author_posts(authors, after, limit)
+            candidates += [row async for row in posts]
+        return self._timeline_merge(candidates, limit)
+
+    def _timeline_sources(self, after, limit):
+        user, source = self.timeline
+        entries = TimelineEntry.objects.filter(user=user)
+        if source.query.has_filters():
+            entries = entries.filter(post__in=source.values("pk"))
+        entries = keyset_after(entries, "created_at", after, pk="post")
+        authors = user.following.filter(
+            followers_count__gt=settings.TIMELINE_FANOUT_FOLLOWER_LIMIT
+        ).values_list("pk", flat=True)
+        return entries.values_list("created_at", "post_id")[:limit], authors
+
+    def _timeline_author_posts(self, authors, after, limit):
+        _, source = self.timeline
+        posts = keyset_after(source.filter(author__in=authors), "created_at", after)
+        return posts.values_list("created_at", "pk")[:limit]
+
+    def _timeline_merge(self, candidates, limit):
+        # A post can be in both when its author crossed the follower limit.
+        page = sorted(set(candidates), reverse=True)[:limit]
+        return self.filter(pk__in=[pk for _, pk in page]).order_by("-created_at", "-pk")
+
+    def with_hashtags(self, names, match_all=False):
+        """Posts tagged with any (or, with ``match_all``, every) of ``names``."""
+        tagged = PostHashtag.objects.filter(hashtag__name__in=names).values("post_id")
+        if match_all:
+            tagged = (
+                tagged.annotate(matched=Count("hashtag"))
+                .filter(matched=len(names))
+                .values("post_id")
+            )
+        return self.filter(pk__in=tagged)
+
+
 class Post(models.Model):
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="posts"
@@ -19,23 +114,114 @@ class Post(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    post_picture = models.ImageField(
-        upload_to=post_image_file_path, blank=True, null=True
-    )
+    post_picture = models.ImageField(blank=True, null=True)
+    post_picture_renditions = models.JSONField(default=dict, blank=True)
     hashtags = models.CharField(max_length=255, blank=True, null=True)
+    tags = models.ManyToManyField(
+        "Hashtag", through="PostHashtag", related_name="posts", blank=True
+    )
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="post_created_idx"),
+            models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="post_author_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.content
 
+    def sync_hashtags(self):
+        """Index the tags parsed from ``hashtags`` and ``content``."""
+        names = parse_hashtags(self.hashtags, self.content)
+        Hashtag.objects.bulk_create(
+            [Hashtag(name=name) for name in names], ignore_conflicts=True
+        )
+        self.tags.set(Hashtag.objects.filter(name__in=names))
+
+
+class Hashtag(models.Model):
+    name = models.CharField(max_length=HASHTAG_MAX_LENGTH, unique=True)
+
+    def __str__(self):
+        return f"#{self.name}"
+
+
+class PostHashtag(models.Model):
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="post_hashtags"
+    )
+    hashtag = models.ForeignKey(
+        Hashtag, on_delete=models.CASCADE, related_name="post_hashtags"
+    )
+
+    class Meta:
+        unique_together = ("hashtag", "post")
+
 
 class Like(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="likes"
     )
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="likes")
+    created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ("user", "post")
+        indexes = [
+            models.Index(fields=["post", "-created_at"], name="like_post_created_idx"),
+        ]
+
+
+# Digits of each comment id in a materialized path.
+COMMENT_PATH_WIDTH = 10
+
+
+def path_segment(comment_id):
+    return f"{comment_id:0{COMMENT_PATH_WIDTH}d}/"
+
+
+class CommentQuerySet(models.QuerySet):
+    def subtree(self, comment):
+        """The comment and all its replies, in reading order."""
+        # Paths are digits and "/", which all sort below ":", so this range
+        # matches exactly the paths starting with the comment's own.
+        return self.filter(
+            post_id=comment.post_id,
+            path__gte=comment.path,
+            path__lt=comment.path + ":",
+        ).order_by("path")
+
+    def first_replies(self, parent_ids, count):
+        """The ``count`` oldest direct replies to each comment in ``parent_ids``."""
+        return (
+            self.filter(parent_id__in=parent_ids)
+            .annotate(
+                reply_rank=Window(
+                    RowNumber(),
+                    partition_by=F("parent_id"),
+                    order_by=[F("created_at").asc(), F("id").asc()],
+                )
+            )
+            .filter(reply_rank__lte=count)
+            .order_by("parent_id", "created_at", "id")
+        )
+
+    def set_root_paths(self):
+        """Fill the path of top-level comments created with ``bulk_create``."""
+        return self.filter(parent__isnull=True).update(
+            path=Concat(
+                LPad(Cast("pk", models.CharField()), COMMENT_PATH_WIDTH, Value("0")),
+                Value("/"),
+            ),
+            depth=0,
+        )
 
 
 class Comment(models.Model):
@@ -43,8 +229,154 @@ class Comment(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="comments"
     )
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="comments")
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        related_name="replies",
+        blank=True,
+        null=True,
+        db_index=False,
+    )
+    # Zero-padded ids of the ancestors and the comment itself, each followed
+    # by "/", so sorting by path lists a thread depth-first.
+    path = models.CharField(max_length=255, blank=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = CommentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["post", "created_at", "id"], name="comment_post_created_idx"
+            ),
+            models.Index(fields=["post", "path"], name="comment_post_path_idx"),
+            models.Index(
+                fields=["parent", "created_at", "id"],
+                name="comment_parent_created_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.content
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            parent_path = self.parent.path if self.parent_id else ""
+            path = parent_path + path_segment(self.pk)
+            if self.path != path:
+                self.path = path
+                self.depth = self.parent.depth + 1 if self.parent_id else 0
+                Comment.objects.filter(pk=self.pk).update(
+                    path=self.path, depth=self.depth
+                )
+
+
+class TimelineEntry(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+    )
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ("user", "post")
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-post"],
+                name="timeline_user_created_idx",
+            ),
+        ]
+
+
+class ScheduledPost(models.Model):
+    """A post waiting for ``publish_due_posts`` to create it."""
+
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="scheduled_posts",
+    )
+    content = models.TextField()
+    hashtags = models.CharField(max_length=255, blank=True, null=True)
+    publish_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["publish_at", "id"], name="scheduled_post_due_idx"),
+            models.Index(
+                fields=["author", "publish_at", "id"],
+                name="scheduled_post_author_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return self.content
+
+
+class MediaBlobQuerySet(models.QuerySet):
+    def acquire(self, names):
+        """Add one reference to each stored blob in ``names``."""
+        references = Counter(name for name in names if is_blob(name))
+        self.bulk_create(
+            [MediaBlob(name=name) for name in references], ignore_conflicts=True
+        )
+        for name, count in references.items():
+            # The sweep may have deleted the row while this waited on its lock.
+            while not self.filter(name=name).update(refcount=F("refcount") + count):
+                self.bulk_create([MediaBlob(name=name)], ignore_conflicts=True)
+
+    def release(self, names):
+        """
+        Drop one reference to each blob in ``names``. Blobs nothing uses
+        anymore are deleted later by ``delete_unused_blobs``.
+        """
+        references = Counter(name for name in names if is_blob(name))
+        for name, count in references.items():
+            self.filter(name=name).update(refcount=Greatest(F("refcount") - count, 0))
+
+
+def delete_unused_blobs(storage, cutoff):
+    """
+    Delete the blobs in ``storage`` that nothing references and that were
+    last saved before ``cutoff``, including files whose upload was rolled
+    back before it was counted. Returns how many were deleted.
+
+    Each file is deleted while its ``MediaBlob`` row is locked, so a
+    concurrent ``acquire`` waits for the sweep and then counts a fresh row.
+    Saving a blob again refreshes its modification time, which keeps a
+    picture that is being uploaded right now out of the sweep.
+    """
+    deleted = 0
+    for name in iter_blobs(storage):
+        if storage.get_modified_time(name) >= cutoff:
+            continue
+        with transaction.atomic():
+            MediaBlob.objects.bulk_create([MediaBlob(name=name)], ignore_conflicts=True)
+            blob = MediaBlob.objects.select_for_update().get(name=name)
+            if blob.refcount or storage.get_modified_time(name) >= cutoff:
+                continue
+            storage.delete(name)
+            blob.delete()
+            deleted += 1
+    return deleted
+
+
+class MediaBlob(models.Model):
+    """Reference count of a file in the content-addressed media storage."""
+
+    name = models.CharField(max_length=255, unique=True)
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = MediaBlobQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount})"
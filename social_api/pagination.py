@@ -0,0 +1,137 @@
+import base64
+import json
+
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .utils import keyset_after
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only cursor pagination over a unique ``(timestamp, pk)`` key.
+
+    The cursor is an opaque token holding the key of the last row of the
+    previous page, so every page is a single indexed range scan no matter
+    how deep the client has scrolled.
+    """
+
+    ordering_field = "created_at"
+    descending = True
+    page_size = settings.API_PAGE_SIZE
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Like ``paginate_queryset()``, fetching the page with the async ORM."""
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page([obj async for obj in queryset])
+
+    def get_page_queryset(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = keyset_after(
+            queryset,
+            self.ordering_field,
+            self.decode_cursor(request),
+            descending=self.descending,
+        )
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        cursor = self.encode_cursor(getattr(last, self.ordering_field), last.pk)
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def encode_cursor(self, value, pk):
+        payload = json.dumps([value.isoformat(), pk]).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            value, pk = json.loads(base64.urlsafe_b64decode(padded))
+            value = parse_datetime(value)
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+
+class PostCursorPagination(KeysetPagination):
+    ordering_field = "created_at"
+
+    def get_page_queryset(self, queryset, request):
+        if queryset.timeline is None:
+            return super().get_page_queryset(queryset, request)
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        return queryset.timeline_page(self.decode_cursor(request), self.page_size + 1)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if queryset.timeline is None:
+            return await super().apaginate_queryset(queryset, request, view)
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        queryset = await queryset.atimeline_page(
+            self.decode_cursor(request), self.page_size + 1
+        )
+        return self.set_page([obj async for obj in queryset])
+
+
+class FollowCursorPagination(KeysetPagination):
+    ordering_field = "created_at"
+
+
+class CommentCursorPagination(KeysetPagination):
+    ordering_field = "created_at"
+    descending = False
+
+
+class ScheduledPostCursorPagination(KeysetPagination):
+    ordering_field = "publish_at"
+    descending = False
@@ -0,0 +1,195 @@
+import re
+from html import escape
+
+from django.db import connection
+
+from .models import Post, Comment
+
+SEARCH_KINDS = ("post", "comment")
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+# The database marks matches with private-use characters, so the snippet can
+# be HTML-escaped before the <mark> tags go in.
+MATCH_START = "\ue000"
+MATCH_STOP = "\ue001"
+SNIPPET_TOKENS = 16
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def render_snippet(snippet):
+    """HTML-escape a snippet of user content and wrap its matches in <mark>."""
+    return (
+        escape(snippet)
+        .replace(MATCH_START, HIGHLIGHT_START)
+        .replace(MATCH_STOP, HIGHLIGHT_STOP)
+    )
+
+
+class SearchBackend:
+    """Full-text index over ``Post.content`` and ``Comment.content``."""
+
+    def index(self, kind, object_id, content):
+        pass
+
+    def index_many(self, kind, objects):
+        """Index ``(object_id, content)`` pairs."""
+        for object_id, content in objects:
+            self.index(kind, object_id, content)
+
+    def remove(self, kind, object_id):
+        pass
+
+    def search(self, query, kinds=SEARCH_KINDS, limit=20, offset=0):
+        """
+        Return ``[{"type", "id", "rank", "snippet"}, ...]`` ordered from the
+        best match down. A higher rank is a better match, and the snippet is
+        HTML with the matches in ``<mark>`` tags.
+        """
+        raise NotImplementedError
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    FTS5 virtual table kept in sync by signals.
+
+    Each object is stored under a rowid derived from its kind and pk, so
+    updates and deletes are rowid lookups instead of scans.
+    """
+
+    table = "social_api_search_index"
+
+    def rowid(self, kind, object_id):
+        return object_id * len(SEARCH_KINDS) + SEARCH_KINDS.index(kind)
+
+    def index(self, kind, object_id, content):
+        rowid = self.rowid(kind, object_id)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [rowid])
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, kind, object_id, content) "
+                "VALUES (%s, %s, %s, %s)",
+                [rowid, kind, object_id, content],
+            )
+
+    def index_many(self, kind, objects):
+        rows = [
+            (self.rowid(kind, object_id), kind, object_id, content)
+            for object_id, content in objects
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s",
+                [(rowid,) for rowid, *_ in rows],
+            )
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, kind, object_id, content) "
+                "VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+
+    def remove(self, kind, object_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE rowid = %s",
+                [self.rowid(kind, object_id)],
+            )
+
+    def match_expression(self, query):
+        tokens = TOKEN_RE.findall(query)
+        if not tokens:
+            return None
+        # Quote every token so user input can't inject FTS5 operators, and
+        # treat the last one as a prefix for search-as-you-type.
+        terms = [f'"{token}"' for token in tokens]
+        terms[-1] += "*"
+        return "content : (" + " ".join(terms) + ")"
+
+    def search(self, query, kinds=SEARCH_KINDS, limit=20, offset=0):
+        match = self.match_expression(query)
+        if match is None or not kinds:
+            return []
+        placeholders = ", ".join(["%s"] * len(kinds))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT kind, object_id, bm25({self.table}), "
+                f"snippet({self.table}, 2, %s, %s, '…', %s) "
+                f"FROM {self.table} "
+                f"WHERE {self.table} MATCH %s AND kind IN ({placeholders}) "
+                f"ORDER BY bm25({self.table}) LIMIT %s OFFSET %s",
+                [
+                    MATCH_START,
+                    MATCH_STOP,
+                    SNIPPET_TOKENS,
+                    match,
+                    *kinds,
+                    limit,
+                    offset,
+                ],
+            )
+            rows = cursor.fetchall()
+        # bm25() is lower-is-better; flip it so every backend ranks alike.
+        return [
+            {
+                "type": kind,
+                "id": object_id,
+                "rank": -score,
+                "snippet": render_snippet(snippet),
+            }
+            for kind, object_id, score, snippet in rows
+        ]
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    tsvector search served by the GIN expression indexes created in
+    migrations, so there is nothing to keep in sync from Python.
+    """
+
+    config = "english"
+
+    def search(self, query, kinds=SEARCH_KINDS, limit=20, offset=0):
+        from django.contrib.postgres.search import (
+            SearchHeadline,
+            SearchQuery,
+            SearchRank,
+            SearchVector,
+        )
+        from django.db.models import CharField, Value
+
+        search_query = SearchQuery(query, config=self.config, search_type="websearch")
+        models = {"post": Post, "comment": Comment}
+        querysets = [
+            models[kind]
+            .objects.annotate(search=SearchVector("content", config=self.config))
+            .filter(search=search_query)
+            .annotate(
+                type=Value(kind, output_field=CharField()),
+                rank=SearchRank(
+                    SearchVector("content", config=self.config), search_query
+                ),
+                snippet=SearchHeadline(
+                    "content",
+                    search_query,
+                    config=self.config,
+                    start_sel=MATCH_START,
+                    stop_sel=MATCH_STOP,
+                    max_words=SNIPPET_TOKENS,
+                ),
+            )
+            .values("type", "id", "rank", "snippet")
+            for kind in kinds
+        ]
+        if not querysets:
+            return []
+        results = querysets[0].union(*querysets[1:], all=True)
+        hits = list(results.order_by("-rank", "id")[offset : offset + limit])
+        for hit in hits:
+            hit["snippet"] = render_snippet(hit["snippet"])
+        return hits
+
+
+def get_search_backend():
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    return SQLiteSearchBackend()
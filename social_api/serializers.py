@@ -1,12 +1,62 @@
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
 from rest_framework import serializers
 
-from social_api.models import Post, Like, Comment
+from social_api.models import Post, Like, Comment, ScheduledPost
+from social_api.export import EXPORT_FORMATS
+from social_api.fieldsets import SparseFieldsetSerializerMixin
+from social_api.images import strip_metadata
+from social_api.search import SEARCH_KINDS
 
 
-class PostSerializer(serializers.ModelSerializer):
-    author = serializers.ReadOnlyField(source="author.id")
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
+class RenditionsField(serializers.ReadOnlyField):
+    """URLs of the resized copies of a picture, by rendition and format."""
+
+    def to_representation(self, value):
+        request = self.context.get("request")
+        renditions = {}
+        for name, formats in (value or {}).items():
+            renditions[name] = {}
+            for extension, path in formats.items():
+                url = default_storage.url(path)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                renditions[name][extension] = url
+        return renditions
+
+
+class StrippedImageField(serializers.ImageField):
+    """An image upload stored without its EXIF and other metadata."""
+
+    def to_internal_value(self, data):
+        return strip_metadata(super().to_internal_value(data))
+
+
+def absolute_post_urls(data, request):
+    """
+    Make the media URLs of a post serialized without a request absolute,
+    e.g. for a representation cached for every host.
+    """
+    data = dict(data)
+    if data.get("post_picture"):
+        data["post_picture"] = request.build_absolute_uri(data["post_picture"])
+    data["post_picture_renditions"] = {
+        name: {
+            extension: request.build_absolute_uri(url)
+            for extension, url in formats.items()
+        }
+        for name, formats in data["post_picture_renditions"].items()
+    }
+    return data
+
+
+class PostSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    author = serializers.ReadOnlyField(source="author_id")
+    likes_count = serializers.IntegerField(read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
+    post_picture = StrippedImageField(required=False, allow_null=True)
+    post_picture_renditions = RenditionsField()
 
     class Meta:
         model = Post
@@ -17,33 +67,28 @@ class PostSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "post_picture",
+            "post_picture_renditions",
             "hashtags",
             "likes_count",
             "comments_count",
         )
-
-    def get_likes_count(self, obj):
-        return obj.likes.count()
-
-    def get_comments_count(self, obj):
-        return obj.comments.count()
+        expandable_fields = {"author": "user.serializers.UserCardSerializer"}
 
 
 class PostListSerializer(PostSerializer):
-    class Meta:
-        model = Post
+    class Meta(PostSerializer.Meta):
         fields = (
             "id",
             "author",
             "content",
+            "post_picture_renditions",
             "likes_count",
             "comments_count",
         )
 
 
 class PostDetailSerializer(PostSerializer):
-    class Meta:
-        model = Post
+    class Meta(PostSerializer.Meta):
         fields = (
             "id",
             "author",
@@ -51,6 +96,7 @@ class PostDetailSerializer(PostSerializer):
             "created_at",
             "updated_at",
             "post_picture",
+            "post_picture_renditions",
             "hashtags",
             "likes_count",
             "comments_count",
@@ -58,7 +104,7 @@ class PostDetailSerializer(PostSerializer):
 
 
 class PostImageSerializer(serializers.ModelSerializer):
-    post_picture = serializers.ImageField()
+    post_picture = StrippedImageField()
 
     class Meta:
         model = Post
@@ -70,18 +116,155 @@ class LikeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Like
-        fields = ("id", "user", "post")
+        fields = ("id", "user", "post", "created_at")
+
+
+class LikeBatchSerializer(serializers.Serializer):
+    like = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=settings.LIKE_BATCH_MAX_SIZE,
+        default=list,
+    )
+    unlike = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=settings.LIKE_BATCH_MAX_SIZE,
+        default=list,
+    )
+
+    def validate(self, attrs):
+        like = list(dict.fromkeys(attrs["like"]))
+        unlike = list(dict.fromkeys(attrs["unlike"]))
+        if not like and not unlike:
+            raise serializers.ValidationError("Provide post ids to like or unlike.")
+        if set(like) & set(unlike):
+            raise serializers.ValidationError(
+                "A post cannot be liked and unliked in the same batch."
+            )
+        return {"like": like, "unlike": unlike}
+
+
+class LikeBatchOutcomeSerializer(serializers.Serializer):
+    post = serializers.IntegerField()
+    status = serializers.ChoiceField(
+        choices=(
+            "liked",
+            "already_liked",
+            "unliked",
+            "not_liked",
+            "own_post",
+            "not_found",
+        )
+    )
+
+
+class LikeBatchResultSerializer(serializers.Serializer):
+    results = LikeBatchOutcomeSerializer(many=True)
+
+
+class PostImportErrorSerializer(serializers.Serializer):
+    line = serializers.IntegerField()
+    errors = serializers.DictField()
+
+
+class PostImportResultSerializer(serializers.Serializer):
+    created = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    errors = PostImportErrorSerializer(many=True)
 
 
 class CommentSerializer(serializers.ModelSerializer):
-    user = serializers.ReadOnlyField(source="user.id")
+    user = serializers.ReadOnlyField(source="user_id")
 
     class Meta:
         model = Comment
-        fields = ["id", "user", "post", "content", "created_at"]
+        fields = ["id", "user", "post", "parent", "depth", "content", "created_at"]
+        read_only_fields = ["depth"]
+
+    def validate(self, attrs):
+        if self.instance is not None:
+            return self.validate_move(attrs)
+        parent = attrs.get("parent")
+        if parent is not None:
+            if parent.post_id != attrs["post"].id:
+                raise serializers.ValidationError(
+                    {"parent": "The reply must be on the same post."}
+                )
+            if parent.depth + 1 >= settings.COMMENT_MAX_DEPTH:
+                raise serializers.ValidationError(
+                    {"parent": "This thread is nested too deeply."}
+                )
+        return attrs
+
+    def validate_move(self, attrs):
+        comment = self.instance
+        parent_id = attrs["parent"].pk if attrs.get("parent") else None
+        if "parent" in attrs and parent_id != comment.parent_id:
+            raise serializers.ValidationError({"parent": "A reply cannot be moved."})
+        post = attrs.get("post")
+        if post is not None and post.pk != comment.post_id:
+            if comment.parent_id or comment.replies.exists():
+                raise serializers.ValidationError(
+                    {"post": "A comment in a thread cannot be moved."}
+                )
+        return attrs
+
+
+class CommentThreadSerializer(CommentSerializer):
+    replies = CommentSerializer(source="first_replies", many=True, read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ["replies"]
+
+
+class CommentThreadsQuerySerializer(serializers.Serializer):
+    post = serializers.IntegerField()
+    replies = serializers.IntegerField(
+        min_value=0,
+        max_value=settings.COMMENT_MAX_REPLIES_PREVIEW,
+        default=settings.COMMENT_REPLIES_PREVIEW,
+    )
 
 
 class SchedulePostSerializer(serializers.Serializer):
     content = serializers.CharField()
     hashtags = serializers.CharField(required=False, allow_blank=True)
     delay_minutes = serializers.IntegerField(min_value=1)
+
+
+class ScheduledPostSerializer(serializers.ModelSerializer):
+    author = serializers.ReadOnlyField(source="author_id")
+
+    class Meta:
+        model = ScheduledPost
+        fields = ("id", "author", "content", "hashtags", "publish_at", "created_at")
+        read_only_fields = ("created_at",)
+
+    def validate_publish_at(self, value):
+        if value <= timezone.now():
+            raise serializers.ValidationError("Must be in the future.")
+        return value
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    export_format = serializers.ChoiceField(choices=EXPORT_FORMATS, default="ndjson")
+
+
+class ExportScheduledSerializer(serializers.Serializer):
+    status = serializers.CharField()
+    url = serializers.URLField()
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField()
+    type = serializers.ChoiceField(choices=SEARCH_KINDS, required=False)
+    page_size = serializers.IntegerField(
+        min_value=1, max_value=settings.API_MAX_PAGE_SIZE, required=False
+    )
+    offset = serializers.IntegerField(min_value=0, default=0)
+
+
+class SearchResultSerializer(serializers.Serializer):
+    type = serializers.CharField()
+    id = serializers.IntegerField()
+    rank = serializers.FloatField()
+    snippet = serializers.CharField()
@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import invalidate_post
+from .images import rendition_names
+from .models import MediaBlob, Post, Like, Comment
+from .search import get_search_backend
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+def index_content(sender, instance, **kwargs):
+    kind = "post" if sender is Post else "comment"
+    get_search_backend().index(kind, instance.pk, instance.content)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+def remove_content(sender, instance, **kwargs):
+    kind = "post" if sender is Post else "comment"
+    get_search_backend().remove(kind, instance.pk)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_post_detail(sender, instance, **kwargs):
+    post_id = instance.pk if sender is Post else instance.post_id
+    invalidate_post(post_id)
+    # Invalidate again once the write is visible, so a reader that rebuilt
+    # the entry from pre-commit data doesn't keep it alive.
+    transaction.on_commit(lambda: invalidate_post(post_id))
+
+
+@receiver(post_delete, sender=Like)
+@receiver(post_delete, sender=Comment)
+def touch_post(sender, instance, **kwargs):
+    # A post's Last-Modified is the newest of its updated_at and its latest
+    # like and comment. Move updated_at on so that deleting the latest one
+    # can't turn the date back.
+    Post.objects.filter(pk=instance.post_id).update(updated_at=timezone.now())
+
+
+# Picture and renditions fields of the models stored in the media storage.
+MEDIA_FIELDS = {
+    Post: ("post_picture", "post_picture_renditions"),
+    get_user_model(): ("profile_picture", "profile_picture_renditions"),
+}
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_save, sender=get_user_model())
+def remember_stored_picture(sender, instance, update_fields=None, **kwargs):
+    picture_field, _ = MEDIA_FIELDS[sender]
+    instance._stored_picture = None
+    if instance._state.adding or (
+        update_fields is not None and picture_field not in update_fields
+    ):
+        return
+    instance._stored_picture = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list(picture_field, flat=True)
+        .first()
+        or None
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=get_user_model())
+def count_picture_references(sender, instance, update_fields=None, **kwargs):
+    picture_field, _ = MEDIA_FIELDS[sender]
+    if update_fields is not None and picture_field not in update_fields:
+        return
+    picture = getattr(instance, picture_field).name or None
+    stored = getattr(instance, "_stored_picture", None)
+    if picture != stored:
+        MediaBlob.objects.acquire([picture])
+        MediaBlob.objects.release([stored])
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=get_user_model())
+def release_media(sender, instance, **kwargs):
+    picture_field, renditions_field = MEDIA_FIELDS[sender]
+    MediaBlob.objects.release(
+        [
+            getattr(instance, picture_field).name,
+            *rendition_names(getattr(instance, renditions_field)),
+        ]
+    )
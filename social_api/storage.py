@@ -0,0 +1,72 @@
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+BLOB_DIR = "blobs"
+
+
+def blob_name(digest, extension):
+    return f"{BLOB_DIR}/{digest[:2]}/{digest[2:4]}/{digest}{extension.lower()}"
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(f"{BLOB_DIR}/")
+
+
+def iter_blobs(storage):
+    """Names of every blob saved in ``storage``."""
+    if not storage.exists(BLOB_DIR):
+        return
+    for first in storage.listdir(BLOB_DIR)[0]:
+        for second in storage.listdir(f"{BLOB_DIR}/{first}")[0]:
+            directory = f"{BLOB_DIR}/{first}/{second}"
+            for name in storage.listdir(directory)[1]:
+                yield f"{directory}/{name}"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Store every file once, under the SHA-256 digest of its content.
+
+    Uploads are hashed while they are copied to a temporary file, which is
+    then moved to ``blobs/ab/cd/<digest><ext>``. Saving content that is
+    already stored returns the existing name without writing it again, but
+    refreshes its modification time. Only the extension of the requested
+    name is kept. References to the stored files are counted by
+    ``MediaBlob``.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name depends on the content, see _save().
+        return name
+
+    def _save(self, name, content):
+        _, extension = os.path.splitext(name)
+        directory = self.path(BLOB_DIR)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".upload")
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, "wb") as temp_file:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+
+            name = blob_name(digest.hexdigest(), extension)
+            path = self.path(name)
+            try:
+                # Keep the blob out of the sweep of unused ones for a while.
+                os.utime(path)
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.chmod(temp_path, self.file_permissions_mode or 0o644)
+                os.replace(temp_path, path)
+            else:
+                os.remove(temp_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return name
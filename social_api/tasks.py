@@ -1,17 +1,215 @@
+import gzip
+import tempfile
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage, storages
+from django.db import transaction
+from django.db.models import Count
 from django.utils import timezone
 from celery import shared_task
-from .models import Post
+from .bulk import index_posts
+from .cache import invalidate_post
+from .export import export_expiry_cutoff, render_export
+from .images import render_renditions, rendition_names
+from .models import (
+    MediaBlob,
+    Post,
+    ScheduledPost,
+    TimelineEntry,
+    delete_unused_blobs,
+)
 from django.contrib.auth import get_user_model
+from user.models import Follow
+
+FAN_OUT_BATCH_SIZE = 1000
 
 
 @shared_task
 def create_scheduled_post(author_id, content, post_picture=None, hashtags=None):
+    """
+    Publish one post. Scheduling now goes through ``ScheduledPost``; this is
+    kept for ETA messages queued before that table existed.
+    """
     User = get_user_model()
     author = User.objects.get(id=author_id)
-    Post.objects.create(
-        author=author,
-        content=content,
-        post_picture=post_picture,
-        hashtags=hashtags,
-        created_at=timezone.now(),
+    with transaction.atomic():
+        post = Post.objects.create(
+            author=author,
+            content=content,
+            post_picture=post_picture,
+            hashtags=hashtags,
+            created_at=timezone.now(),
+        )
+        post.sync_hashtags()
+    transaction.on_commit(lambda: fan_out_post.delay(post.id))
+    if post.post_picture:
+        transaction.on_commit(lambda: generate_post_renditions.delay(post.id))
+
+
+@shared_task
+def publish_due_posts(batch_size=None):
+    """Turn every ``ScheduledPost`` that is due into a ``Post``, in batches."""
+    batch_size = batch_size or settings.SCHEDULED_POST_BATCH_SIZE
+    published = 0
+    while True:
+        with transaction.atomic():
+            due = list(
+                ScheduledPost.objects.select_for_update(skip_locked=True)
+                .filter(publish_at__lte=timezone.now())
+                .order_by("publish_at", "pk")[:batch_size]
+            )
+            if not due:
+                break
+            posts = Post.objects.bulk_create(
+                [
+                    Post(
+                        author_id=scheduled.author_id,
+                        content=scheduled.content,
+                        hashtags=scheduled.hashtags,
+                    )
+                    for scheduled in due
+                ]
+            )
+            index_posts(posts)
+            ScheduledPost.objects.filter(pk__in=[row.pk for row in due]).delete()
+            post_ids = [post.pk for post in posts]
+            transaction.on_commit(partial(fan_out_posts.delay, post_ids))
+        published += len(due)
+    return published
+
+
+@shared_task
+def fan_out_posts(post_ids):
+    for post_id in post_ids:
+        fan_out_post(post_id)
+
+
+@shared_task
+def fan_out_post(post_id):
+    """Push a new post onto the home timeline of each of its author's followers."""
+    post = (
+        Post.objects.filter(pk=post_id)
+        .select_related("author")
+        .only("created_at", "author__followers_count")
+        .first()
+    )
+    # Same test as home_timeline(), which merges these authors in on read.
+    if post is None or (
+        post.author.followers_count > settings.TIMELINE_FANOUT_FOLLOWER_LIMIT
+    ):
+        return
+
+    followers = (
+        Follow.objects.filter(followee_id=post.author_id)
+        .order_by("follower_id")
+        .values_list("follower_id", flat=True)
+    )
+    batch = list(followers[:FAN_OUT_BATCH_SIZE])
+    while batch:
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(user_id=user_id, post=post, created_at=post.created_at)
+                for user_id in batch
+            ],
+            ignore_conflicts=True,
+        )
+        trim_timelines(batch)
+        batch = list(followers.filter(follower_id__gt=batch[-1])[:FAN_OUT_BATCH_SIZE])
+
+
+@shared_task
+def backfill_timeline(user_id, author_id):
+    """Copy an author's recent posts into a new follower's home timeline."""
+    posts = Post.objects.filter(author_id=author_id).order_by("-created_at", "-id")
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=user_id, post=post, created_at=post.created_at)
+            for post in posts.only("created_at")[: settings.TIMELINE_MAX_LENGTH]
+        ],
+        ignore_conflicts=True,
     )
+    trim_timelines([user_id])
+
+
+def trim_timelines(user_ids):
+    """Drop the oldest entries of any timeline longer than TIMELINE_MAX_LENGTH."""
+    max_length = settings.TIMELINE_MAX_LENGTH
+    overflowing = (
+        TimelineEntry.objects.filter(user_id__in=user_ids)
+        .values("user_id")
+        .annotate(total=Count("id"))
+        .filter(total__gt=max_length)
+        .values_list("user_id", flat=True)
+    )
+    for user_id in overflowing:
+        entries = TimelineEntry.objects.filter(user_id=user_id)
+        cutoff = entries.order_by("-created_at", "-post_id").values_list(
+            "created_at", "post_id"
+        )[max_length - 1]
+        entries.filter(created_at__lte=cutoff[0]).exclude(
+            created_at=cutoff[0], post_id__gte=cutoff[1]
+        ).delete()
+
+
+@shared_task
+def generate_post_renditions(post_id):
+    """Render resized copies of a post picture and record their names."""
+    post = Post.objects.filter(pk=post_id).first()
+    if post is None or not post.post_picture:
+        return
+
+    renditions = render_renditions(post.post_picture)
+    with transaction.atomic():
+        MediaBlob.objects.acquire(rendition_names(renditions))
+        updated = Post.objects.filter(
+            pk=post_id, post_picture=post.post_picture.name
+        ).update(post_picture_renditions=renditions, updated_at=timezone.now())
+        if updated:
+            MediaBlob.objects.release(rendition_names(post.post_picture_renditions))
+        else:
+            # The picture was replaced while rendering; its own task takes over.
+            MediaBlob.objects.release(rendition_names(renditions))
+    if updated:
+        invalidate_post(post_id)
+
+
+@shared_task
+def sweep_media_blobs():
+    """Delete media blobs that nothing has referenced for a while."""
+    cutoff = timezone.now() - timedelta(seconds=settings.MEDIA_BLOB_GRACE_PERIOD)
+    return delete_unused_blobs(default_storage, cutoff)
+
+
+@shared_task
+def export_user_data(user_id, export_format, name):
+    """Write a gzipped export of a user's data to ``name`` in export storage."""
+    user = get_user_model().objects.filter(pk=user_id).first()
+    if user is None:
+        return
+
+    with tempfile.TemporaryFile() as buffer:
+        with gzip.GzipFile(fileobj=buffer, mode="wb") as archive:
+            for chunk in render_export(user, export_format):
+                archive.write(chunk.encode())
+        buffer.seek(0)
+        storages["exports"].save(name, File(buffer))
+
+
+@shared_task
+def delete_expired_exports():
+    """Delete the background exports older than ``EXPORT_RETENTION``."""
+    storage = storages["exports"]
+    if not storage.exists(""):
+        return 0
+    cutoff = export_expiry_cutoff()
+    deleted = 0
+    for directory in storage.listdir("")[0]:
+        for file_name in storage.listdir(directory)[1]:
+            name = f"{directory}/{file_name}"
+            if storage.get_modified_time(name) < cutoff:
+                storage.delete(name)
+                deleted += 1
+    return deleted
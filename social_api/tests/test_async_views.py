@@ -0,0 +1,124 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from social_api.models import Post, Comment
+from social_api.tasks import fan_out_post
+
+User = get_user_model()
+
+
+class AsyncViewTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.other_user = User.objects.create_user(
+            email="other@gmail.com", password="testpassword"
+        )
+        self.post = Post.objects.create(author=self.other_user, content="Hello")
+        Post.objects.create(author=self.user, content="Mine")
+        Comment.objects.create(user=self.user, post=self.post, content="Hi")
+        token = AccessToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def assertSameResponse(self, sync_url, async_url, **params):
+        expected = self.client.get(sync_url, params)
+        response = self.client.get(async_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected.json())
+        return response
+
+    def test_post_list(self):
+        self.assertSameResponse(
+            reverse("social_api:post-list"), reverse("social_api:async-post-list")
+        )
+        self.assertSameResponse(
+            reverse("social_api:post-list"),
+            reverse("social_api:async-post-list"),
+            filter_by="own",
+            page_size=1,
+        )
+
+        self.user.follow(self.other_user)
+        fan_out_post(Post.objects.create(author=self.other_user, content="Fanned").id)
+        with override_settings(TIMELINE_FANOUT_FOLLOWER_LIMIT=0):
+            # The author's posts are merged in on read as well.
+            response = self.assertSameResponse(
+                reverse("social_api:post-list"),
+                reverse("social_api:async-post-list"),
+                filter_by="following",
+            )
+        self.assertEqual(len(response.json()["results"]), 2)
+        self.assertSameResponse(
+            reverse("social_api:post-list"),
+            reverse("social_api:async-post-list"),
+            filter_by="following",
+            page_size=1,
+        )
+
+    def test_post_retrieve(self):
+        response = self.assertSameResponse(
+            reverse("social_api:post-detail", args=[self.post.id]),
+            reverse("social_api:async-post-detail", args=[self.post.id]),
+        )
+        response = self.client.get(
+            reverse("social_api:async-post-detail", args=[self.post.id]),
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_missing_post(self):
+        response = self.client.get(reverse("social_api:async-post-detail", args=[0]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_comment_list(self):
+        self.assertSameResponse(
+            reverse("social_api:comment-list"),
+            reverse("social_api:async-comment-list"),
+            post=self.post.id,
+        )
+
+    def test_profile(self):
+        self.client.credentials()
+        self.assertSameResponse(
+            reverse("user:user-profile", args=[self.user.email]),
+            reverse("user:async-user-profile", args=[self.user.email]),
+        )
+
+    def test_sparse_fieldsets(self):
+        self.assertSameResponse(
+            reverse("social_api:post-list"),
+            reverse("social_api:async-post-list"),
+            fields="id,content",
+            expand="author",
+        )
+        self.assertSameResponse(
+            reverse("social_api:post-detail", args=[self.post.id]),
+            reverse("social_api:async-post-detail", args=[self.post.id]),
+            fields="id,hashtags",
+        )
+        self.assertSameResponse(
+            reverse("user:user-profile", args=[self.user.email]),
+            reverse("user:async-user-profile", args=[self.user.email]),
+            fields="email,bio",
+        )
+
+        response = self.client.get(
+            reverse("social_api:async-post-list"), {"fields": "id,password"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.json())
+
+    def test_authentication_is_required(self):
+        self.client.credentials()
+        response = self.client.get(reverse("social_api:async-post-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+        response = self.client.get(reverse("social_api:async-post-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
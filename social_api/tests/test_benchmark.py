@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.test import TestCase
+from social_api import benchmark
+
+
+class BenchmarkTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_every_route_is_benchmarked(self):
+        self.assertEqual(benchmark.uncovered_routes(), [])
+
+    def test_run_reports_every_endpoint(self):
+        ctx = benchmark.seed(users=5, posts=10, likes=10, comments=5, follows=5)
+        results = benchmark.run(ctx, iterations=1)
+
+        self.assertEqual(set(results), {e.name for e in benchmark.ENDPOINTS})
+        for name, result in results.items():
+            self.assertTrue(
+                all(code < 400 for code in result["status"]), (name, result)
+            )
+            self.assertGreaterEqual(result["p95_ms"], result["p50_ms"])
+
+    def test_compare_modes_reports_both_modes(self):
+        ctx = benchmark.seed(users=5, posts=10, likes=10, comments=5, follows=5)
+        results = benchmark.compare_modes(ctx, connections=2, requests=4)
+
+        self.assertEqual(set(results), set(benchmark.ASYNC_VARIANTS))
+        for name, modes in results.items():
+            for mode in ("sync", "async"):
+                self.assertEqual(modes[mode]["status"], [200], (name, mode))
+                self.assertGreater(modes[mode]["rps"], 0)
+
+    def test_user_search_benchmark(self):
+        ctx = benchmark.seed_user_search(users=50, batch_size=20)
+        self.assertEqual(ctx["volumes"]["users"], 50)
+        results = benchmark.run(
+            ctx, iterations=1, endpoints=benchmark.USER_SEARCH_ENDPOINTS
+        )
+
+        for name, result in results.items():
+            self.assertEqual(result["status"], [200], name)
+            # Authentication, the ranked ids and the users found.
+            self.assertLessEqual(result["queries"], 3, name)
+
+    def test_compare_flags_query_regressions(self):
+        baseline = {"endpoints": {"posts list": {"queries": 2, "p95_ms": 10.0}}}
+        report = {"endpoints": {"posts list": {"queries": 3, "p95_ms": 20.0}}}
+        regressions, warnings = benchmark.compare(report, baseline)
+        self.assertEqual(regressions, ["posts list: 2 -> 3 queries"])
+        self.assertEqual(len(warnings), 1)
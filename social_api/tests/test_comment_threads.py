@@ -0,0 +1,148 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from social_api.models import Post, Comment
+
+User = get_user_model()
+COMMENT_URL = reverse("social_api:comment-list")
+THREADS_URL = reverse("social_api:comment-threads")
+
+
+class CommentThreadTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.author = User.objects.create_user(
+            email="author@gmail.com", password="testpassword"
+        )
+        self.post = Post.objects.create(author=self.author, content="Post")
+        self.client.force_authenticate(user=self.user)
+
+    def comment(self, content, parent=None, post=None):
+        return Comment.objects.create(
+            user=self.user, post=post or self.post, parent=parent, content=content
+        )
+
+    def test_replies_store_a_materialized_path(self):
+        root = self.comment("Root")
+        reply = self.comment("Reply", parent=root)
+        nested = self.comment("Nested", parent=reply)
+
+        self.assertEqual(root.path, f"{root.id:010d}/")
+        self.assertEqual(
+            nested.path, f"{root.id:010d}/{reply.id:010d}/{nested.id:010d}/"
+        )
+        self.assertEqual([root.depth, reply.depth, nested.depth], [0, 1, 2])
+
+    def test_subtree_is_listed_depth_first(self):
+        root = self.comment("Root")
+        first = self.comment("First", parent=root)
+        second = self.comment("Second", parent=root)
+        under_first = self.comment("Under first", parent=first)
+        self.comment("Other root")
+
+        response = self.client.get(reverse("social_api:comment-thread", args=[root.id]))
+        self.assertEqual(
+            [comment["id"] for comment in response.data],
+            [root.id, first.id, under_first.id, second.id],
+        )
+        self.assertEqual(list(Comment.objects.subtree(first)), [first, under_first])
+
+    def test_threads_show_first_replies_in_two_queries(self):
+        roots = [self.comment(f"Root {i}") for i in range(3)]
+        replies = [self.comment(f"Reply {i}", parent=roots[0]) for i in range(4)]
+        self.comment("Nested", parent=replies[0])
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                THREADS_URL, {"post": self.post.id, "replies": 2}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = response.data["results"]
+        self.assertEqual([comment["id"] for comment in results], [r.id for r in roots])
+        self.assertEqual(
+            [reply["id"] for reply in results[0]["replies"]],
+            [replies[0].id, replies[1].id],
+        )
+        self.assertEqual(results[1]["replies"], [])
+
+    def test_create_reply(self):
+        root = self.comment("Root")
+        response = self.client.post(
+            COMMENT_URL, {"post": self.post.id, "parent": root.id, "content": "Hi"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["depth"], 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+
+    def test_reply_must_be_on_the_same_post(self):
+        other_post = Post.objects.create(author=self.author, content="Other")
+        root = self.comment("Root", post=other_post)
+        response = self.client.post(
+            COMMENT_URL, {"post": self.post.id, "parent": root.id, "content": "Hi"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(COMMENT_MAX_DEPTH=2)
+    def test_depth_is_limited(self):
+        reply = self.comment("Reply", parent=self.comment("Root"))
+        response = self.client.post(
+            COMMENT_URL, {"post": self.post.id, "parent": reply.id, "content": "Hi"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reply_cannot_be_moved(self):
+        root = self.comment("Root")
+        reply = self.comment("Reply", parent=root)
+        url = reverse("social_api:comment-detail", args=[reply.id])
+        response = self.client.patch(url, {"parent": self.comment("Other").id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_deleting_a_comment_removes_its_replies(self):
+        root = self.comment("Root")
+        self.comment("Nested", parent=self.comment("Reply", parent=root))
+        Post.objects.filter(pk=self.post.pk).update(comments_count=3)
+
+        response = self.client.delete(
+            reverse("social_api:comment-detail", args=[root.id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Comment.objects.exists())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 0)
+
+    def test_list_is_paginated_oldest_first(self):
+        comments = [self.comment(f"Comment {i}") for i in range(3)]
+        response = self.client.get(COMMENT_URL, {"post": self.post.id, "page_size": 2})
+        self.assertEqual(
+            [comment["id"] for comment in response.data["results"]],
+            [comments[0].id, comments[1].id],
+        )
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            [comment["id"] for comment in response.data["results"]], [comments[2].id]
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_list_replies_to_a_comment(self):
+        root = self.comment("Root")
+        reply = self.comment("Reply", parent=root)
+        self.comment("Nested", parent=reply)
+        response = self.client.get(COMMENT_URL, {"parent": root.id})
+        self.assertEqual(
+            [comment["id"] for comment in response.data["results"]], [reply.id]
+        )
+
+    def test_bulk_created_comments_get_root_paths(self):
+        Comment.objects.bulk_create(
+            [Comment(user=self.user, post=self.post, content="Bulk")]
+        )
+        Comment.objects.set_root_paths()
+        comment = Comment.objects.get()
+        self.assertEqual(comment.path, f"{comment.id:010d}/")
@@ -44,13 +44,13 @@ class CommentViewSetTests(APITestCase):
         Comment.objects.create(user=self.user, post=self.post, content="Comment 2")
         response = self.client.get(COMMENT_URL, {"post": self.post.id})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data["results"]), 2)
 
     def test_list_comments_no_post(self):
         Comment.objects.create(user=self.user, post=self.post, content="Comment 1")
         response = self.client.get(COMMENT_URL)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_retrieve_comment(self):
         comment = Comment.objects.create(
@@ -0,0 +1,146 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.http import http_date, parse_http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+from social_api.models import Post, Like, Comment
+from social_api.tasks import backfill_timeline
+
+User = get_user_model()
+POST_URL = reverse("social_api:post-list")
+
+
+def detail_url(post_id):
+    return reverse("social_api:post-detail", args=[post_id])
+
+
+class ConditionalGetTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.author = User.objects.create_user(
+            email="author@gmail.com", password="testpassword"
+        )
+        self.post = Post.objects.create(author=self.author, content="Hello")
+        self.client.force_authenticate(user=self.user)
+
+    def revalidate(self, url, etag, **params):
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_post_returns_304_without_serializing(self):
+        response = self.client.get(detail_url(self.post.id))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertEqual(
+            response["Last-Modified"], http_date(self.post.updated_at.timestamp())
+        )
+
+        with self.assertNumQueries(0):
+            response = self.revalidate(detail_url(self.post.id), etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_likes_and_comments_change_the_post_etag(self):
+        etag = self.client.get(detail_url(self.post.id))["ETag"]
+
+        Like.objects.create(user=self.user, post=self.post)
+        response = self.revalidate(detail_url(self.post.id), etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        Comment.objects.create(user=self.user, post=self.post, content="Hi")
+        response = self.revalidate(detail_url(self.post.id), etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        like = Like.objects.get()
+        comment = Comment.objects.get()
+        self.assertEqual(
+            response["Last-Modified"],
+            http_date(max(like.created_at, comment.created_at).timestamp()),
+        )
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(detail_url(self.post.id))["Last-Modified"]
+        response = self.client.get(
+            detail_url(self.post.id), HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_last_modified_moves_on_when_latest_like_is_deleted(self):
+        Post.objects.filter(pk=self.post.pk).update(
+            updated_at=self.post.updated_at - timedelta(days=1)
+        )
+        like = Like.objects.create(user=self.user, post=self.post)
+        last_modified = self.client.get(detail_url(self.post.id))["Last-Modified"]
+        self.assertEqual(last_modified, http_date(like.created_at.timestamp()))
+
+        like.delete()
+        response = self.client.get(detail_url(self.post.id))
+        self.assertGreaterEqual(
+            parse_http_date(response["Last-Modified"]), parse_http_date(last_modified)
+        )
+
+    def test_missing_post_is_still_404(self):
+        response = self.client.get(detail_url(self.post.id + 100))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_unchanged_list_returns_304_without_serializing(self):
+        etag = self.client.get(POST_URL)["ETag"]
+        # The page is read, but not serialized.
+        with self.assertNumQueries(1):
+            response = self.revalidate(POST_URL, etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Other query strings and other users get their own tags.
+        self.assertEqual(
+            self.revalidate(POST_URL, etag, filter_by="own").status_code,
+            status.HTTP_200_OK,
+        )
+        self.client.force_authenticate(user=self.author)
+        self.assertEqual(
+            self.revalidate(POST_URL, etag).status_code, status.HTTP_200_OK
+        )
+
+    def test_new_post_changes_the_list_etag(self):
+        etag = self.client.get(POST_URL)["ETag"]
+        Post.objects.create(author=self.author, content="New")
+        response = self.revalidate(POST_URL, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_changes_off_the_page_keep_the_list_etag(self):
+        newer = Post.objects.create(author=self.author, content="Newer")
+        etag = self.client.get(POST_URL, {"page_size": 1})["ETag"]
+
+        Post.objects.filter(pk=self.post.pk).adjust_counter("likes_count", 1)
+        response = self.revalidate(POST_URL, etag, page_size=1)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Post.objects.filter(pk=newer.pk).adjust_counter("likes_count", 1)
+        response = self.revalidate(POST_URL, etag, page_size=1)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_follow_changes_the_following_feed_etag(self):
+        etag = self.client.get(POST_URL, {"filter_by": "following"})["ETag"]
+        self.user.follow(self.author)
+        backfill_timeline(self.user.id, self.author.id)
+        response = self.revalidate(POST_URL, etag, filter_by="following")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_profile_etag(self):
+        url = reverse("user:user-profile", args=[self.author.email])
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(
+            self.revalidate(url, etag).status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+        self.author.bio = "Changed"
+        self.author.save()
+        self.assertEqual(self.revalidate(url, etag).status_code, status.HTTP_200_OK)
+
+        etag = self.client.get(url)["ETag"]
+        self.user.follow(self.author)
+        self.assertEqual(self.revalidate(url, etag).status_code, status.HTTP_200_OK)
@@ -0,0 +1,161 @@
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.storage import storages
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from social_api.export import export_path
+from social_api.models import Post, Like, Comment
+from social_api.tasks import delete_expired_exports, export_user_data
+
+User = get_user_model()
+EXPORT_URL = reverse("social_api:export")
+
+EXPORT_ROOT = tempfile.mkdtemp()
+EXPORT_STORAGES = {
+    **settings.STORAGES,
+    "exports": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": EXPORT_ROOT},
+    },
+}
+
+
+@override_settings(STORAGES=EXPORT_STORAGES)
+class ExportTests(APITestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(EXPORT_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        other = User.objects.create_user(email="o@gmail.com", password="password")
+        self.post = Post.objects.create(
+            author=self.user, content="Mine", hashtags="django"
+        )
+        self.other_post = Post.objects.create(author=other, content="Theirs")
+        Comment.objects.create(user=self.user, post=self.other_post, content="Nice")
+        Like.objects.create(user=self.user, post=self.other_post)
+        Comment.objects.create(user=other, post=self.post, content="Not mine")
+        self.client.force_authenticate(user=self.user)
+
+    def read(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_ndjson(self):
+        response = self.client.get(EXPORT_URL)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        records = [json.loads(line) for line in self.read(response).splitlines()]
+
+        self.assertEqual(
+            [(record["type"], record["id"]) for record in records],
+            [
+                ("post", self.post.id),
+                ("comment", Comment.objects.get(content="Nice").id),
+                ("like", Like.objects.get().id),
+            ],
+        )
+        self.assertEqual(records[0]["hashtags"], "django")
+        self.assertEqual(records[2]["post"], self.other_post.id)
+
+    @override_settings(EXPORT_CHUNK_SIZE=1)
+    def test_export_csv(self):
+        Post.objects.create(author=self.user, content="Second, with a comma")
+        response = self.client.get(EXPORT_URL, {"export_format": "csv"})
+        self.assertIn("attachment", response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+
+        self.assertEqual(
+            [row["type"] for row in rows], ["post", "post", "comment", "like"]
+        )
+        self.assertEqual(rows[1]["content"], "Second, with a comma")
+
+    def test_export_csv_neutralizes_formulas(self):
+        Post.objects.create(author=self.user, content='=HYPERLINK("http://x")')
+        Post.objects.create(author=self.user, content="-1+2")
+        response = self.client.get(EXPORT_URL, {"export_format": "csv"})
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+
+        self.assertEqual(rows[1]["content"], '\'=HYPERLINK("http://x")')
+        self.assertEqual(rows[2]["content"], "'-1+2")
+        self.assertEqual(rows[0]["id"], str(self.post.id))
+
+    def test_unknown_export_format(self):
+        response = self.client.get(EXPORT_URL, {"export_format": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_background_export_is_scheduled(self):
+        with mock.patch("social_api.views.export_user_data.delay") as delay:
+            response = self.client.post(EXPORT_URL, {"export_format": "csv"})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        user_id, export_format, name = delay.call_args.args
+        self.assertEqual((user_id, export_format), (self.user.id, "csv"))
+        file_name = name.split("/")[-1]
+        self.assertEqual(name, export_path(self.user.id, file_name))
+        self.assertEqual(
+            response.data["url"],
+            "http://testserver"
+            + reverse("social_api:export-download", args=[file_name]),
+        )
+
+    def test_background_export_writes_a_gzip_file(self):
+        export_user_data(self.user.id, "ndjson", "export.ndjson.gz")
+        with storages["exports"].open("export.ndjson.gz") as archive:
+            lines = gzip.decompress(archive.read()).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+
+    def download(self, file_name):
+        return self.client.get(reverse("social_api:export-download", args=[file_name]))
+
+    def test_owner_downloads_background_export(self):
+        export_user_data(self.user.id, "csv", export_path(self.user.id, "a.csv.gz"))
+
+        response = self.download("a.csv.gz")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("attachment", response["Content-Disposition"])
+        content = gzip.decompress(b"".join(response.streaming_content)).decode()
+        self.assertEqual(len(content.splitlines()), 4)
+
+        self.client.logout()
+        self.assertEqual(
+            self.download("a.csv.gz").status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_background_export_of_someone_else(self):
+        other = User.objects.get(email="o@gmail.com")
+        export_user_data(other.id, "csv", export_path(other.id, "b.csv.gz"))
+
+        response = self.download("b.csv.gz")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_expired_background_export(self):
+        name = export_path(self.user.id, "c.csv.gz")
+        export_user_data(self.user.id, "csv", name)
+        fresh = export_path(self.user.id, "d.csv.gz")
+        export_user_data(self.user.id, "csv", fresh)
+        day_ago = (timezone.now() - timedelta(days=1, minutes=1)).timestamp()
+        os.utime(storages["exports"].path(name), (day_ago, day_ago))
+
+        response = self.download("c.csv.gz")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(delete_expired_exports(), 1)
+        self.assertFalse(storages["exports"].exists(name))
+        self.assertTrue(storages["exports"].exists(fresh))
@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from social_api.models import Post, Hashtag
+from social_api.tasks import create_scheduled_post
+from social_api.utils import parse_hashtags
+
+User = get_user_model()
+POST_URL = reverse("social_api:post-list")
+
+
+class ParseHashtagsTests(TestCase):
+
+    def test_parses_field_and_content(self):
+        self.assertEqual(
+            parse_hashtags("#Django, python", "Hello #world and #django"),
+            ["django", "python", "world"],
+        )
+
+    def test_empty(self):
+        self.assertEqual(parse_hashtags(None, "No tags here"), [])
+
+
+class HashtagFilterTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def create_post(self, content, hashtags=""):
+        response = self.client.post(
+            POST_URL, {"content": content, "hashtags": hashtags}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["id"]
+
+    def get_ids(self, params):
+        response = self.client.get(POST_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(post["id"] for post in response.data["results"])
+
+    def test_tags_are_indexed_on_create(self):
+        post_id = self.create_post("Hello #world", "django")
+        self.assertEqual(
+            sorted(Post.objects.get(id=post_id).tags.values_list("name", flat=True)),
+            ["django", "world"],
+        )
+
+    def test_scheduled_post_tags_are_indexed(self):
+        create_scheduled_post(self.user.id, "Scheduled #later", None, "celery")
+        self.assertEqual(
+            sorted(Hashtag.objects.values_list("name", flat=True)),
+            ["celery", "later"],
+        )
+
+    def test_filter_matches_any_tag(self):
+        django = self.create_post("One", "django")
+        python = self.create_post("Two", "python")
+        self.create_post("Three", "rust")
+        self.assertEqual(self.get_ids({"hashtags": "django,#Python"}), [django, python])
+
+    def test_filter_matches_all_tags(self):
+        both = self.create_post("One", "django python")
+        self.create_post("Two", "python")
+        self.assertEqual(
+            self.get_ids({"hashtags": "django,python", "hashtags_match": "all"}),
+            [both],
+        )
+
+    def test_filter_does_not_match_content_substrings(self):
+        self.create_post("I love djangonauts")
+        self.assertEqual(self.get_ids({"hashtags": "django"}), [])
@@ -0,0 +1,131 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APITestCase
+from social_api.models import Post
+from social_api.tasks import generate_post_renditions
+from user.tasks import generate_profile_renditions
+
+User = get_user_model()
+POST_URL = reverse("social_api:post-list")
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image(size=(2000, 1000), orientation=None):
+    image = Image.new("RGB", size, "red")
+    exif = Image.Exif()
+    exif[0x010F] = "Camera maker"
+    if orientation:
+        exif[0x0112] = orientation
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", exif=exif)
+    return SimpleUploadedFile("photo.jpg", buffer.getvalue(), "image/jpeg")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageRenditionTests(APITestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_creating_post_with_picture_schedules_renditions(self):
+        with (
+            mock.patch("social_api.views.fan_out_post.delay"),
+            mock.patch("social_api.views.generate_post_renditions.delay") as delay,
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    POST_URL,
+                    {"content": "Photo", "post_picture": make_image()},
+                    format="multipart",
+                )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        delay.assert_called_once_with(response.data["id"])
+
+    def test_renditions_are_resized_rotated_and_stripped(self):
+        post = Post.objects.create(
+            author=self.user, content="Photo", post_picture=make_image(orientation=6)
+        )
+        generate_post_renditions(post.id)
+        post.refresh_from_db()
+
+        self.assertEqual(set(post.post_picture_renditions), {"thumb", "feed", "full"})
+        with default_storage.open(post.post_picture_renditions["feed"]["jpeg"]) as f:
+            feed = Image.open(f)
+            # Orientation 6 rotates the 2000x1000 original to portrait.
+            self.assertEqual(feed.size, (320, 640))
+            self.assertEqual(len(feed.getexif()), 0)
+        with default_storage.open(post.post_picture_renditions["thumb"]["webp"]) as f:
+            self.assertEqual(Image.open(f).format, "WEBP")
+
+    def test_serializers_expose_rendition_urls(self):
+        post = Post.objects.create(
+            author=self.user, content="Photo", post_picture=make_image()
+        )
+        generate_post_renditions(post.id)
+
+        response = self.client.get(POST_URL)
+        renditions = response.data["results"][0]["post_picture_renditions"]
+        self.assertTrue(renditions["thumb"]["webp"].startswith("http://testserver/"))
+
+    def test_upload_image_replaces_renditions(self):
+        post = Post.objects.create(author=self.user, content="Photo")
+        url = reverse("social_api:post-upload-image", args=[post.id])
+        with mock.patch("social_api.views.generate_post_renditions.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    url, {"post_picture": make_image()}, format="multipart"
+                )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        delay.assert_called_once_with(post.id)
+
+    def test_uploaded_original_is_stored_without_metadata(self):
+        post = Post.objects.create(author=self.user, content="Photo")
+        url = reverse("social_api:post-upload-image", args=[post.id])
+        with mock.patch("social_api.views.generate_post_renditions.delay"):
+            response = self.client.post(
+                url, {"post_picture": make_image(orientation=6)}, format="multipart"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        post.refresh_from_db()
+        with post.post_picture.open("rb") as f:
+            original = Image.open(f)
+            self.assertEqual(original.format, "JPEG")
+            self.assertEqual(original.size, (1000, 2000))
+            self.assertEqual(len(original.getexif()), 0)
+
+    def test_upload_image_to_someone_elses_post(self):
+        other = User.objects.create_user(email="o@gmail.com", password="password")
+        post = Post.objects.create(author=other, content="Not mine")
+        url = reverse("social_api:post-upload-image", args=[post.id])
+        response = self.client.post(
+            url, {"post_picture": make_image()}, format="multipart"
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_profile_picture_renditions(self):
+        self.user.profile_picture = make_image(size=(300, 300))
+        self.user.save()
+        generate_profile_renditions(self.user.id)
+        self.user.refresh_from_db()
+
+        response = self.client.get(reverse("user:manage"))
+        self.assertIn("thumb", response.data["profile_picture_renditions"])
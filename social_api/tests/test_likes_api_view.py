@@ -53,3 +53,77 @@ class LikeViewSetTests(APITestCase):
         url = reverse("social_api:like-detail", args=[self.post.id])
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+LIKE_BATCH_URL = reverse("social_api:like-batch")
+
+
+class LikeBatchTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.other_user = User.objects.create_user(
+            email="other@gmail.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.posts = [
+            Post.objects.create(author=self.other_user, content=f"Post {i}")
+            for i in range(3)
+        ]
+
+    def outcomes(self, response):
+        return {item["post"]: item["status"] for item in response.data["results"]}
+
+    def test_batch_like_and_unlike(self):
+        first, second, third = self.posts
+        Like.objects.create(user=self.user, post=second)
+        Like.objects.create(user=self.user, post=third)
+        own_post = Post.objects.create(author=self.user, content="Mine")
+
+        data = {
+            "like": [first.id, second.id, own_post.id, 999],
+            "unlike": [third.id],
+        }
+        response = self.client.post(LIKE_BATCH_URL, data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.outcomes(response),
+            {
+                first.id: "liked",
+                second.id: "already_liked",
+                own_post.id: "own_post",
+                999: "not_found",
+                third.id: "unliked",
+            },
+        )
+        self.assertEqual(
+            set(Like.objects.values_list("post_id", flat=True)),
+            {first.id, second.id},
+        )
+        first.refresh_from_db()
+        self.assertEqual(first.likes_count, 1)
+
+    def test_batch_query_count_does_not_grow_with_batch_size(self):
+        data = {"like": [post.id for post in self.posts]}
+        with self.assertNumQueries(7):
+            response = self.client.post(LIKE_BATCH_URL, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Like.objects.count(), 3)
+
+    def test_unlike_not_liked(self):
+        data = {"unlike": [self.posts[0].id]}
+        response = self.client.post(LIKE_BATCH_URL, data, format="json")
+        self.assertEqual(self.outcomes(response), {self.posts[0].id: "not_liked"})
+
+    def test_batch_rejects_conflicting_ids(self):
+        post_id = self.posts[0].id
+        data = {"like": [post_id], "unlike": [post_id]}
+        response = self.client.post(LIKE_BATCH_URL, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_requires_ids(self):
+        response = self.client.post(LIKE_BATCH_URL, {}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,157 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from social_api.models import MediaBlob, Post, delete_unused_blobs
+from social_api.tasks import generate_post_renditions, sweep_media_blobs
+
+User = get_user_model()
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image(color="red"):
+    buffer = BytesIO()
+    Image.new("RGB", (100, 100), color).save(buffer, format="PNG")
+    return SimpleUploadedFile("Photo.PNG", buffer.getvalue(), "image/png")
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ContentAddressedStorageTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.addCleanup(shutil.rmtree, MEDIA_ROOT, ignore_errors=True)
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+
+    def refcount(self, name):
+        blob = MediaBlob.objects.filter(name=name).first()
+        return blob.refcount if blob else None
+
+    def sweep(self):
+        # Sweep regardless of when the blobs were saved.
+        cutoff = timezone.now() + timedelta(minutes=1)
+        return delete_unused_blobs(default_storage, cutoff)
+
+    def test_identical_content_is_stored_once(self):
+        first = default_storage.save("a.txt", ContentFile(b"same bytes"))
+        second = default_storage.save("uploads/b.TXT", ContentFile(b"same bytes"))
+
+        self.assertEqual(first, second)
+        self.assertRegex(first, r"^blobs/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.txt$")
+        self.assertTrue(default_storage.exists(first))
+        with default_storage.open(first) as stored:
+            self.assertEqual(stored.read(), b"same bytes")
+
+    def test_posts_share_a_blob_until_the_last_one_is_deleted(self):
+        first = Post.objects.create(
+            author=self.user, content="One", post_picture=make_image()
+        )
+        second = Post.objects.create(
+            author=self.user, content="Two", post_picture=make_image()
+        )
+        name = first.post_picture.name
+        self.assertEqual(second.post_picture.name, name)
+        self.assertEqual(self.refcount(name), 2)
+
+        first.delete()
+        self.assertEqual(self.refcount(name), 1)
+        self.assertTrue(default_storage.exists(name))
+
+        second.delete()
+        self.assertEqual(self.refcount(name), 0)
+        self.assertTrue(default_storage.exists(name))
+
+        self.assertEqual(self.sweep(), 1)
+        self.assertIsNone(self.refcount(name))
+        self.assertFalse(default_storage.exists(name))
+
+    def test_replacing_a_picture_releases_the_old_blob(self):
+        post = Post.objects.create(
+            author=self.user, content="One", post_picture=make_image()
+        )
+        old_name = post.post_picture.name
+
+        post.post_picture = make_image("blue")
+        post.save()
+        self.sweep()
+
+        self.assertEqual(self.refcount(post.post_picture.name), 1)
+        self.assertIsNone(self.refcount(old_name))
+        self.assertFalse(default_storage.exists(old_name))
+
+    def test_saving_without_a_new_picture_keeps_the_count(self):
+        post = Post.objects.create(
+            author=self.user, content="One", post_picture=make_image()
+        )
+        post.content = "Edited"
+        post.save()
+        Post.objects.get(pk=post.pk).save()
+
+        self.assertEqual(self.refcount(post.post_picture.name), 1)
+
+    def test_renditions_are_counted_and_released(self):
+        post = Post.objects.create(
+            author=self.user, content="One", post_picture=make_image()
+        )
+        generate_post_renditions(post.id)
+        post.refresh_from_db()
+        # A 100px picture renders identically at every size.
+        thumb = post.post_picture_renditions["thumb"]["webp"]
+        self.assertEqual(post.post_picture_renditions["full"]["webp"], thumb)
+        self.assertEqual(self.refcount(thumb), 3)
+
+        self.user.delete()
+        self.sweep()
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertFalse(default_storage.exists(thumb))
+
+    def test_profile_picture_is_counted(self):
+        self.user.profile_picture = make_image()
+        self.user.save()
+        Post.objects.create(author=self.user, content="One", post_picture=make_image())
+
+        self.assertEqual(self.refcount(self.user.profile_picture.name), 2)
+
+    def test_sweep_keeps_recently_saved_blobs(self):
+        post = Post.objects.create(
+            author=self.user, content="One", post_picture=make_image()
+        )
+        name = post.post_picture.name
+        post.delete()
+
+        self.assertEqual(sweep_media_blobs(), 0)
+        self.assertTrue(default_storage.exists(name))
+
+    def test_sweep_deletes_files_that_were_never_counted(self):
+        name = default_storage.save("orphan.txt", ContentFile(b"rolled back"))
+
+        self.assertEqual(self.sweep(), 1)
+        self.assertFalse(default_storage.exists(name))
+        self.assertFalse(MediaBlob.objects.exists())
+
+    def test_saving_a_blob_again_protects_it_from_the_sweep(self):
+        name = default_storage.save("a.txt", ContentFile(b"same bytes"))
+        cutoff = timezone.now() - timedelta(minutes=1)
+        os.utime(default_storage.path(name), (0, 0))
+
+        default_storage.save("b.txt", ContentFile(b"same bytes"))
+        self.assertEqual(delete_unused_blobs(default_storage, cutoff), 0)
+
+        os.utime(default_storage.path(name), (0, 0))
+        self.assertEqual(delete_unused_blobs(default_storage, cutoff), 1)
@@ -49,13 +49,13 @@ class PostViewSetTests(APITestCase):
         Post.objects.create(author=self.user, content="Post 2")
         response = self.client.get(POST_URL)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data["results"]), 2)
 
     def test_filter_posts_by_id(self):
         post = Post.objects.create(author=self.user, content="Post to be filtered")
         response = self.client.get(POST_URL, {"post": post.id})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_filter_posts_by_date(self):
         post = Post.objects.create(
@@ -0,0 +1,79 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from social_api.models import Post, Like, Comment
+
+User = get_user_model()
+
+LIKE_URL = reverse("social_api:like-list")
+COMMENT_URL = reverse("social_api:comment-list")
+
+
+class PostCountersTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.other_user = User.objects.create_user(
+            email="other@gmail.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.post = Post.objects.create(author=self.other_user, content="Post")
+
+    def test_like_and_unlike_update_likes_count(self):
+        self.client.post(LIKE_URL, {"post": self.post.id})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+        url = reverse("social_api:like-detail", args=[self.post.id])
+        self.client.delete(url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_comment_create_and_delete_update_comments_count(self):
+        response = self.client.post(
+            COMMENT_URL, {"post": self.post.id, "content": "Hi"}, format="json"
+        )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+
+        url = reverse("social_api:comment-detail", args=[response.data["id"]])
+        self.client.delete(url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 0)
+
+    def test_counter_never_goes_negative(self):
+        Like.objects.create(user=self.user, post=self.post)
+        url = reverse("social_api:like-detail", args=[self.post.id])
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_list_serializes_counters_without_count_queries(self):
+        for i in range(3):
+            Post.objects.create(author=self.other_user, content=f"Post {i}")
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("social_api:post-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_recount_command_repairs_drift(self):
+        Like.objects.create(user=self.user, post=self.post)
+        Comment.objects.create(user=self.user, post=self.post, content="a")
+        Comment.objects.create(user=self.user, post=self.post, content="b")
+        untouched = Post.objects.create(author=self.user, content="Untouched")
+
+        out = StringIO()
+        call_command("recount_post_counters", "--batch-size", "1", stdout=out)
+
+        self.post.refresh_from_db()
+        untouched.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(self.post.comments_count, 2)
+        self.assertEqual(untouched.likes_count, 0)
+        self.assertIn("Repaired 1 drifted", out.getvalue())
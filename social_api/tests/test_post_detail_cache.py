@@ -0,0 +1,112 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from social_api.cache import get_post_detail, invalidate_post
+from social_api.models import Post, Like, Comment
+
+User = get_user_model()
+
+
+def detail_url(post_id):
+    return reverse("social_api:post-detail", args=[post_id])
+
+
+class PostDetailCacheTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.other_user = User.objects.create_user(
+            email="other@gmail.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.post = Post.objects.create(author=self.other_user, content="Cached")
+
+    def test_second_retrieve_is_served_from_cache(self):
+        self.client.get(detail_url(self.post.id))
+        with self.assertNumQueries(0):
+            response = self.client.get(detail_url(self.post.id))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["content"], "Cached")
+
+    @override_settings(ALLOWED_HOSTS=["*"])
+    def test_media_urls_use_each_requests_host(self):
+        Post.objects.filter(pk=self.post.pk).update(
+            post_picture="blobs/ab/picture.jpg",
+            post_picture_renditions={"thumb": {"webp": "blobs/cd/thumb.webp"}},
+        )
+        self.client.get(detail_url(self.post.id), HTTP_HOST="one.example.com")
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                detail_url(self.post.id), HTTP_HOST="two.example.com"
+            )
+
+        self.assertTrue(
+            response.data["post_picture"].startswith("http://two.example.com/")
+        )
+        self.assertTrue(
+            response.data["post_picture_renditions"]["thumb"]["webp"].startswith(
+                "http://two.example.com/"
+            )
+        )
+
+    def test_post_update_invalidates(self):
+        self.client.get(detail_url(self.post.id))
+        self.post.content = "Edited"
+        self.post.save()
+        response = self.client.get(detail_url(self.post.id))
+        self.assertEqual(response.data["content"], "Edited")
+
+    def test_like_and_comment_invalidate(self):
+        self.client.get(detail_url(self.post.id))
+        self.client.post(reverse("social_api:like-list"), {"post": self.post.id})
+        response = self.client.get(detail_url(self.post.id))
+        self.assertEqual(response.data["likes_count"], 1)
+
+        Comment.objects.create(user=self.user, post=self.post, content="Hi")
+        Post.objects.filter(pk=self.post.pk).adjust_counter("comments_count", 1)
+        response = self.client.get(detail_url(self.post.id))
+        self.assertEqual(response.data["comments_count"], 1)
+
+    def test_deleted_post_is_not_served(self):
+        self.client.get(detail_url(self.post.id))
+        Like.objects.create(user=self.user, post=self.post)
+        self.post.delete()
+        response = self.client.get(detail_url(self.post.id))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PostDetailStampedeTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_misses_build_once(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"id": 1}
+
+        invalidate_post(1)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_post_detail(1, build)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"id": 1}] * 5)
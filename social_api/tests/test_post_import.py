@@ -0,0 +1,93 @@
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from social_api.models import Post
+from social_api.search import get_search_backend
+
+User = get_user_model()
+IMPORT_URL = reverse("social_api:post-import-posts")
+
+
+def ndjson(*rows):
+    return "\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows)
+
+
+class PostImportTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def post_import(self, body):
+        with mock.patch("social_api.views.fan_out_posts.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    IMPORT_URL, body, content_type="application/x-ndjson"
+                )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, delay
+
+    def test_import_creates_posts(self):
+        response, delay = self.post_import(
+            ndjson(
+                {"content": "First #django", "hashtags": "python"},
+                {"content": "Second"},
+            )
+        )
+        self.assertEqual(response.data, {"created": 2, "failed": 0, "errors": []})
+        posts = Post.objects.filter(author=self.user)
+        self.assertEqual(posts.count(), 2)
+        first = posts.get(content="First #django")
+        self.assertEqual(
+            sorted(first.tags.values_list("name", flat=True)), ["django", "python"]
+        )
+        self.assertEqual(len(get_search_backend().search("second")), 1)
+        delay.assert_called_once()
+
+    def test_invalid_lines_are_reported(self):
+        response, _ = self.post_import(
+            ndjson({"content": "Good"}, "{not json", {"hashtags": "x"}, "", "[1, 2]")
+        )
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(response.data["failed"], 3)
+        self.assertEqual(
+            [error["line"] for error in response.data["errors"]], [2, 3, 5]
+        )
+        self.assertIn("content", response.data["errors"][1]["errors"])
+
+    @override_settings(POST_IMPORT_BATCH_SIZE=2, POST_IMPORT_MAX_ERRORS=1)
+    def test_import_in_batches(self):
+        response, delay = self.post_import(
+            ndjson(*[{"content": f"Post {i}"} for i in range(5)], "{}", "{}")
+        )
+        self.assertEqual(response.data["created"], 5)
+        self.assertEqual(response.data["failed"], 2)
+        self.assertEqual(len(response.data["errors"]), 1)
+        self.assertEqual(delay.call_count, 3)
+
+    def test_author_cannot_be_overridden(self):
+        other = User.objects.create_user(email="o@gmail.com", password="password")
+        self.post_import(ndjson({"content": "Mine", "author": other.id}))
+        self.assertEqual(Post.objects.get().author, self.user)
+
+    def test_empty_body(self):
+        response, _ = self.post_import("")
+        self.assertEqual(response.data["created"], 0)
+
+    def test_body_without_content_length_is_rejected(self):
+        response = self.client.post(
+            IMPORT_URL,
+            ndjson({"content": "Chunked"}),
+            content_type="application/x-ndjson",
+            CONTENT_LENGTH="",
+            HTTP_TRANSFER_ENCODING="chunked",
+        )
+        self.assertEqual(response.status_code, status.HTTP_411_LENGTH_REQUIRED)
+        self.assertFalse(Post.objects.exists())
@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from social_api.models import Post, Like
+
+User = get_user_model()
+POST_URL = reverse("social_api:post-list")
+
+
+class PostPaginationTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.other_user = User.objects.create_user(
+            email="other@gmail.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.posts = [
+            Post.objects.create(author=self.other_user, content=f"Post {i}")
+            for i in range(5)
+        ]
+
+    def collect_pages(self, params):
+        ids = []
+        response = self.client.get(POST_URL, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(post["id"] for post in response.data["results"])
+            if not response.data["next"]:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def test_pages_are_newest_first_without_duplicates(self):
+        ids = self.collect_pages({"page_size": 2})
+        self.assertEqual(ids, [post.id for post in reversed(self.posts)])
+
+    def test_ties_on_created_at_are_broken_by_id(self):
+        created_at = self.posts[0].created_at
+        Post.objects.update(created_at=created_at)
+        ids = self.collect_pages({"page_size": 2})
+        self.assertEqual(ids, sorted((post.id for post in self.posts), reverse=True))
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(POST_URL, {"page_size": 10_000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertIsNone(response.data["next"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(POST_URL, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_liked_posts_are_paginated(self):
+        for post in self.posts[:3]:
+            Like.objects.create(user=self.user, post=post)
+        ids = self.collect_pages({"liked": "", "page_size": 2})
+        self.assertEqual(ids, [post.id for post in reversed(self.posts[:3])])
+
+    def test_own_posts_filter_applies_to_list(self):
+        own_post = Post.objects.create(author=self.user, content="Mine")
+        ids = self.collect_pages({"filter_by": "own"})
+        self.assertEqual(ids, [own_post.id])
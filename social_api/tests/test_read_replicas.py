@@ -0,0 +1,131 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from social_api.models import Post, Comment
+from social_media_api.replicas import PIN_KEY
+
+User = get_user_model()
+POSTS_URL = reverse("social_api:post-list")
+COMMENTS_URL = reverse("social_api:comment-list")
+PROFILES_URL = reverse("user:profile")
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReadReplicaTests(TransactionTestCase):
+    """
+    The replica is a second SQLite database that only catches up with the
+    primary when ``replicate()`` copies it over, like a lagging replica.
+    """
+
+    # The replica is registered for this class only, in setUpClass(), so the
+    # test runner neither creates nor checks it.
+    databases = {"default"}
+
+    @classmethod
+    def setUpClass(cls):
+        # Closing an in-memory SQLite connection is a no-op, so the replica
+        # lives until remove_replica() closes it for real.
+        configured = connections.configure_settings(
+            {
+                **settings.DATABASES,
+                "replica": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"},
+            }
+        )
+        connections.settings["replica"] = configured["replica"]
+        cls.addClassCleanup(cls.remove_replica)
+        cls.databases = {"default", "replica"}
+        super().setUpClass()
+
+    @classmethod
+    def remove_replica(cls):
+        replica = connections["replica"]
+        if replica.connection is not None:
+            replica.connection.close()
+        del connections["replica"]
+        del connections.settings["replica"]
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            email="author@gmail.com", password="testpassword"
+        )
+        self.reader = User.objects.create_user(
+            email="reader@gmail.com", password="testpassword"
+        )
+        self.replicate()
+
+    def replicate(self):
+        connections["replica"].close()
+        connections["default"].ensure_connection()
+        replica = connections["replica"]
+        replica.ensure_connection()
+        connections["default"].connection.backup(replica.connection)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def post_ids(self, client):
+        return [post["id"] for post in client.get(POSTS_URL).data["results"]]
+
+    def test_reads_lag_until_replicated(self):
+        post = Post.objects.create(author=self.author, content="Hello")
+        reader = self.client_for(self.reader)
+
+        self.assertEqual(self.post_ids(reader), [])
+        self.replicate()
+        self.assertEqual(self.post_ids(reader), [post.id])
+
+    def test_writer_reads_from_primary(self):
+        author = self.client_for(self.author)
+        with mock.patch("social_api.views.fan_out_post.delay"):
+            response = author.post(POSTS_URL, {"content": "Hello"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(self.post_ids(author), [response.data["id"]])
+        self.assertEqual(self.post_ids(self.client_for(self.reader)), [])
+
+        cache.delete(PIN_KEY.format(user_id=self.author.id))
+        self.assertEqual(self.post_ids(author), [])
+
+    def test_comments_and_profiles_read_from_replica(self):
+        post = Post.objects.create(author=self.author, content="Hello")
+        Comment.objects.create(user=self.reader, post=post, content="Hi")
+        User.objects.create_user(email="new@gmail.com", password="testpassword")
+        reader = self.client_for(self.reader)
+
+        response = reader.get(COMMENTS_URL, {"post": post.id})
+        self.assertEqual(response.data["results"], [])
+        emails = [user["email"] for user in reader.get(PROFILES_URL).data]
+        self.assertNotIn("new@gmail.com", emails)
+
+    def test_cached_detail_is_filled_from_primary(self):
+        post = Post.objects.create(author=self.author, content="Hello")
+        response = self.client_for(self.reader).get(
+            reverse("social_api:post-detail", args=[post.id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["content"], "Hello")
+
+    def test_async_views_read_from_replica(self):
+        post = Post.objects.create(author=self.author, content="Hello")
+        reader = APIClient()
+        token = AccessToken.for_user(self.reader)
+        reader.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        url = reverse("social_api:async-post-list")
+
+        self.assertEqual(reader.get(url).json()["results"], [])
+        self.replicate()
+        self.assertEqual(
+            [result["id"] for result in reader.get(url).json()["results"]], [post.id]
+        )
@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from social_api.models import Post
+from social_media_api.metrics import registry
+
+User = get_user_model()
+POST_URL = reverse("social_api:post-list")
+METRICS_URL = reverse("metrics")
+
+
+class RequestMetricsTests(APITestCase):
+
+    def setUp(self):
+        registry.clear()
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        Post.objects.create(author=self.user, content="Post")
+
+    def test_server_timing_header(self):
+        response = self.client.get(POST_URL)
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="1 queries", total;dur=[\d.]+$',
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_are_aggregated_per_view(self):
+        self.client.get(POST_URL)
+        self.client.get(POST_URL)
+
+        response = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer secret")
+        body = response.content.decode()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("# TYPE api_request_duration_seconds histogram", body)
+        self.assertIn(
+            'api_request_db_queries_bucket{view="social:post-list",method="GET",'
+            'le="1"} 2',
+            body,
+        )
+        self.assertIn(
+            'api_request_duration_seconds_count{view="social:post-list",'
+            'method="GET"} 2',
+            body,
+        )
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 403)
+        response = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_TOKEN=None)
+    def test_metrics_without_token_are_staff_only(self):
+        response = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer None")
+        self.assertEqual(response.status_code, 403)
+
+        staff = User.objects.create_user(
+            email="staff@gmail.com", password="testpassword", is_staff=True
+        )
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(METRICS_URL).status_code, 200)
@@ -0,0 +1,143 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from django_celery_beat.models import PeriodicTask
+from rest_framework import status
+from rest_framework.test import APITestCase
+from social_api.models import Post, ScheduledPost, TimelineEntry
+from social_api.search import get_search_backend
+from social_api.serializers import ScheduledPostSerializer
+from social_api.tasks import fan_out_posts, publish_due_posts
+
+User = get_user_model()
+SCHEDULE_URL = reverse("social_api:post-schedule-post-creation")
+SCHEDULED_URL = reverse("social_api:scheduledpost-list")
+
+
+def detail_url(scheduled_id):
+    return reverse("social_api:scheduledpost-detail", args=[scheduled_id])
+
+
+class ScheduledPostTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def schedule(self, content="Later", minutes=10, author=None, **kwargs):
+        return ScheduledPost.objects.create(
+            author=author or self.user,
+            content=content,
+            publish_at=timezone.now() + timedelta(minutes=minutes),
+            **kwargs,
+        )
+
+    def test_schedule_post_creation_stores_a_row(self):
+        response = self.client.post(
+            SCHEDULE_URL, {"content": "Later", "delay_minutes": 5}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        scheduled = ScheduledPost.objects.get(pk=response.data["id"])
+        self.assertEqual(scheduled.author, self.user)
+        self.assertGreater(scheduled.publish_at, timezone.now())
+        self.assertFalse(Post.objects.exists())
+
+    def test_list_only_own_scheduled_posts_soonest_first(self):
+        other = User.objects.create_user(email="o@gmail.com", password="password")
+        later = self.schedule("Later", minutes=20)
+        sooner = self.schedule("Sooner", minutes=5)
+        self.schedule("Not mine", author=other)
+
+        response = self.client.get(SCHEDULED_URL)
+        ids = [row["id"] for row in response.data["results"]]
+        self.assertEqual(ids, [sooner.id, later.id])
+
+    def test_edit_scheduled_post(self):
+        scheduled = self.schedule()
+        publish_at = timezone.now() + timedelta(hours=2)
+        response = self.client.patch(
+            detail_url(scheduled.id),
+            {"content": "Edited", "publish_at": publish_at.isoformat()},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        scheduled.refresh_from_db()
+        self.assertEqual(scheduled.content, "Edited")
+        self.assertEqual(scheduled.publish_at, publish_at)
+
+    def test_cannot_move_publish_at_into_the_past(self):
+        scheduled = self.schedule()
+        past = timezone.now() - timedelta(minutes=1)
+        response = self.client.patch(
+            detail_url(scheduled.id), {"publish_at": past.isoformat()}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cannot_edit_due_post(self):
+        scheduled = self.schedule(minutes=-1)
+        response = self.client.patch(detail_url(scheduled.id), {"content": "Edited"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        scheduled.refresh_from_db()
+        self.assertEqual(scheduled.content, "Later")
+
+    def test_edit_after_publishing_does_not_restore_the_row(self):
+        scheduled = self.schedule()
+
+        def publish(serializer, attrs):
+            # publish_due_posts removes the row between validation and save.
+            ScheduledPost.objects.filter(pk=scheduled.pk).delete()
+            return attrs
+
+        with mock.patch.object(ScheduledPostSerializer, "validate", publish):
+            response = self.client.patch(
+                detail_url(scheduled.id), {"content": "Edited"}
+            )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(ScheduledPost.objects.exists())
+
+    def test_cancel_scheduled_post(self):
+        scheduled = self.schedule()
+        response = self.client.delete(detail_url(scheduled.id))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(ScheduledPost.objects.exists())
+
+    def test_cannot_cancel_someone_elses_scheduled_post(self):
+        other = User.objects.create_user(email="o@gmail.com", password="password")
+        scheduled = self.schedule(author=other)
+        response = self.client.delete(detail_url(scheduled.id))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(ScheduledPost.objects.exists())
+
+    def test_publish_due_posts(self):
+        follower = User.objects.create_user(email="f@gmail.com", password="password")
+        follower.follow(self.user)
+        self.schedule("Due #django", minutes=-1, hashtags="python")
+        self.schedule("Also due", minutes=-2)
+        pending = self.schedule("Not yet", minutes=10)
+
+        with mock.patch("social_api.tasks.fan_out_posts.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                published = publish_due_posts(batch_size=1)
+
+        self.assertEqual(published, 2)
+        self.assertEqual(list(ScheduledPost.objects.all()), [pending])
+        self.assertEqual(delay.call_count, 2)
+        post = Post.objects.get(content="Due #django")
+        self.assertEqual(post.author, self.user)
+        self.assertEqual(
+            sorted(post.tags.values_list("name", flat=True)), ["django", "python"]
+        )
+        results = get_search_backend().search("due")
+        self.assertEqual(len(results), 2)
+
+        for call in delay.call_args_list:
+            fan_out_posts(*call.args)
+        self.assertEqual(TimelineEntry.objects.filter(user=follower).count(), 2)
+
+    def test_beat_runs_publisher(self):
+        task = PeriodicTask.objects.get(task="social_api.tasks.publish_due_posts")
+        self.assertEqual(task.interval.every, 1)
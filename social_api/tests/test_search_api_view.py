@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from social_api.models import Post, Comment
+
+User = get_user_model()
+SEARCH_URL = reverse("social_api:search")
+
+
+class SearchViewTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.post = Post.objects.create(
+            author=self.user, content="Celery makes scheduling posts easy"
+        )
+        self.comment = Comment.objects.create(
+            user=self.user, post=self.post, content="I prefer cron for scheduling"
+        )
+        Post.objects.create(author=self.user, content="Nothing to see here")
+
+    def search(self, **params):
+        response = self.client.get(SEARCH_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_search_posts_and_comments(self):
+        results = self.search(q="scheduling")["results"]
+        self.assertEqual(
+            {(hit["type"], hit["id"]) for hit in results},
+            {("post", self.post.id), ("comment", self.comment.id)},
+        )
+
+    def test_search_highlights_snippet(self):
+        results = self.search(q="celery", type="post")["results"]
+        self.assertEqual(len(results), 1)
+        self.assertIn("<mark>Celery</mark>", results[0]["snippet"])
+
+    def test_search_escapes_snippet(self):
+        Post.objects.create(
+            author=self.user, content='<img src=x onerror="alert(1)"> Kombu'
+        )
+        snippet = self.search(q="kombu")["results"][0]["snippet"]
+        self.assertEqual(
+            snippet, "&lt;img src=x onerror=&quot;alert(1)&quot;&gt; <mark>Kombu</mark>"
+        )
+
+    def test_search_prefix_of_last_term(self):
+        results = self.search(q="sched", type="comment")["results"]
+        self.assertEqual([hit["id"] for hit in results], [self.comment.id])
+
+    def test_search_ignores_query_syntax(self):
+        results = self.search(q='"celery"* -(^')["results"]
+        self.assertEqual([hit["id"] for hit in results], [self.post.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.post.content = "Renamed"
+        self.post.save()
+        self.assertEqual(self.search(q="celery")["results"], [])
+
+        self.comment.delete()
+        self.assertEqual(self.search(q="cron")["results"], [])
+
+    def test_search_is_paginated(self):
+        for i in range(3):
+            Post.objects.create(author=self.user, content=f"paging post {i}")
+        data = self.search(q="paging", page_size=2)
+        self.assertEqual(len(data["results"]), 2)
+        response = self.client.get(data["next"])
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNone(response.data["next"])
+
+    def test_query_is_required(self):
+        response = self.client.get(SEARCH_URL)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
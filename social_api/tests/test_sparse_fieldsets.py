@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from social_api.models import Post
+
+User = get_user_model()
+POSTS_URL = reverse("social_api:post-list")
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.post = Post.objects.create(
+            author=self.user, content="Hello", hashtags="#django"
+        )
+
+    def get_posts(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(POSTS_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        select = next(q["sql"] for q in queries if '"social_api_post"' in q["sql"])
+        return response.data["results"], select
+
+    def test_fields_trim_output_and_columns(self):
+        results, select = self.get_posts(fields="id,content")
+
+        self.assertEqual(results, [{"id": self.post.id, "content": "Hello"}])
+        self.assertNotIn('"likes_count"', select)
+        self.assertNotIn('"post_picture_renditions"', select)
+
+    def test_expand_author(self):
+        results, select = self.get_posts(fields="id", expand="author")
+
+        self.assertEqual(results[0]["author"]["email"], self.user.email)
+        self.assertEqual(set(results[0]), {"id", "author"})
+        self.assertIn('"user_customeruser"', select)
+
+    def test_detail_fields(self):
+        url = reverse("social_api:post-detail", args=[self.post.id])
+        response = self.client.get(url, {"fields": "id,hashtags"})
+        self.assertEqual(response.data, {"id": self.post.id, "hashtags": "#django"})
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(POSTS_URL, {"fields": "id,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(POSTS_URL, {"expand": "content"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_writes_ignore_fields(self):
+        response = self.client.post(
+            f"{POSTS_URL}?fields=id", {"content": "New"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["content"], "New")
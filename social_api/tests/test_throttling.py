@@ -0,0 +1,80 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from social_api.models import Post
+from social_api.throttling import ActionRateThrottle
+
+User = get_user_model()
+
+COMMENT_URL = reverse("social_api:comment-list")
+FOLLOW_URL = reverse("user:follow-unfollow")
+WINDOW_START = 1_700_000_040.0
+
+
+class ActionRateThrottleTests(APITestCase):
+    def setUp(self):
+        caches["throttle"].clear()
+        self.addCleanup(caches["throttle"].clear)
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.other_user = User.objects.create_user(
+            email="other@gmail.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.post = Post.objects.create(author=self.other_user, content="Post")
+
+        timer = mock.patch.object(ActionRateThrottle, "timer")
+        self.timer = timer.start()
+        self.addCleanup(timer.stop)
+        self.timer.return_value = WINDOW_START
+
+    def comment(self):
+        return self.client.post(
+            COMMENT_URL, {"post": self.post.id, "content": "Hi"}, format="json"
+        )
+
+    def test_action_budget_is_enforced(self):
+        for _ in range(10):
+            self.assertEqual(self.comment().status_code, status.HTTP_201_CREATED)
+
+        response = self.comment()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        # The full window becomes the previous one; 10% of it has to slide out.
+        self.assertEqual(response["Retry-After"], "66")
+
+    def test_budgets_are_per_scope(self):
+        for _ in range(10):
+            self.comment()
+
+        response = self.client.post(FOLLOW_URL, {"email": self.other_user.email})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get(COMMENT_URL, {"post": self.post.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_previous_window_slides_out(self):
+        for _ in range(10):
+            self.comment()
+
+        # 90% of the previous window still overlaps: only one more fits.
+        self.timer.return_value = WINDOW_START + 66
+        self.assertEqual(self.comment().status_code, status.HTTP_201_CREATED)
+        response = self.comment()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response["Retry-After"], "6")
+
+        self.timer.return_value = WINDOW_START + 72
+        self.assertEqual(self.comment().status_code, status.HTTP_201_CREATED)
+
+    def test_rejected_requests_do_not_use_the_budget(self):
+        for _ in range(15):
+            self.comment()
+
+        self.timer.return_value = WINDOW_START + 90
+        for _ in range(5):
+            self.assertEqual(self.comment().status_code, status.HTTP_201_CREATED)
@@ -0,0 +1,133 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from social_api.models import Post, TimelineEntry
+from social_api.tasks import fan_out_post
+
+User = get_user_model()
+POST_URL = reverse("social_api:post-list")
+
+
+class TimelineTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword"
+        )
+        self.author = User.objects.create_user(
+            email="author@gmail.com", password="testpassword"
+        )
+        self.stranger = User.objects.create_user(
+            email="stranger@gmail.com", password="testpassword"
+        )
+        self.user.follow(self.author)
+        self.client.force_authenticate(user=self.user)
+
+    def get_feed_ids(self):
+        response = self.client.get(POST_URL, {"filter_by": "following"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post["id"] for post in response.data["results"]]
+
+    def test_creating_post_schedules_fan_out(self):
+        self.client.force_authenticate(user=self.author)
+        with mock.patch("social_api.views.fan_out_post.delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(POST_URL, {"content": "Hello"})
+        delay.assert_called_once_with(response.data["id"])
+
+    def test_fan_out_fills_followers_timelines(self):
+        post = Post.objects.create(author=self.author, content="Hello")
+        Post.objects.create(author=self.stranger, content="Not followed")
+        fan_out_post(post.id)
+
+        self.assertTrue(
+            TimelineEntry.objects.filter(user=self.user, post=post).exists()
+        )
+        self.assertEqual(self.get_feed_ids(), [post.id])
+
+    def test_fan_out_streams_followers_in_batches(self):
+        followers = [
+            User.objects.create_user(email=f"fan{i}@gmail.com", password="pass")
+            for i in range(4)
+        ]
+        for follower in followers:
+            follower.follow(self.author)
+        post = Post.objects.create(author=self.author, content="Hello")
+        with mock.patch("social_api.tasks.FAN_OUT_BATCH_SIZE", 2):
+            fan_out_post(post.id)
+
+        self.assertEqual(
+            set(TimelineEntry.objects.values_list("user_id", flat=True)),
+            {self.user.id, *(follower.id for follower in followers)},
+        )
+
+    @override_settings(TIMELINE_FANOUT_FOLLOWER_LIMIT=5)
+    def test_fan_out_skips_authors_by_followers_count(self):
+        User.objects.filter(pk=self.author.pk).update(followers_count=6)
+        post = Post.objects.create(author=self.author, content="Viral")
+        with self.assertNumQueries(1):
+            fan_out_post(post.id)
+
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.get_feed_ids(), [post.id])
+
+    @override_settings(TIMELINE_MAX_LENGTH=2)
+    def test_timeline_is_trimmed(self):
+        posts = [
+            Post.objects.create(author=self.author, content=f"Post {i}")
+            for i in range(4)
+        ]
+        for post in posts:
+            fan_out_post(post.id)
+
+        self.assertEqual(TimelineEntry.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(self.get_feed_ids(), [posts[3].id, posts[2].id])
+
+    @override_settings(TIMELINE_FANOUT_FOLLOWER_LIMIT=0)
+    def test_high_follower_authors_are_merged_on_read(self):
+        post = Post.objects.create(author=self.author, content="Viral")
+        fan_out_post(post.id)
+
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.get_feed_ids(), [post.id])
+
+    @override_settings(TIMELINE_FANOUT_FOLLOWER_LIMIT=5)
+    def test_pages_merge_timeline_and_high_follower_authors(self):
+        celebrity = User.objects.create_user(
+            email="celebrity@gmail.com", password="testpassword"
+        )
+        self.user.follow(celebrity)
+        User.objects.filter(pk=celebrity.pk).update(followers_count=10)
+        posts = []
+        for i in range(5):
+            author = celebrity if i % 2 else self.author
+            post = Post.objects.create(author=author, content=f"Post {i} #django")
+            post.sync_hashtags()
+            if author == self.author:
+                fan_out_post(post.id)
+            posts.append(post)
+        Post.objects.create(author=self.stranger, content="Not followed #django")
+
+        ids, url = [], f"{POST_URL}?filter_by=following&page_size=2"
+        while url:
+            response = self.client.get(url)
+            ids += [post["id"] for post in response.data["results"]]
+            url = response.data["next"]
+        tagged = self.client.get(
+            POST_URL, {"filter_by": "following", "hashtags": "django"}
+        )
+
+        self.assertEqual(TimelineEntry.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(ids, [post.id for post in reversed(posts)])
+        self.assertEqual(len(tagged.data["results"]), 5)
+
+    def test_unfollow_removes_author_from_timeline(self):
+        post = Post.objects.create(author=self.author, content="Hello")
+        fan_out_post(post.id)
+        url = reverse("user:follow-unfollow")
+        self.client.delete(url, {"email": self.author.email})
+        self.assertEqual(self.get_feed_ids(), [])
@@ -0,0 +1,97 @@
+"""
+Throttles that count requests in the shared ``throttle`` cache.
+
+DRF's throttles keep a list of request timestamps per client and rewrite it
+on every request, which is neither atomic nor cheap once the cache is shared
+between workers. These use a sliding-window counter instead: requests are
+counted per fixed window with ``incr()``, and the previous window is
+weighted by how much of it still overlaps the sliding window.
+"""
+
+from django.core.cache import caches
+from rest_framework import throttling
+
+
+class SlidingWindowMixin:
+    cache = caches["throttle"]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window, elapsed = divmod(now, self.duration)
+        current_key = f"{self.key}:{int(window)}"
+        # Both keys must outlive the window that reads them as "previous".
+        self.cache.add(current_key, 0, timeout=self.duration * 2)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            self.cache.set(current_key, 1, timeout=self.duration * 2)
+            current = 1
+        previous = self.cache.get(f"{self.key}:{int(window) - 1}", 0)
+
+        overlap = 1 - elapsed / self.duration
+        if previous * overlap + current <= self.num_requests:
+            return True
+
+        # Rejected requests don't use up the budget.
+        self.cache.decr(current_key)
+        self.wait_seconds = self.get_wait(previous, current - 1, elapsed)
+        return self.throttle_failure()
+
+    def get_wait(self, previous, current, elapsed):
+        """Seconds until one more request fits in the sliding window."""
+        allowance = self.num_requests - 1
+        if current <= allowance:
+            # Wait for enough of the previous window to slide out.
+            return self.duration * (1 - (allowance - current) / previous) - elapsed
+        # The current window is full; it becomes the previous one.
+        remaining = self.duration - elapsed
+        return remaining + self.duration * max(0, 1 - allowance / current)
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class AnonRateThrottle(SlidingWindowMixin, throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(SlidingWindowMixin, throttling.UserRateThrottle):
+    pass
+
+
+class ActionRateThrottle(SlidingWindowMixin, throttling.SimpleRateThrottle):
+    """
+    Give selected actions of a view their own budget.
+
+    Views list the scoped actions in ``throttle_scopes``, keyed by viewset
+    action or, for plain API views, by lowercase HTTP method. Requests to
+    other actions aren't limited by this throttle.
+    """
+
+    def __init__(self):
+        # The rate depends on the view, so it is looked up in allow_request().
+        pass
+
+    def allow_request(self, request, view):
+        scopes = getattr(view, "throttle_scopes", {})
+        self.scope = scopes.get(getattr(view, "action", None) or request.method.lower())
+        if self.scope is None:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
@@ -1,6 +1,15 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PostViewSet, CommentViewSet, LikeViewSet
+from . import async_views
+from .views import (
+    PostViewSet,
+    CommentViewSet,
+    LikeViewSet,
+    ScheduledPostViewSet,
+    SearchView,
+    ExportView,
+    ExportDownloadView,
+)
 
 app_name = "social_api"
 
@@ -8,7 +17,26 @@ router = DefaultRouter()
 router.register("posts", PostViewSet)
 router.register("comments", CommentViewSet)
 router.register("likes", LikeViewSet)
+router.register("scheduled-posts", ScheduledPostViewSet)
 
 urlpatterns = [
+    path("search/", SearchView.as_view(), name="search"),
+    path("export/", ExportView.as_view(), name="export"),
+    path(
+        "export/<str:file_name>/",
+        ExportDownloadView.as_view(),
+        name="export-download",
+    ),
+    path("async/posts/", async_views.PostListView.as_view(), name="async-post-list"),
+    path(
+        "async/posts/<int:pk>/",
+        async_views.PostDetailView.as_view(),
+        name="async-post-detail",
+    ),
+    path(
+        "async/comments/",
+        async_views.CommentListView.as_view(),
+        name="async-comment-list",
+    ),
     path("", include(router.urls)),
 ]
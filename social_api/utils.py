@@ -0,0 +1,38 @@
+import re
+
+from django.db.models import Q
+
+HASHTAG_MAX_LENGTH = 100
+
+HASHTAG_FIELD_RE = re.compile(r"\w+")
+CONTENT_HASHTAG_RE = re.compile(r"#(\w+)")
+
+
+def parse_hashtags(hashtags=None, content=None):
+    """
+    Return the sorted, lowercased tag names of a post.
+
+    Tags come from the free-form ``hashtags`` field ("#django, python") and
+    from ``#words`` written in the content.
+    """
+    names = set(HASHTAG_FIELD_RE.findall(hashtags or ""))
+    names.update(CONTENT_HASHTAG_RE.findall(content or ""))
+    return sorted({name.lower()[:HASHTAG_MAX_LENGTH] for name in names})
+
+
+def keyset_after(queryset, field, after, pk="pk", descending=True):
+    """
+    Order ``queryset`` by ``(field, pk)`` and keep the rows past the key
+    ``after``, a ``(value, pk)`` pair, so the page is an index range scan.
+    """
+    prefix = "-" if descending else ""
+    queryset = queryset.order_by(f"{prefix}{field}", f"{prefix}{pk}")
+    if after is None:
+        return queryset
+    value, pk_value = after
+    lookup = "lt" if descending else "gt"
+    return queryset.filter(
+        Q(**{f"{field}__{lookup}": value})
+        | Q(**{field: value, f"{pk}__{lookup}": pk_value}),
+        **{f"{field}__{lookup}e": value},
+    )
@@ -1,5 +1,14 @@
+import json
+import secrets
+from collections import defaultdict
 from datetime import timedelta
+from functools import partial
 
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.storage import storages
+from django.db import IntegrityError, transaction
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django.utils import timezone
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
@@ -7,22 +16,104 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.utils.urls import replace_query_param
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
-from .models import Post, Like, Comment
+from rest_framework.exceptions import NotFound, PermissionDenied
+from social_media_api.replicas import ReplicaReadsMixin, primary_reads
+from .bulk import index_posts
+from .cache import get_post_detail, invalidate_post
+from .conditional import not_modified, post_list_etag, post_validators, set_validators
+from .export import (
+    CONTENT_TYPES,
+    EXPORT_FILE_NAME,
+    export_expiry_cutoff,
+    export_path,
+    render_export,
+)
+from .fieldsets import SparseFieldsetMixin
+from .models import Post, Like, Comment, ScheduledPost
+from .pagination import (
+    CommentCursorPagination,
+    PostCursorPagination,
+    ScheduledPostCursorPagination,
+)
 from .serializers import (
     PostSerializer,
     LikeSerializer,
+    LikeBatchSerializer,
+    LikeBatchResultSerializer,
     CommentSerializer,
+    CommentThreadSerializer,
+    CommentThreadsQuerySerializer,
     SchedulePostSerializer,
+    ScheduledPostSerializer,
     PostListSerializer,
     PostDetailSerializer,
     PostImageSerializer,
+    PostImportResultSerializer,
+    absolute_post_urls,
+    ExportQuerySerializer,
+    ExportScheduledSerializer,
+    SearchQuerySerializer,
+    SearchResultSerializer,
+)
+from .search import SEARCH_KINDS, get_search_backend
+from .tasks import (
+    export_user_data,
+    fan_out_post,
+    fan_out_posts,
+    generate_post_renditions,
 )
-from .tasks import create_scheduled_post
+from .utils import parse_hashtags
+
+
+def filter_posts(queryset, user, params, listing=False):
+    """
+    Apply the post query parameters. Listings also take ``liked``, ``post``
+    and ``date``.
+    """
+    liked = listing and "liked" in params
+    filter_by = params.get("filter_by")
+    if liked:
+        queryset = queryset.filter(likes__user=user)
+    else:
+        hashtags = parse_hashtags(params.get("hashtags"))
+        if hashtags:
+            match_all = params.get("hashtags_match") == "all"
+            queryset = queryset.with_hashtags(hashtags, match_all=match_all)
+
+        if filter_by == "own":
+            queryset = queryset.filter(author=user)
+
+    if listing:
+        post_id = params.get("post")
+        date = params.get("date")
+        if post_id:
+            queryset = queryset.filter(id=post_id)
+        if date:
+            queryset = queryset.filter(created_at__date=date)
+
+    # Last, so the timeline's pages are drawn from the other filters too.
+    if not liked and filter_by == "following":
+        queryset = queryset.home_timeline(user)
+    return queryset
+
+
+def filter_comments(queryset, params):
+    post_id = params.get("post")
+    parent_id = params.get("parent")
+    if post_id:
+        queryset = queryset.filter(post_id=post_id)
+    if parent_id:
+        queryset = queryset.filter(parent_id=parent_id)
+    return queryset
 
 
 class PostViewSet(
+    ReplicaReadsMixin,
+    SparseFieldsetMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -32,6 +123,8 @@ class PostViewSet(
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = PostCursorPagination
+    throttle_scopes = {"schedule_post_creation": "schedule"}
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -53,33 +146,25 @@ class PostViewSet(
             hashtags = serializer.validated_data.get("hashtags", "")
             delay_minutes = serializer.validated_data.get("delay_minutes", 1)
 
-            eta = timezone.now() + timedelta(minutes=delay_minutes)
-            create_scheduled_post.apply_async(
-                (request.user.id, content, None, hashtags), eta=eta
+            scheduled = ScheduledPost.objects.create(
+                author=request.user,
+                content=content,
+                hashtags=hashtags,
+                publish_at=timezone.now() + timedelta(minutes=delay_minutes),
             )
 
-            return Response({"status": "Post creation scheduled"}, status=200)
+            return Response(
+                {"status": "Post creation scheduled", "id": scheduled.id}, status=200
+            )
         return Response(serializer.errors, status=400)
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = Post.objects.all()
-
-        if self.action == "list" and "liked" in self.request.query_params:
-            return queryset.filter(likes__user=user)
-
-        hashtags = self.request.query_params.get("hashtags")
-        if hashtags:
-            queryset = queryset.filter(content__icontains=hashtags)
-
-        filter_by = self.request.query_params.get("filter_by")
-        if filter_by == "own":
-            queryset = queryset.filter(author=user)
-        elif filter_by == "following":
-            following_users = user.following.all()
-            queryset = queryset.filter(author__in=following_users)
-
-        return queryset
+        return filter_posts(
+            Post.objects.all(),
+            self.request.user,
+            self.request.query_params,
+            listing=self.action == "list",
+        )
 
     @extend_schema(
         parameters=[
@@ -93,24 +178,167 @@ class PostViewSet(
                 type=OpenApiTypes.DATE,
                 description="Filter by datetime of Post (ex. ?date=2022-10-23)",
             ),
+            OpenApiParameter(
+                name="hashtags",
+                type=OpenApiTypes.STR,
+                description="Filter by hashtags (ex. ?hashtags=django,python)",
+            ),
+            OpenApiParameter(
+                name="hashtags_match",
+                type=OpenApiTypes.STR,
+                enum=["any", "all"],
+                description="Match any (default) or all of the given hashtags",
+            ),
+            OpenApiParameter(
+                name="cursor",
+                type=OpenApiTypes.STR,
+                description="Opaque cursor taken from the `next` link",
+            ),
+            OpenApiParameter(
+                name="page_size",
+                type=OpenApiTypes.INT,
+                description="Number of posts per page (ex. ?page_size=50)",
+            ),
+            OpenApiParameter(
+                name="fields",
+                type=OpenApiTypes.STR,
+                description="Only render these fields (ex. ?fields=id,content)",
+            ),
+            OpenApiParameter(
+                name="expand",
+                type=OpenApiTypes.STR,
+                description="Render these ids as objects (ex. ?expand=author)",
+            ),
         ]
     )
     def list(self, request, *args, **kwargs):
-        queryset = self.queryset
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        etag = post_list_etag(request, page, self.paginator.has_next)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
 
-        post_id = request.query_params.get("post")
-        date = request.query_params.get("date")
+        serializer = self.get_serializer(page, many=True)
+        return set_validators(self.get_paginated_response(serializer.data), etag)
 
-        if post_id:
-            queryset = queryset.filter(id=post_id)
-        if date:
-            queryset = queryset.filter(created_at__date=date)
+    def retrieve(self, request, *args, **kwargs):
+        if not request.query_params:
+            return self.retrieve_cached(request)
+
+        validators = post_validators(request, self.kwargs["pk"])
+        if validators is None:
+            return super().retrieve(request, *args, **kwargs)
+        response = not_modified(request, *validators)
+        if response is not None:
+            return response
+
+        return set_validators(super().retrieve(request, *args, **kwargs), *validators)
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+    def retrieve_cached(self, request):
+        """
+        Serve the plain detail view from the cache, validators included, so
+        neither a 200 nor a 304 needs a query while the entry is fresh.
+
+        The entry is shared by every reader, so it holds relative media URLs
+        that are made absolute for each response.
+        """
+        post_id = self.kwargs["pk"]
+
+        def build():
+            # The entry is shared by every reader, so it must not be filled
+            # from a lagging replica.
+            with primary_reads():
+                # Derive the validators first so they are never newer than
+                # the data.
+                validators = post_validators(request, post_id)
+                serializer = self.get_serializer_class()(
+                    self.get_object(), context={"view": self}
+                )
+                data = dict(serializer.data)
+            return {"data": data, "validators": validators}
+
+        entry = get_post_detail(post_id, build)
+        response = not_modified(request, *entry["validators"])
+        if response is not None:
+            return response
+        data = absolute_post_urls(entry["data"], request)
+        return set_validators(Response(data), *entry["validators"])
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        with transaction.atomic():
+            post = serializer.save(author=self.request.user)
+            post.sync_hashtags()
+        transaction.on_commit(lambda: fan_out_post.delay(post.id))
+        if post.post_picture:
+            transaction.on_commit(lambda: generate_post_renditions.delay(post.id))
+
+    @action(detail=True, methods=["post"], url_path="upload-image")
+    def upload_image(self, request, pk=None):
+        """
+        Upload a picture for one of your posts.
+        """
+        post = self.get_object()
+        if post.author_id != request.user.id:
+            raise PermissionDenied("You can only upload images to your own posts.")
+        serializer = self.get_serializer(post, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        transaction.on_commit(lambda: generate_post_renditions.delay(post.id))
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        request={"application/x-ndjson": OpenApiTypes.STR},
+        responses=PostImportResultSerializer,
+    )
+    @action(detail=False, methods=["post"], url_path="import")
+    def import_posts(self, request):
+        """
+        Create posts from an NDJSON body, one JSON object per line.
+
+        The body is read line by line and valid posts are inserted in
+        batches, so the payload never has to fit in memory. Lines that fail
+        validation are skipped and reported by line number.
+        """
+        meta = request.META
+        if meta.get("HTTP_TRANSFER_ENCODING") and not meta.get("CONTENT_LENGTH"):
+            # DRF drops a body sent without a length, e.g. a chunked upload.
+            return Response(
+                {"detail": "Content-Length is required."},
+                status=status.HTTP_411_LENGTH_REQUIRED,
+            )
+        report = {"created": 0, "failed": 0, "errors": []}
+        batch = []
+        for number, line in enumerate(request.stream or (), start=1):
+            if not line.strip():
+                continue
+            try:
+                serializer = PostSerializer(data=json.loads(line))
+            except ValueError:
+                errors = {"non_field_errors": ["Invalid JSON."]}
+            else:
+                errors = None if serializer.is_valid() else serializer.errors
+            if errors is None:
+                batch.append(Post(author=request.user, **serializer.validated_data))
+            else:
+                report["failed"] += 1
+                if len(report["errors"]) < settings.POST_IMPORT_MAX_ERRORS:
+                    report["errors"].append({"line": number, "errors": errors})
+
+            if len(batch) >= settings.POST_IMPORT_BATCH_SIZE:
+                report["created"] += self.create_imported_posts(batch)
+                batch = []
+        if batch:
+            report["created"] += self.create_imported_posts(batch)
+        return Response(report, status=status.HTTP_200_OK)
+
+    def create_imported_posts(self, posts):
+        with transaction.atomic():
+            posts = Post.objects.bulk_create(posts)
+            index_posts(posts)
+            post_ids = [post.pk for post in posts]
+            transaction.on_commit(partial(fan_out_posts.delay, post_ids))
+        return len(posts)
 
 
 class LikeViewSet(
@@ -119,36 +347,193 @@ class LikeViewSet(
     queryset = Like.objects.all().select_related("user", "post")
     serializer_class = LikeSerializer
     permission_classes = [IsAuthenticated]
+    throttle_scopes = {"create": "likes", "destroy": "likes", "batch": "likes"}
+
+    def lock_likes(self, user):
+        """
+        Lock the user's row so their like changes run one at a time, and the
+        counters move by the rows each change actually wrote.
+        """
+        get_user_model().objects.select_for_update().filter(pk=user.pk).only(
+            "pk"
+        ).first()
 
     def perform_create(self, serializer):
         post = serializer.validated_data["post"]
-        if post.author == self.request.user:
+        if post.author_id == self.request.user.id:
             raise PermissionDenied("You cannot like your own post.")
-        if Like.objects.filter(user=self.request.user, post=post).exists():
+        try:
+            with transaction.atomic():
+                self.lock_likes(self.request.user)
+                serializer.save(user=self.request.user)
+                Post.objects.filter(pk=post.pk).adjust_counter("likes_count", 1)
+        except IntegrityError:
             raise PermissionDenied("You have already liked this post.")
-        serializer.save(user=self.request.user)
+
+    @extend_schema(request=LikeBatchSerializer, responses=LikeBatchResultSerializer)
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """
+        Like and unlike many posts at once, e.g. to sync likes made offline.
+
+        Returns a status per post id: liked, already_liked, unliked,
+        not_liked, own_post or not_found.
+        """
+        serializer = LikeBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        like_ids = serializer.validated_data["like"]
+        unlike_ids = serializer.validated_data["unlike"]
+        user = request.user
+
+        results = {}
+        with transaction.atomic():
+            # Nothing else changes this user's likes until the counters are
+            # adjusted, so the rows read below are the rows written.
+            self.lock_likes(user)
+            authors = dict(
+                Post.objects.filter(pk__in=like_ids + unlike_ids).values_list(
+                    "pk", "author_id"
+                )
+            )
+            liked = set(
+                Like.objects.filter(
+                    user=user, post_id__in=like_ids + unlike_ids
+                ).values_list("post_id", flat=True)
+            )
+
+            for post_id in like_ids:
+                if post_id not in authors:
+                    results[post_id] = "not_found"
+                elif authors[post_id] == user.id:
+                    results[post_id] = "own_post"
+                elif post_id in liked:
+                    results[post_id] = "already_liked"
+                else:
+                    results[post_id] = "liked"
+            for post_id in unlike_ids:
+                if post_id not in authors:
+                    results[post_id] = "not_found"
+                elif post_id in liked:
+                    results[post_id] = "unliked"
+                else:
+                    results[post_id] = "not_liked"
+
+            to_like = [post_id for post_id in like_ids if results[post_id] == "liked"]
+            to_unlike = [
+                post_id for post_id in unlike_ids if results[post_id] == "unliked"
+            ]
+            if to_like:
+                Like.objects.bulk_create(
+                    [Like(user=user, post_id=post_id) for post_id in to_like],
+                    ignore_conflicts=True,
+                )
+                Post.objects.filter(pk__in=to_like).adjust_counter("likes_count", 1)
+            if to_unlike:
+                Like.objects.filter(user=user, post_id__in=to_unlike).delete()
+                Post.objects.filter(pk__in=to_unlike).adjust_counter("likes_count", -1)
+
+        # bulk_create() skips the post_save signal that invalidates the cache.
+        for post_id in to_like:
+            invalidate_post(post_id)
+
+        return Response(
+            {
+                "results": [
+                    {"post": post_id, "status": result}
+                    for post_id, result in results.items()
+                ]
+            },
+            status=status.HTTP_200_OK,
+        )
 
     def destroy(self, request, *args, **kwargs):
-        post = self.kwargs.get("pk")
-        like = Like.objects.filter(user=request.user, post_id=post).first()
-        if like:
-            like.delete()
+        post_id = self.kwargs.get("pk")
+        with transaction.atomic():
+            self.lock_likes(request.user)
+            deleted, _ = Like.objects.filter(
+                user=request.user, post_id=post_id
+            ).delete()
+            if deleted:
+                Post.objects.filter(pk=post_id).adjust_counter("likes_count", -deleted)
+        if deleted:
             return Response(
                 {"detail": "Post unliked"}, status=status.HTTP_204_NO_CONTENT
             )
         return Response({"detail": "Not liked yet"}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class ScheduledPostViewSet(
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.UpdateModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    List, edit and cancel your posts that are not published yet.
+    """
+
+    queryset = ScheduledPost.objects.all()
+    serializer_class = ScheduledPostSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = ScheduledPostCursorPagination
+    throttle_scopes = {"update": "schedule", "partial_update": "schedule"}
+
+    def get_queryset(self):
+        return self.queryset.filter(author=self.request.user)
+
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            # publish_due_posts may have published and deleted the row since
+            # it was read; saving it then would insert it and publish it twice.
+            scheduled = (
+                self.get_queryset()
+                .select_for_update()
+                .filter(pk=serializer.instance.pk)
+                .first()
+            )
+            if scheduled is None:
+                raise NotFound("This post has already been published.")
+            if scheduled.publish_at <= timezone.now():
+                raise PermissionDenied("This post is already being published.")
+            serializer.instance = scheduled
+            serializer.save()
+
+
+class CommentViewSet(ReplicaReadsMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CommentCursorPagination
+    throttle_scopes = {"create": "comments"}
 
     def perform_create(self, serializer):
         post = serializer.validated_data["post"]
         if post.author == self.request.user:
             raise PermissionDenied("You cannot comment on your own post.")
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            serializer.save(user=self.request.user)
+            Post.objects.filter(pk=post.pk).adjust_counter("comments_count", 1)
+
+    def perform_update(self, serializer):
+        old_post_id = serializer.instance.post_id
+        with transaction.atomic():
+            comment = serializer.save()
+            if comment.post_id != old_post_id:
+                invalidate_post(old_post_id)
+                Post.objects.filter(pk=old_post_id).adjust_counter("comments_count", -1)
+                Post.objects.filter(pk=comment.post_id).adjust_counter(
+                    "comments_count", 1
+                )
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            # Replies are deleted along with the comment they answer.
+            removed = Comment.objects.subtree(instance).count()
+            instance.delete()
+            Post.objects.filter(pk=instance.post_id).adjust_counter(
+                "comments_count", -removed
+            )
 
     def get_queryset(self):
         post_id = self.kwargs.get("post_pk")
@@ -163,15 +548,171 @@ class CommentViewSet(viewsets.ModelViewSet):
                 type=OpenApiTypes.INT,
                 description="Filter by post id (ex. ?post=2)",
             ),
+            OpenApiParameter(
+                name="parent",
+                type=OpenApiTypes.INT,
+                description="Only direct replies to this comment (ex. ?parent=5)",
+            ),
         ]
     )
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
+        queryset = filter_comments(self.get_queryset(), request.query_params)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
 
-        post_id = request.query_params.get("post")
+    @action(detail=True, methods=["get"])
+    def thread(self, request, pk=None):
+        """
+        A comment followed by all its nested replies, depth-first.
+        """
+        comment = self.get_object()
+        subtree = Comment.objects.subtree(comment)[: settings.COMMENT_THREAD_MAX_SIZE]
+        return Response(self.get_serializer(subtree, many=True).data)
 
-        if post_id:
-            queryset = queryset.filter(post_id=post_id)
+    @extend_schema(
+        parameters=[CommentThreadsQuerySerializer],
+        responses=CommentThreadSerializer(many=True),
+    )
+    @action(detail=False, methods=["get"])
+    def threads(self, request):
+        """
+        Top-level comments of a post, oldest first, each with its first
+        replies.
+        """
+        query = CommentThreadsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        comments = self.paginate_queryset(
+            Comment.objects.filter(
+                post_id=query.validated_data["post"], parent__isnull=True
+            )
+        )
+        replies = defaultdict(list)
+        if query.validated_data["replies"]:
+            for reply in Comment.objects.first_replies(
+                [comment.pk for comment in comments], query.validated_data["replies"]
+            ):
+                replies[reply.parent_id].append(reply)
+        for comment in comments:
+            comment.first_replies = replies[comment.pk]
+
+        serializer = CommentThreadSerializer(comments, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class SearchView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[SearchQuerySerializer],
+        responses=SearchResultSerializer(many=True),
+    )
+    def get(self, request):
+        """
+        Ranked full-text search over posts and comments.
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        Matched terms in ``snippet`` are wrapped in ``<mark>`` tags.
+        """
+        serializer = SearchQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data["q"]
+        kind = serializer.validated_data.get("type")
+        page_size = serializer.validated_data.get("page_size", settings.API_PAGE_SIZE)
+        offset = serializer.validated_data["offset"]
+
+        hits = get_search_backend().search(
+            query,
+            kinds=(kind,) if kind else SEARCH_KINDS,
+            limit=page_size + 1,
+            offset=offset,
+        )
+
+        next_link = None
+        if len(hits) > page_size:
+            next_link = replace_query_param(
+                request.build_absolute_uri(), "offset", offset + page_size
+            )
+        return Response(
+            {
+                "next": next_link,
+                "results": SearchResultSerializer(hits[:page_size], many=True).data,
+            }
+        )
+
+
+class ExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        parameters=[ExportQuerySerializer],
+        responses={
+            (200, content_type): OpenApiTypes.STR
+            for content_type in CONTENT_TYPES.values()
+        },
+    )
+    def get(self, request):
+        """
+        Stream your posts, comments and likes as NDJSON or CSV.
+        """
+        serializer = ExportQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        export_format = serializer.validated_data["export_format"]
+
+        response = StreamingHttpResponse(
+            render_export(request.user, export_format),
+            content_type=CONTENT_TYPES[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="export.{export_format}"'
+        )
+        return response
+
+    @extend_schema(request=ExportQuerySerializer, responses=ExportScheduledSerializer)
+    def post(self, request):
+        """
+        Write a gzipped export in the background, for very large accounts.
+
+        The returned URL answers 404 until the file has been written, and
+        again once it has expired.
+        """
+        serializer = ExportQuerySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        export_format = serializer.validated_data["export_format"]
+
+        file_name = f"{secrets.token_urlsafe(32)}.{export_format}.gz"
+        export_user_data.delay(
+            request.user.id, export_format, export_path(request.user.id, file_name)
+        )
+        url = reverse("social_api:export-download", args=[file_name], request=request)
+        return Response(
+            {"status": "Export scheduled", "url": url},
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class ExportDownloadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        operation_id="social_export_download",
+        responses={(200, "application/gzip"): OpenApiTypes.BINARY},
+    )
+    def get(self, request, file_name):
+        """
+        Download one of your own background exports.
+        """
+        storage = storages["exports"]
+        name = export_path(request.user.id, file_name)
+        if (
+            not EXPORT_FILE_NAME.fullmatch(file_name)
+            or not storage.exists(name)
+            or storage.get_modified_time(name) < export_expiry_cutoff()
+        ):
+            raise Http404
+        return FileResponse(
+            storage.open(name),
+            as_attachment=True,
+            filename=file_name,
+            content_type="application/gzip",
+        )
@@ -0,0 +1,188 @@
+"""
+Per-view request instrumentation.
+
+``RequestMetricsMiddleware`` times every request, counts its SQL queries
+and reports both in a ``Server-Timing`` header. It also aggregates them into
+in-process histograms, which ``metrics_view`` renders in the Prometheus text
+format. Histograms are kept per process, so scrape each worker separately
+or aggregate them in Prometheus.
+"""
+
+import threading
+from secrets import compare_digest
+from bisect import bisect_left
+from contextlib import ExitStack
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+METRICS = (
+    (
+        "api_request_duration_seconds",
+        "Total time spent handling the request.",
+        DURATION_BUCKETS,
+    ),
+    (
+        "api_request_db_duration_seconds",
+        "Time spent executing SQL queries.",
+        DURATION_BUCKETS,
+    ),
+    ("api_request_db_queries", "Number of SQL queries executed.", QUERY_BUCKETS),
+    ("api_response_size_bytes", "Size of the response body.", SIZE_BUCKETS),
+)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            total += count
+            yield bound, total
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def observe(self, view, method, values):
+        with self.lock:
+            for (name, _, buckets), value in zip(METRICS, values):
+                key = (name, view, method)
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram(buckets)
+                self.histograms[key].observe(value)
+
+    def clear(self):
+        with self.lock:
+            self.histograms.clear()
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for name, help_text, _ in METRICS:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, view, method), histogram in sorted(
+                    self.histograms.items()
+                ):
+                    if metric != name:
+                        continue
+                    labels = f'view="{escape_label(view)}",method="{method}"'
+                    for bound, total in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+class QueryTimer:
+    """``execute_wrapper`` hook counting queries and summing their duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - start
+            self.count += 1
+
+
+class RequestMetricsMiddleware:
+    # Under ASGI a sync-only middleware would push async views into a thread.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        start = perf_counter()
+        with self.timed_queries(timer):
+            response = self.get_response(request)
+        return self.record(request, response, timer, start)
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        start = perf_counter()
+        # The async ORM runs queries in the request's sync thread, so the
+        # wrappers go on that thread's connections.
+        stack = await sync_to_async(self.timed_queries)(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.record(request, response, timer, start)
+
+    def timed_queries(self, timer):
+        """Count the queries of every connection until the stack is closed."""
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+        return stack
+
+    def record(self, request, response, timer, start):
+        duration = perf_counter() - start
+
+        response["Server-Timing"] = (
+            f'db;dur={timer.duration * 1000:.2f};desc="{timer.count} queries", '
+            f"total;dur={duration * 1000:.2f}"
+        )
+
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        size = 0 if response.streaming else len(response.content)
+        registry.observe(
+            view, request.method, (duration, timer.duration, timer.count, size)
+        )
+        return response
+
+
+def metrics_view(request):
+    """
+    Expose the request histograms in the Prometheus text format, to
+    scrapers presenting METRICS_TOKEN and to logged-in staff.
+    """
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get("Authorization", "")
+    scraper = token and compare_digest(authorization, f"Bearer {token}")
+    user = getattr(request, "user", None)
+    if not (scraper or (user is not None and user.is_staff)):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
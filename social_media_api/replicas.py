@@ -0,0 +1,132 @@
+"""
+Read replicas with read-your-writes stickiness.
+
+``ReplicaRouter`` sends every write to the primary and reads to the
+aliases in ``DATABASE_REPLICAS``, but only inside views that opt in with
+``ReplicaReadsMixin`` or, for async views, ``AsyncReplicaReadsMixin``.
+A user who just wrote is pinned to the primary for
+``REPLICA_PIN_SECONDS``, so replication lag never hides their own post,
+like or comment from them.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_KEY = "user:{user_id}:primary-pin"
+
+replica_reads = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary, e.g. to fill a shared cache with fresh data."""
+    token = replica_reads.set(False)
+    try:
+        yield
+    finally:
+        replica_reads.reset(token)
+
+
+def pin_to_primary(user_id):
+    cache.set(PIN_KEY.format(user_id=user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return cache.get(PIN_KEY.format(user_id=user_id), False)
+
+
+def reads_from_replicas(request):
+    return request.method in SAFE_METHODS and not (
+        request.user.is_authenticated and is_pinned(request.user.pk)
+    )
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if replica_reads.get() and settings.DATABASE_REPLICAS:
+            return random.choice(settings.DATABASE_REPLICAS)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication.
+        return db == "default"
+
+
+class ReplicaReadsMixin:
+    """Serve the reads of a view from replicas, unless the user is pinned."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if reads_from_replicas(request):
+            self.replica_token = replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "replica_token", None)
+        if token is not None:
+            replica_reads.reset(token)
+            self.replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class AsyncReplicaReadsMixin:
+    """``ReplicaReadsMixin`` for ``AsyncAPIView`` handlers."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        finally:
+            token = getattr(self, "replica_token", None)
+            if token is not None:
+                replica_reads.reset(token)
+                self.replica_token = None
+
+    async def initial(self, request):
+        await super().initial(request)
+        # The pin is kept in the cache, which is read synchronously.
+        if await sync_to_async(reads_from_replicas)(request):
+            self.replica_token = replica_reads.set(True)
+
+
+class ReplicaPinningMiddleware:
+    """Pin users to the primary after any successful write request."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self.pin_writer(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        await sync_to_async(self.pin_writer)(request, response)
+        return response
+
+    def pin_writer(self, request, response):
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return
+        # DRF views store the user they authenticated on the request.
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            pin_to_primary(user.pk)
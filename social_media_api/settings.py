@@ -48,6 +48,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "social_media_api.metrics.RequestMetricsMiddleware",
+    "social_media_api.replicas.ReplicaPinningMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -88,6 +90,57 @@ DATABASES = {
     }
 }
 
+# Read replicas, kept in sync with the primary outside Django, as a
+# comma-separated list of database files for SQLite or of hosts for a
+# database server. Everything else is configured like the primary. Views
+# using ReplicaReadsMixin read from them; tests read the primary instead.
+DATABASE_REPLICAS = []
+REPLICA_LOCATION = (
+    "NAME" if DATABASES["default"]["ENGINE"].endswith("sqlite3") else "HOST"
+)
+for index, location in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICAS", "").split(","))
+):
+    alias = f"replica{index + 1}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        REPLICA_LOCATION: location,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["social_media_api.replicas.ReplicaRouter"]
+# How long a user's reads stay on the primary after they write.
+REPLICA_PIN_SECONDS = 10
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+if os.environ.get("REDIS_CACHE_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_CACHE_URL"],
+        },
+        # Throttle counters must be shared by every worker and node.
+        "throttle": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get(
+                "REDIS_THROTTLE_URL", os.environ["REDIS_CACHE_URL"]
+            ),
+            "KEY_PREFIX": "throttle",
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+    # Without Redis there is a single process to share the counters with.
+    CACHES["throttle"] = CACHES["default"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -129,6 +182,17 @@ STATIC_URL = "static/"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+STORAGES = {
+    "default": {"BACKEND": "social_api.storage.ContentAddressedStorage"},
+    # Background data exports, kept out of MEDIA_ROOT and downloaded
+    # through social_api:export-download by their owner only.
+    "exports": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": os.path.join(BASE_DIR, "exports")},
+    },
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -137,15 +201,70 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "social_api.throttling.AnonRateThrottle",
+        "social_api.throttling.UserRateThrottle",
+        "social_api.throttling.ActionRateThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "100/day", "user": "100/day"},
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "100/day",
+        "user": "100/day",
+        "likes": "30/min",
+        "comments": "10/min",
+        "follow": "20/min",
+        "schedule": "10/min",
+    },
+    "DEFAULT_AUTHENTICATION_CLASSES": ("user.authentication.CachedJWTAuthentication",),
 }
 
+# How long authentication keeps a resolved user before reading it again.
+AUTH_USER_CACHE_TIMEOUT = 60
+
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+
+# Home timelines are trimmed to this many entries per user.
+TIMELINE_MAX_LENGTH = 800
+# Authors with more followers than this are merged into feeds on read
+# instead of being fanned out to every follower on write.
+TIMELINE_FANOUT_FOLLOWER_LIMIT = 5000
+
+POST_DETAIL_CACHE_TIMEOUT = 5 * 60
+# How long concurrent readers wait for another request to rebuild an entry.
+POST_DETAIL_LOCK_TIMEOUT = 5
+
+# Scheduled posts published per transaction by publish_due_posts.
+SCHEDULED_POST_BATCH_SIZE = 500
+
+LIKE_BATCH_MAX_SIZE = 500
+
+# Posts inserted per transaction by the NDJSON import, and how many failed
+# lines its report lists.
+POST_IMPORT_BATCH_SIZE = 500
+POST_IMPORT_MAX_ERRORS = 100
+
+# Levels of nested replies a comment thread may have.
+COMMENT_MAX_DEPTH = 8
+# Comments returned by the thread view of a single comment.
+COMMENT_THREAD_MAX_SIZE = 500
+# Replies shown under each top-level comment by the threads view, by default
+# and at most.
+COMMENT_REPLIES_PREVIEW = 3
+COMMENT_MAX_REPLIES_PREVIEW = 20
+
+# Unreferenced media blobs are deleted by social_api.tasks.sweep_media_blobs
+# once they have not been saved again for this many seconds.
+MEDIA_BLOB_GRACE_PERIOD = 60 * 60
+
+# Rows fetched per query while streaming a data export.
+EXPORT_CHUNK_SIZE = 2000
+# Background exports can be downloaded for this many seconds, after which
+# social_api.tasks.delete_expired_exports removes them.
+EXPORT_RETENTION = 24 * 60 * 60
+
+# Scrapers read /metrics/ with an "Authorization: Bearer <token>" header.
+# Without a token only logged-in staff can read it.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Social Media API",
     "DESCRIPTION": "Creating posts",
@@ -165,8 +284,16 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": False,
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.TokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "user.serializers.TokenVerifySerializer",
 }
 
+# How long a token id found not to be blacklisted is cached; logouts mark
+# their token at once, and blacklisted ids are cached until they expire.
+TOKEN_BLACKLIST_CACHE_TIMEOUT = 60 * 60
+# Expired tokens deleted per query by user.tasks.purge_expired_tokens.
+TOKEN_PURGE_BATCH_SIZE = 1000
+
 
 CELERY_BROKER_URL = "redis://localhost:6379"
 CELERY_RESULT_BACKEND = "redis://localhost:6379"
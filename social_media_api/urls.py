@@ -25,10 +25,13 @@ from drf_spectacular.views import (
     SpectacularRedocView,
 )
 
+from social_media_api.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/social/", include("social_api.urls", namespace="social")),
     path("api/user/", include("user.urls", namespace="user")),
+    path("metrics/", metrics_view, name="metrics"),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/doc/swagger/",
@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from user.models import CustomerUser
+from user.models import CustomerUser, Follow
 
 admin.site.register(CustomerUser)
+admin.site.register(Follow)
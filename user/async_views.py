@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.http import Http404
+from rest_framework.response import Response
+
+from social_api.async_views import AsyncAPIView
+from social_api.conditional import not_modified, set_validators, user_etag
+from .serializers import UserSerializer
+
+CustomerUser = get_user_model()
+
+
+class UserProfileView(AsyncAPIView):
+    login_required = False
+    serializer_class = UserSerializer
+
+    async def get(self, request, email):
+        try:
+            user = await self.filter_fields(request, CustomerUser.objects.all()).aget(
+                email=email
+            )
+        except CustomerUser.DoesNotExist:
+            raise Http404
+        etag = user_etag(request, user)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
+        serializer = self.get_serializer(request, user)
+        return set_validators(Response(serializer.data), etag)
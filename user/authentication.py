@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .cache import cached_user_key
+
+
+def dump_user(user):
+    """
+    The cached form of ``user``: its column values without the password
+    hash, of which only the digest that tokens carry is kept.
+    """
+    return {
+        "db": user._state.db,
+        "fields": {
+            field.attname: field.get_prep_value(getattr(user, field.attname))
+            for field in user._meta.concrete_fields
+            if field.attname != "password"
+        },
+        "password": get_md5_hash_password(user.password),
+    }
+
+
+def load_user(data):
+    """A user instance from ``dump_user()``, with the password deferred."""
+    fields = data["fields"]
+    return get_user_model().from_db(data["db"], list(fields), list(fields.values()))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves users from the cache.
+
+    Users are cached under a per-user version that is bumped whenever the
+    row changes, so an edited, deactivated or deleted user is never served
+    from a stale copy. AUTH_USER_CACHE_TIMEOUT bounds how long a copy lives.
+    The password hash is never cached.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        key = cached_user_key(user_id)
+        cached = cache.get(key)
+        if cached is None:
+            user = super().get_user(validated_token)
+            cache.set(key, dump_user(user), timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+            return user
+
+        # The copy passed the other checks when it was cached, but the token
+        # may be older than the current password.
+        if (
+            api_settings.CHECK_REVOKE_TOKEN
+            and validated_token.get(api_settings.REVOKE_TOKEN_CLAIM)
+            != cached["password"]
+        ):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return load_user(cached)
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    target_class = "user.authentication.CachedJWTAuthentication"
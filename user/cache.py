@@ -0,0 +1,27 @@
+from django.db import transaction
+
+from social_api.cache import bump_version, get_version
+
+USER_VERSION_KEY = "user:{user_id}:auth:version"
+CACHED_USER_KEY = "user:{user_id}:v{version}:auth"
+
+
+def cached_user_key(user_id):
+    version = get_version(USER_VERSION_KEY.format(user_id=user_id))
+    return CACHED_USER_KEY.format(user_id=user_id, version=version)
+
+
+def invalidate_cached_user(user_id):
+    """Drop the cached copy of a user that authentication resolves to."""
+    key = USER_VERSION_KEY.format(user_id=user_id)
+    bump_version(key)
+    # Again once the write is visible, so a request that cached the old row
+    # in the meantime doesn't keep it alive.
+    transaction.on_commit(lambda: bump_version(key))
+
+
+BLACKLISTED_TOKEN_KEY = "auth:blacklist:{jti}"
+
+
+def blacklisted_token_key(jti):
+    return BLACKLISTED_TOKEN_KEY.format(jti=jti)
@@ -0,0 +1,125 @@
+# Generated by Django 5.0.7 on 2026-10-18 20:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def merge_follow_edges(apps, schema_editor):
+    CustomerUser = apps.get_model("user", "CustomerUser")
+    Follow = apps.get_model("user", "Follow")
+
+    # a.following contains b, or b.followers contains a: both mean a -> b.
+    following = CustomerUser.following.through.objects.values_list(
+        "from_customeruser_id", "to_customeruser_id"
+    )
+    followers = CustomerUser.followers.through.objects.values_list(
+        "to_customeruser_id", "from_customeruser_id"
+    )
+    edges = set(following) | set(followers)
+    Follow.objects.bulk_create(
+        [
+            Follow(follower_id=follower_id, followee_id=followee_id)
+            for follower_id, followee_id in edges
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def split_follow_edges(apps, schema_editor):
+    CustomerUser = apps.get_model("user", "CustomerUser")
+    Follow = apps.get_model("user", "Follow")
+
+    edges = list(Follow.objects.values_list("follower_id", "followee_id"))
+    CustomerUser.following.through.objects.bulk_create(
+        [
+            CustomerUser.following.through(
+                from_customeruser_id=follower_id, to_customeruser_id=followee_id
+            )
+            for follower_id, followee_id in edges
+        ],
+        batch_size=1000,
+    )
+    CustomerUser.followers.through.objects.bulk_create(
+        [
+            CustomerUser.followers.through(
+                from_customeruser_id=followee_id, to_customeruser_id=follower_id
+            )
+            for follower_id, followee_id in edges
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Follow",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "followee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="follower_edges",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "follower",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="following_edges",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["follower", "-created_at"],
+                        name="follow_follower_created_idx",
+                    ),
+                    models.Index(
+                        fields=["followee", "-created_at"],
+                        name="follow_followee_created_idx",
+                    ),
+                ],
+                "unique_together": {("follower", "followee")},
+            },
+        ),
+        migrations.RunPython(merge_follow_edges, split_follow_edges),
+        migrations.RemoveField(
+            model_name="customeruser",
+            name="followers",
+        ),
+        migrations.RemoveField(
+            model_name="customeruser",
+            name="following",
+        ),
+        migrations.AddField(
+            model_name="customeruser",
+            name="following",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="followers",
+                through="user.Follow",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+    ]
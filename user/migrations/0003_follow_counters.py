@@ -0,0 +1,46 @@
+# Generated by Django 5.0.7 on 2026-10-18 20:58
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_edges(Follow, field):
+    counts = (
+        Follow.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def populate_counters(apps, schema_editor):
+    CustomerUser = apps.get_model("user", "CustomerUser")
+    Follow = apps.get_model("user", "Follow")
+    CustomerUser.objects.update(
+        followers_count=count_edges(Follow, "followee"),
+        following_count=count_edges(Follow, "follower"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0002_follow_edges"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customeruser",
+            name="followers_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="customeruser",
+            name="following_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-18 21:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0003_follow_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customeruser",
+            name="profile_picture_renditions",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
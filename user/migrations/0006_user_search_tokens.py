@@ -0,0 +1,90 @@
+# Generated by Django 5.0.7 on 2026-10-18 22:02
+
+import re
+import unicodedata
+from itertools import islice
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# A frozen copy of user.utils.search_tokens() as of this migration.
+TOKEN_MAX_LENGTH = 32
+BIO_MAX_TOKENS = 50
+TOKEN_RE = re.compile(r"\w+")
+NAME_WEIGHT, EMAIL_WEIGHT, BIO_WEIGHT = 3, 2, 1
+
+
+def tokenize(text):
+    text = unicodedata.normalize("NFKD", (text or "").casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [token[:TOKEN_MAX_LENGTH] for token in TOKEN_RE.findall(text)]
+
+
+def search_tokens(user):
+    tokens = {}
+    for token in tokenize(user.bio)[:BIO_MAX_TOKENS]:
+        tokens[token] = BIO_WEIGHT
+    for token in tokenize(user.email.partition("@")[0]):
+        tokens[token] = EMAIL_WEIGHT
+    for token in tokenize(f"{user.first_name} {user.last_name}"):
+        tokens[token] = NAME_WEIGHT
+    return tokens
+
+
+def index_existing_users(apps, schema_editor):
+    CustomerUser = apps.get_model("user", "CustomerUser")
+    UserSearchToken = apps.get_model("user", "UserSearchToken")
+
+    users = CustomerUser.objects.only("email", "first_name", "last_name", "bio")
+    tokens = (
+        UserSearchToken(user_id=user.pk, token=token, weight=weight)
+        for user in users.iterator(chunk_size=BATCH_SIZE)
+        for token, weight in search_tokens(user).items()
+    )
+    # Insert in batches; bulk_create() would hold every row in memory.
+    while batch := list(islice(tokens, BATCH_SIZE)):
+        UserSearchToken.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0005_purge_expired_tokens_schedule"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserSearchToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("token", models.CharField(max_length=32)),
+                ("weight", models.PositiveSmallIntegerField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_tokens",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["token", "user"], name="user_search_token_idx")
+                ],
+                "unique_together": {("user", "token")},
+            },
+        ),
+        migrations.RunPython(index_existing_users, migrations.RunPython.noop),
+    ]
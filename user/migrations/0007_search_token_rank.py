@@ -0,0 +1,43 @@
+# Generated by Django 5.0.7 on 2026-10-18 22:57
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_followers_count(apps, schema_editor):
+    CustomerUser = apps.get_model("user", "CustomerUser")
+    UserSearchToken = apps.get_model("user", "UserSearchToken")
+    UserSearchToken.objects.update(
+        followers_count=Subquery(
+            CustomerUser.objects.filter(pk=OuterRef("user")).values("followers_count")[
+                :1
+            ]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0006_user_search_tokens"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="usersearchtoken",
+            name="followers_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(copy_followers_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="usersearchtoken",
+            index=models.Index(
+                fields=["token", "-weight", "-followers_count", "user"],
+                name="user_search_rank_idx",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="usersearchtoken",
+            name="user_search_token_idx",
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.7 on 2026-10-18 23:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0007_search_token_rank"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="follow",
+            index=models.Index(
+                fields=["followee", "follower"], name="follow_followee_follower_idx"
+            ),
+        ),
+    ]
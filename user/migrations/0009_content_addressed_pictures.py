@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-18 23:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0008_follow_followee_follower_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="customeruser",
+            name="profile_picture",
+            field=models.ImageField(blank=True, null=True, upload_to=""),
+        ),
+    ]
@@ -1,12 +1,17 @@
-import os.path
-from django.contrib.auth.base_user import BaseUserManager
-from django.db import models
-from django.contrib.auth.models import AbstractUser
 import os
 import uuid
+
+from django.contrib.auth.base_user import BaseUserManager
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.contrib.auth.models import AbstractUser
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
+from .cache import invalidate_cached_user
+from .utils import SEARCH_TOKEN_MAX_LENGTH
+
 
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
@@ -42,6 +47,7 @@ class UserManager(BaseUserManager):
 
 
 def profile_image_file_path(instance, filename):
+    # Referenced by migration 0001; pictures are now stored by content digest.
     _, extension = os.path.splitext(filename)
     filename = f"{slugify(instance.username)}-{uuid.uuid4()}{extension}"
     return os.path.join("uploads/profile_pics", filename)
@@ -50,16 +56,19 @@ def profile_image_file_path(instance, filename):
 class CustomerUser(AbstractUser):
     bio = models.TextField(blank=True, null=True)
     email = models.EmailField(_("email address"), unique=True)
-    profile_picture = models.ImageField(
-        upload_to=profile_image_file_path, blank=True, null=True
-    )
+    profile_picture = models.ImageField(blank=True, null=True)
+    profile_picture_renditions = models.JSONField(default=dict, blank=True)
     is_active = models.BooleanField(default=True)
-    followers = models.ManyToManyField(
-        "self", blank=True, related_name="user_followers", symmetrical=False
-    )
     following = models.ManyToManyField(
-        "self", blank=True, related_name="user_following", symmetrical=False
+        "self",
+        blank=True,
+        through="Follow",
+        through_fields=("follower", "followee"),
+        related_name="followers",
+        symmetrical=False,
     )
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
 
     username = None
 
@@ -69,9 +78,78 @@ class CustomerUser(AbstractUser):
     objects = UserManager()
 
     def follow(self, user):
-        self.following.add(user)
-        user.followers.add(self)
+        with transaction.atomic():
+            _, created = Follow.objects.get_or_create(follower=self, followee=user)
+            if created:
+                self._adjust_follow_counters(user, 1)
 
     def unfollow(self, user):
-        self.following.remove(user)
-        user.followers.remove(self)
+        with transaction.atomic():
+            deleted, _ = Follow.objects.filter(follower=self, followee=user).delete()
+            if deleted:
+                self._adjust_follow_counters(user, -1)
+
+    def _adjust_follow_counters(self, user, delta):
+        CustomerUser.objects.filter(pk=self.pk).update(
+            following_count=Greatest(F("following_count") + delta, 0)
+        )
+        CustomerUser.objects.filter(pk=user.pk).update(
+            followers_count=Greatest(F("followers_count") + delta, 0)
+        )
+        # Search ranks ties by the follower count kept on each token.
+        UserSearchToken.objects.filter(user=user).update(
+            followers_count=Greatest(F("followers_count") + delta, 0)
+        )
+        invalidate_cached_user(self.pk)
+        invalidate_cached_user(user.pk)
+
+
+class Follow(models.Model):
+    follower = models.ForeignKey(
+        CustomerUser, on_delete=models.CASCADE, related_name="following_edges"
+    )
+    followee = models.ForeignKey(
+        CustomerUser, on_delete=models.CASCADE, related_name="follower_edges"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("follower", "followee")
+        indexes = [
+            models.Index(
+                fields=["follower", "-created_at"], name="follow_follower_created_idx"
+            ),
+            models.Index(
+                fields=["followee", "-created_at"], name="follow_followee_created_idx"
+            ),
+            models.Index(
+                fields=["followee", "follower"], name="follow_followee_follower_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.follower} -> {self.followee}"
+
+
+class UserSearchToken(models.Model):
+    """A normalized word of a user's name, email or bio, for typeahead search."""
+
+    user = models.ForeignKey(
+        CustomerUser, on_delete=models.CASCADE, related_name="search_tokens"
+    )
+    token = models.CharField(max_length=SEARCH_TOKEN_MAX_LENGTH)
+    weight = models.PositiveSmallIntegerField()
+    # A copy of the user's, so matches are ranked from the index alone.
+    followers_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("user", "token")
+        indexes = [
+            models.Index(
+                fields=["token", "-weight", "-followers_count", "user"],
+                name="user_search_rank_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user} ~ {self.token}"
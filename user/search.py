@@ -0,0 +1,84 @@
+"""
+Typeahead search over user profiles.
+
+Every user has a ``UserSearchToken`` per word of their name, email
+local-part and bio, which also carries the rank of the match: the weight of
+the field the word came from and the user's follower count. A query word
+matches the tokens it is a prefix of, a range scan on the
+``(token, -weight, -followers_count, user)`` index, so the best ``limit``
+matches are picked from that index alone, without reading or ranking rows
+of the users table.
+"""
+
+from django.db import transaction
+
+from .models import UserSearchToken
+from .utils import SEARCH_MIN_TERM_LENGTH, prefix_range, search_tokens, tokenize
+
+# Saving any of these fields changes a user's tokens.
+SEARCH_FIELDS = {"email", "first_name", "last_name", "bio"}
+
+
+def prefix_matches(prefix):
+    lower, upper = prefix_range(prefix)
+    return UserSearchToken.objects.filter(token__gte=lower, token__lt=upper)
+
+
+def index_users(users):
+    """Rebuild the search tokens of ``users``."""
+    users = list(users)
+    with transaction.atomic():
+        UserSearchToken.objects.filter(user__in=users).delete()
+        UserSearchToken.objects.bulk_create(
+            [
+                UserSearchToken(
+                    user=user,
+                    token=token,
+                    weight=weight,
+                    followers_count=user.followers_count,
+                )
+                for user in users
+                for token, weight in search_tokens(user).items()
+            ],
+            batch_size=1000,
+        )
+
+
+def search_terms(query):
+    """The distinct words of ``query`` that are long enough to search by."""
+    return [
+        term
+        for term in dict.fromkeys(tokenize(query))
+        if len(term) >= SEARCH_MIN_TERM_LENGTH
+    ]
+
+
+def search_user_ids(query, limit):
+    """
+    Return the ids of the ``limit`` best users with a word starting with
+    every word of ``query``.
+
+    The last word is the one being typed. Users it matches by name come
+    first, then by email, then by bio; ties go to the most followed.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    matches = prefix_matches(terms[-1])
+    for term in terms[:-1]:
+        matches = matches.filter(user__in=prefix_matches(term).values("user"))
+    matches = matches.order_by("-weight", "-followers_count", "user").values_list(
+        "user", flat=True
+    )
+
+    # A user with several words starting with the term is listed once per
+    # word, best first, so read past the duplicates.
+    user_ids, offset, window = {}, 0, limit * 2
+    while len(user_ids) < limit:
+        rows = list(matches[offset : offset + window])
+        user_ids.update(dict.fromkeys(rows))
+        if len(rows) < window:
+            break
+        offset += window
+    return list(user_ids)[:limit]
@@ -1,16 +1,38 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework import serializers
 from django.utils.translation import gettext as _
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.db import transaction
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.tokens import UntypedToken
+from social_api.fieldsets import SparseFieldsetSerializerMixin
+from social_api.serializers import RenditionsField, StrippedImageField
+from .search import search_terms
+from .tasks import generate_profile_renditions
+from .tokens import RefreshToken, is_blacklisted
+from .utils import SEARCH_MIN_TERM_LENGTH
 
 CustomerUser = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    profile_picture = StrippedImageField(required=False, allow_null=True)
+    profile_picture_renditions = RenditionsField()
+
     class Meta:
         model = get_user_model()
-        fields = ("id", "email", "password", "bio", "profile_picture", "is_staff")
-        read_only_fields = ("is_staff",)
+        fields = (
+            "id",
+            "email",
+            "password",
+            "bio",
+            "profile_picture",
+            "profile_picture_renditions",
+            "is_staff",
+            "followers_count",
+            "following_count",
+        )
+        read_only_fields = ("is_staff", "followers_count", "following_count")
         extra_kwargs = {
             "password": {
                 "write_only": True,
@@ -22,7 +44,9 @@ class UserSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """Create a new user with encrypted password and return it"""
-        return get_user_model().objects.create_user(**validated_data)
+        user = get_user_model().objects.create_user(**validated_data)
+        self.schedule_renditions(user, validated_data)
+        return user
 
     def update(self, instance, validated_data):
         """Update a user, set the password correctly and return it"""
@@ -31,9 +55,37 @@ class UserSerializer(serializers.ModelSerializer):
         if password:
             user.set_password(password)
             user.save()
+        self.schedule_renditions(user, validated_data)
 
         return user
 
+    def schedule_renditions(self, user, validated_data):
+        if validated_data.get("profile_picture"):
+            transaction.on_commit(lambda: generate_profile_renditions.delay(user.id))
+
+
+class UserCardSerializer(serializers.ModelSerializer):
+    profile_picture_renditions = RenditionsField()
+
+    class Meta:
+        model = get_user_model()
+        fields = ("id", "email", "profile_picture", "profile_picture_renditions")
+        read_only_fields = fields
+
+
+class UserSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField()
+    limit = serializers.IntegerField(
+        min_value=1, max_value=settings.API_MAX_PAGE_SIZE, default=10
+    )
+
+    def validate_q(self, value):
+        if not search_terms(value):
+            raise serializers.ValidationError(
+                f"Enter a word of at least {SEARCH_MIN_TERM_LENGTH} letters."
+            )
+        return value
+
 
 class AuthTokenSerializer(serializers.Serializer):
     email = serializers.CharField(label=_("Email"))
@@ -82,5 +134,16 @@ class LogoutSerializer(serializers.Serializer):
             self.fail("invalid_token")
 
 
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    token_class = RefreshToken
+
+
+class TokenVerifySerializer(jwt_serializers.TokenVerifySerializer):
+    def validate(self, attrs):
+        if is_blacklisted(UntypedToken(attrs["token"])):
+            raise serializers.ValidationError("Token is blacklisted")
+        return {}
+
+
 class FollowUnfollowSerializer(serializers.Serializer):
     email = serializers.EmailField()
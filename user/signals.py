@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .cache import invalidate_cached_user
+from .search import SEARCH_FIELDS, index_users
+from .tokens import remember_blacklisted
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_authenticated_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=get_user_model())
+def index_search_tokens(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCH_FIELDS.intersection(update_fields):
+        return
+    index_users([instance])
+
+
+# Only additions matter: a deleted row belongs to an expired token, which is
+# rejected anyway, and keeping post_delete unconnected lets the purge task
+# fast-delete.
+@receiver(post_save, sender=BlacklistedToken)
+def cache_blacklisted_token(sender, instance, created, **kwargs):
+    if created:
+        token = instance.token
+        remember_blacklisted(token.jti, token.expires_at)
+        # Again once the row is visible, over a lookup that missed it.
+        transaction.on_commit(lambda: remember_blacklisted(token.jti, token.expires_at))
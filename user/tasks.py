@@ -0,0 +1,56 @@
+from celery import shared_task
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from social_api.images import render_renditions, rendition_names
+from social_api.models import MediaBlob
+
+from .cache import invalidate_cached_user
+
+
+@shared_task
+def generate_profile_renditions(user_id):
+    """Render resized copies of a profile picture and record their names."""
+    User = get_user_model()
+    user = User.objects.filter(pk=user_id).first()
+    if user is None or not user.profile_picture:
+        return
+
+    renditions = render_renditions(user.profile_picture)
+    with transaction.atomic():
+        MediaBlob.objects.acquire(rendition_names(renditions))
+        updated = User.objects.filter(
+            pk=user_id, profile_picture=user.profile_picture.name
+        ).update(profile_picture_renditions=renditions)
+        if updated:
+            MediaBlob.objects.release(rendition_names(user.profile_picture_renditions))
+            invalidate_cached_user(user_id)
+        else:
+            # The picture was replaced while rendering; its own task takes over.
+            MediaBlob.objects.release(rendition_names(renditions))
+
+
+@shared_task
+def purge_expired_tokens(batch_size=None):
+    """Delete expired outstanding tokens and their blacklist rows, in batches."""
+    batch_size = batch_size or settings.TOKEN_PURGE_BATCH_SIZE
+    purged = 0
+    while True:
+        token_ids = list(
+            OutstandingToken.objects.filter(expires_at__lte=timezone.now())
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not token_ids:
+            break
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=token_ids).delete()
+            OutstandingToken.objects.filter(pk__in=token_ids).delete()
+        purged += len(token_ids)
+    return purged
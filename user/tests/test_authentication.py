@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from user.cache import cached_user_key
+
+User = get_user_model()
+MANAGE_USER_URL = reverse("user:manage")
+FOLLOW_URL = reverse("user:follow-unfollow")
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password123"
+        )
+        self.authenticate(self.user)
+
+    def authenticate(self, user):
+        token = AccessToken.for_user(user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def test_user_is_resolved_from_cache(self):
+        self.client.get(MANAGE_USER_URL)
+        with self.assertNumQueries(0):
+            response = self.client.get(MANAGE_USER_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["email"], self.user.email)
+
+    def test_password_hash_is_not_cached(self):
+        self.client.get(MANAGE_USER_URL)
+        cached = cache.get(cached_user_key(self.user.id))
+
+        self.assertNotIn("password", cached["fields"])
+        self.assertNotIn(self.user.password, repr(cached))
+        self.assertEqual(cached["fields"]["email"], self.user.email)
+
+    def test_cached_user_keeps_its_password_on_save(self):
+        self.client.get(MANAGE_USER_URL)
+        response = self.client.patch(MANAGE_USER_URL, {"bio": "Updated"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("password123"))
+
+    def test_update_is_visible_on_next_request(self):
+        self.client.get(MANAGE_USER_URL)
+        self.client.patch(MANAGE_USER_URL, {"bio": "Updated"})
+        response = self.client.get(MANAGE_USER_URL)
+        self.assertEqual(response.data["bio"], "Updated")
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(MANAGE_USER_URL)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(MANAGE_USER_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_rejected(self):
+        self.client.get(MANAGE_USER_URL)
+        self.user.delete()
+        response = self.client.get(MANAGE_USER_URL)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_follow_counters_are_refreshed(self):
+        other = User.objects.create_user(
+            email="other@example.com", password="password123"
+        )
+        self.client.get(MANAGE_USER_URL)
+        self.client.post(FOLLOW_URL, {"email": other.email})
+        response = self.client.get(MANAGE_USER_URL)
+        self.assertEqual(response.data["following_count"], 1)
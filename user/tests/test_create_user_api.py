@@ -2,6 +2,7 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
+from user.models import Follow
 
 User = get_user_model()
 CREATE_USER_URL = reverse("user:create")
@@ -70,3 +71,16 @@ class UserTests(APITestCase):
         response = self.client.delete(url, data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertFalse(self.user.following.filter(email=follow_user.email).exists())
+
+    def test_follow_is_stored_once_and_visible_from_both_sides(self):
+        follow_user = User.objects.create_user(
+            email="followuser@example.com", password="followpassword"
+        )
+        self.user.follow(follow_user)
+        self.user.follow(follow_user)
+        self.assertEqual(Follow.objects.count(), 1)
+        self.assertEqual(list(follow_user.followers.all()), [self.user])
+        self.assertEqual(list(self.user.following.all()), [follow_user])
+
+        self.user.unfollow(follow_user)
+        self.assertFalse(Follow.objects.exists())
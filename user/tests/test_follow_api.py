@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+FOLLOW_URL = reverse("user:follow-unfollow")
+
+
+class FollowListTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="testuser@example.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.others = [
+            User.objects.create_user(
+                email=f"user{i}@example.com", password="testpassword"
+            )
+            for i in range(3)
+        ]
+
+    def collect_pages(self, view_type):
+        emails = []
+        response = self.client.get(FOLLOW_URL, {"view_type": view_type, "page_size": 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            emails.extend(user["email"] for user in response.data["results"])
+            if not response.data["next"]:
+                return emails
+            response = self.client.get(response.data["next"])
+
+    def test_following_is_paginated_newest_first(self):
+        for other in self.others:
+            self.user.follow(other)
+        self.assertEqual(
+            self.collect_pages("following"),
+            [other.email for other in reversed(self.others)],
+        )
+
+    def test_followers_use_slim_cards(self):
+        self.others[0].follow(self.user)
+        response = self.client.get(FOLLOW_URL, {"view_type": "followers"})
+        self.assertEqual(
+            set(response.data["results"][0]),
+            {"id", "email", "profile_picture", "profile_picture_renditions"},
+        )
+
+    def test_invalid_view_type(self):
+        response = self.client.get(FOLLOW_URL, {"view_type": "friends"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_counters_follow_and_unfollow(self):
+        target = self.others[0]
+        self.client.post(FOLLOW_URL, {"email": target.email})
+        self.client.post(FOLLOW_URL, {"email": target.email})
+        self.user.refresh_from_db()
+        target.refresh_from_db()
+        self.assertEqual(self.user.following_count, 1)
+        self.assertEqual(target.followers_count, 1)
+
+        response = self.client.get(reverse("user:manage"))
+        self.assertEqual(response.data["following_count"], 1)
+
+        self.client.delete(FOLLOW_URL, {"email": target.email})
+        self.client.delete(FOLLOW_URL, {"email": target.email})
+        self.user.refresh_from_db()
+        target.refresh_from_db()
+        self.assertEqual(self.user.following_count, 0)
+        self.assertEqual(target.followers_count, 0)
@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+
+class UserSparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="test@gmail.com", password="testpassword", bio="Hi"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_profiles_list_fields(self):
+        response = self.client.get(reverse("user:profile"), {"fields": "id,email"})
+        self.assertEqual(
+            response.data, [{"id": self.user.id, "email": self.user.email}]
+        )
+
+    def test_profile_etag_depends_on_fields(self):
+        url = reverse("user:user-profile", args=[self.user.email])
+        full = self.client.get(url)
+        sparse = self.client.get(url, {"fields": "bio"})
+
+        self.assertEqual(sparse.data, {"bio": "Hi"})
+        self.assertNotEqual(full["ETag"], sparse["ETag"])
+        response = self.client.get(
+            url, {"fields": "bio"}, HTTP_IF_NONE_MATCH=sparse["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,96 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from user.cache import blacklisted_token_key
+from user.tasks import purge_expired_tokens
+
+User = get_user_model()
+LOGOUT_URL = reverse("user:logout")
+REFRESH_URL = reverse("user:token_refresh")
+VERIFY_URL = reverse("user:token_verify")
+
+
+class TokenBlacklistTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.refresh_token = str(RefreshToken.for_user(self.user))
+
+    def test_refresh_does_not_query_blacklist(self):
+        self.client.post(REFRESH_URL, {"refresh": self.refresh_token})
+        with self.assertNumQueries(0):
+            response = self.client.post(REFRESH_URL, {"refresh": self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_logged_out_token_is_rejected(self):
+        self.client.post(REFRESH_URL, {"refresh": self.refresh_token})
+        self.client.post(LOGOUT_URL, {"refresh": self.refresh_token})
+
+        response = self.client.post(REFRESH_URL, {"refresh": self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(VERIFY_URL, {"token": self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_logout_caches_the_token_until_it_expires(self):
+        token = RefreshToken(self.refresh_token)
+        with mock.patch("user.tokens.cache.set") as cache_set:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(LOGOUT_URL, {"refresh": self.refresh_token})
+
+        key, value = cache_set.call_args.args
+        self.assertEqual((key, value), (blacklisted_token_key(token["jti"]), True))
+        lifetime = token["exp"] - timezone.now().timestamp()
+        self.assertAlmostEqual(cache_set.call_args.kwargs["timeout"], lifetime, delta=2)
+
+    def test_uncached_token_is_looked_up_alone(self):
+        self.client.post(LOGOUT_URL, {"refresh": self.refresh_token})
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            response = self.client.post(VERIFY_URL, {"token": self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.assertNumQueries(0):
+            response = self.client.post(VERIFY_URL, {"token": self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_verify_accepts_live_token(self):
+        response = self.client.post(VERIFY_URL, {"token": self.refresh_token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class PurgeExpiredTokensTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password123"
+        )
+
+    def create_token(self, jti, expires_at):
+        return OutstandingToken.objects.create(
+            user=self.user, jti=jti, token=jti, expires_at=expires_at
+        )
+
+    def test_purges_expired_tokens_in_batches(self):
+        now = timezone.now()
+        for index in range(5):
+            token = self.create_token(f"expired-{index}", now - timedelta(hours=1))
+            BlacklistedToken.objects.create(token=token)
+        live = self.create_token("live", now + timedelta(hours=1))
+        BlacklistedToken.objects.create(token=live)
+
+        self.assertEqual(purge_expired_tokens(batch_size=2), 5)
+        self.assertEqual(list(OutstandingToken.objects.all()), [live])
+        self.assertEqual(BlacklistedToken.objects.get().token, live)
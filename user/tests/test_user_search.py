@@ -0,0 +1,100 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from user.models import UserSearchToken
+
+User = get_user_model()
+SEARCH_URL = reverse("user:user-search")
+PROFILES_URL = reverse("user:profile")
+
+
+class UserSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.viewer = User.objects.create_user(
+            email="viewer@gmail.com", password="testpassword"
+        )
+        self.client.force_authenticate(user=self.viewer)
+
+    def search(self, q, **params):
+        response = self.client.get(SEARCH_URL, {"q": q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [user["email"] for user in response.data]
+
+    def test_tokens_follow_profile_changes(self):
+        user = User.objects.create_user(
+            email="jo.smith@gmail.com", password="testpassword", bio="Café owner"
+        )
+        tokens = set(user.search_tokens.values_list("token", flat=True))
+        self.assertEqual(tokens, {"jo", "smith", "cafe", "owner"})
+
+        user.first_name = "Joanna"
+        user.save()
+        self.assertTrue(user.search_tokens.filter(token="joanna").exists())
+
+        user.delete()
+        self.assertFalse(UserSearchToken.objects.filter(token="joanna").exists())
+
+    def test_prefix_match_on_every_word(self):
+        User.objects.create_user(
+            email="a@gmail.com", password="x", first_name="Anna", last_name="Smith"
+        )
+        User.objects.create_user(
+            email="b@gmail.com", password="x", first_name="Anna", last_name="Jones"
+        )
+
+        self.assertEqual(sorted(self.search("ann")), ["a@gmail.com", "b@gmail.com"])
+        self.assertEqual(self.search("ann smi"), ["a@gmail.com"])
+        # Words too short to search by are ignored while they are typed.
+        self.assertEqual(sorted(self.search("ann s")), ["a@gmail.com", "b@gmail.com"])
+        self.assertEqual(self.search("SMÍTH"), ["a@gmail.com"])
+        self.assertEqual(self.search("annabel"), [])
+
+    def test_ranks_by_field_then_followers(self):
+        bio = User.objects.create_user(email="c@gmail.com", password="x", bio="Sam")
+        popular = User.objects.create_user(
+            email="d@gmail.com", password="x", first_name="Samuel"
+        )
+        newcomer = User.objects.create_user(
+            email="e@gmail.com", password="x", first_name="Sam"
+        )
+        self.viewer.follow(popular)
+        self.viewer.follow(bio)
+        User.objects.create_user(email="f@gmail.com", password="x").follow(bio)
+
+        self.assertEqual(
+            self.search("sam"), ["d@gmail.com", "e@gmail.com", "c@gmail.com"]
+        )
+        self.assertEqual(self.search("sam", limit=1), ["d@gmail.com"])
+
+        self.viewer.unfollow(popular)
+        self.viewer.follow(newcomer)
+        self.assertEqual(self.search("sam", limit=2), ["e@gmail.com", "d@gmail.com"])
+
+    def test_user_matching_several_words_is_listed_once(self):
+        User.objects.create_user(
+            email="sam.samson@gmail.com", password="x", first_name="Samantha"
+        )
+        User.objects.create_user(email="g@gmail.com", password="x", bio="Samba")
+
+        self.assertEqual(
+            self.search("sam", limit=2), ["sam.samson@gmail.com", "g@gmail.com"]
+        )
+
+    def test_search_runs_two_queries(self):
+        User.objects.create_user(email="h@gmail.com", password="x", first_name="Hal")
+        # The ranked token ids, then the users on the page.
+        with self.assertNumQueries(2):
+            self.assertEqual(self.search("hal"), ["h@gmail.com"])
+
+    def test_query_is_validated(self):
+        for q in ("a", "a.", "ab cd"):
+            response = self.client.get(SEARCH_URL, {"q": q})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, q)
+
+    def test_profiles_list_ignores_username(self):
+        response = self.client.get(PROFILES_URL, {"username": "viewer"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,48 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .cache import blacklisted_token_key
+
+
+def is_blacklisted(token):
+    """
+    Whether ``token`` has been blacklisted.
+
+    Each token id is looked up once and the answer is cached until the
+    token expires, so refresh and verify rarely query the blacklist table.
+    Logouts mark their token in the cache as they commit.
+    """
+    jti = token.get(api_settings.JTI_CLAIM)
+    key = blacklisted_token_key(jti)
+    blacklisted = cache.get(key)
+    if blacklisted is None:
+        blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        timeout = math.ceil(token.get("exp", 0) - time.time())
+        if not blacklisted:
+            timeout = min(timeout, settings.TOKEN_BLACKLIST_CACHE_TIMEOUT)
+        if timeout > 0:
+            # add(), so a logout cached meanwhile isn't overwritten.
+            cache.add(key, blacklisted, timeout=timeout)
+    return blacklisted
+
+
+def remember_blacklisted(jti, expires_at):
+    """Cache that token ``jti`` is blacklisted until it expires anyway."""
+    timeout = math.ceil((expires_at - timezone.now()).total_seconds())
+    if timeout > 0:
+        cache.set(blacklisted_token_key(jti), True, timeout=timeout)
+
+
+class RefreshToken(tokens.RefreshToken):
+    def check_blacklist(self):
+        if is_blacklisted(self):
+            raise TokenError(_("Token is blacklisted"))
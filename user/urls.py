@@ -5,11 +5,13 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
+from user import async_views
 from user.views import (
     CreateUserView,
     ManageUserView,
     LogoutView,
     UsersList,
+    UserSearchView,
     UserProfileView,
     FollowUnfollowView,
 )
@@ -23,7 +25,13 @@ urlpatterns = [
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
     path("me/", ManageUserView.as_view(), name="manage"),
     path("profiles/", UsersList.as_view(), name="profile"),
+    path("users/search/", UserSearchView.as_view(), name="user-search"),
     path("users/<str:email>/", UserProfileView.as_view(), name="user-profile"),
+    path(
+        "async/users/<str:email>/",
+        async_views.UserProfileView.as_view(),
+        name="async-user-profile",
+    ),
     path("follow-unfollow/", FollowUnfollowView.as_view(), name="follow-unfollow"),
     path("logout/", LogoutView.as_view(), name="logout"),
 ]
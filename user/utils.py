@@ -0,0 +1,43 @@
+import re
+import unicodedata
+
+SEARCH_TOKEN_MAX_LENGTH = 32
+# Shorter query words match too many tokens to rank quickly.
+SEARCH_MIN_TERM_LENGTH = 3
+SEARCH_BIO_MAX_TOKENS = 50
+SEARCH_TOKEN_RE = re.compile(r"\w+")
+
+# Better matches rank first: a name beats an email local-part beats a bio.
+NAME_WEIGHT = 3
+EMAIL_WEIGHT = 2
+BIO_WEIGHT = 1
+
+
+def tokenize(text):
+    """Split text into lowercased words with accents stripped."""
+    text = unicodedata.normalize("NFKD", (text or "").casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [token[:SEARCH_TOKEN_MAX_LENGTH] for token in SEARCH_TOKEN_RE.findall(text)]
+
+
+def search_tokens(user):
+    """
+    Return ``{token: weight}`` for the words a user can be found by: their
+    first and last name, the local part of their email and their bio.
+    """
+    tokens = {}
+    for token in tokenize(user.bio)[:SEARCH_BIO_MAX_TOKENS]:
+        tokens[token] = BIO_WEIGHT
+    for token in tokenize(user.email.partition("@")[0]):
+        tokens[token] = EMAIL_WEIGHT
+    for token in tokenize(f"{user.first_name} {user.last_name}"):
+        tokens[token] = NAME_WEIGHT
+    return tokens
+
+
+def prefix_range(prefix):
+    """
+    Return the ``(lower, upper)`` bounds of the strings starting with
+    ``prefix``, so a prefix match can be a range scan on a plain index.
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import status, generics, permissions
 from rest_framework.authtoken.serializers import AuthTokenSerializer
 from rest_framework.authtoken.views import ObtainAuthToken
@@ -7,8 +8,24 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 from rest_framework.views import APIView
-from .serializers import UserSerializer, LogoutSerializer, FollowUnfollowSerializer
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from .models import Follow
+from .search import search_user_ids
+from .serializers import (
+    UserSerializer,
+    UserCardSerializer,
+    UserSearchQuerySerializer,
+    LogoutSerializer,
+    FollowUnfollowSerializer,
+)
+from social_media_api.replicas import ReplicaReadsMixin
+from social_api.conditional import not_modified, set_validators, user_etag
+from social_api.fieldsets import SparseFieldsetMixin
+from social_api.models import TimelineEntry
+from social_api.pagination import FollowCursorPagination
 from social_api.permissions import IsOwnerReadOnly
+from social_api.tasks import backfill_timeline
 
 CustomerUser = get_user_model()
 
@@ -22,7 +39,7 @@ class CreateTokenView(ObtainAuthToken):
     serializer_class = AuthTokenSerializer
 
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+class ManageUserView(SparseFieldsetMixin, generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = (IsAuthenticated,)
 
@@ -30,17 +47,14 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
         return self.request.user
 
 
-class UsersList(generics.ListAPIView):
+class UsersList(ReplicaReadsMixin, SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = UserSerializer
 
     def get_queryset(self):
         queryset = CustomerUser.objects.all()
-        username = self.request.query_params.get("username")
         email = self.request.query_params.get("email")
         bio = self.request.query_params.get("bio")
 
-        if username:
-            queryset = queryset.filter(username__icontains=username)
         if email:
             queryset = queryset.filter(email__icontains=email)
         if bio:
@@ -49,11 +63,46 @@ class UsersList(generics.ListAPIView):
         return queryset
 
 
-class UserProfileView(generics.RetrieveUpdateDestroyAPIView):
+class UserSearchView(ReplicaReadsMixin, APIView):
+    @extend_schema(
+        parameters=[UserSearchQuerySerializer],
+        responses=UserCardSerializer(many=True),
+    )
+    def get(self, request):
+        """
+        Typeahead search for users by name, email or bio.
+
+        Every word of ``q`` with at least three letters is matched as a
+        prefix; returns the ``limit`` best matches.
+        """
+        query = UserSearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        user_ids = search_user_ids(
+            query.validated_data["q"], query.validated_data["limit"]
+        )
+        users = CustomerUser.objects.only(*UserCardSerializer.Meta.fields).in_bulk(
+            user_ids
+        )
+        serializer = UserCardSerializer(
+            [users[pk] for pk in user_ids if pk in users], many=True
+        )
+        return Response(serializer.data)
+
+
+class UserProfileView(SparseFieldsetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = CustomerUser.objects.all()
     serializer_class = UserSerializer
     lookup_field = "email"
 
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = user_etag(request, instance)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        serializer = self.get_serializer(instance)
+        return set_validators(Response(serializer.data), etag)
+
 
 class LogoutView(APIView):
     permission_classes = (permissions.IsAuthenticated, IsOwnerReadOnly)
@@ -68,6 +117,7 @@ class LogoutView(APIView):
 
 class FollowUnfollowView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scopes = {"post": "follow", "delete": "follow"}
 
     def post(self, request, *args, **kwargs):
         serializer = FollowUnfollowSerializer(data=request.data)
@@ -75,6 +125,9 @@ class FollowUnfollowView(APIView):
         email = serializer.validated_data["email"]
         user_to_follow = get_object_or_404(CustomerUser, email=email)
         request.user.follow(user_to_follow)
+        transaction.on_commit(
+            lambda: backfill_timeline.delay(request.user.id, user_to_follow.id)
+        )
         return Response(
             {"detail": f"You are now following {email}"}, status=status.HTTP_200_OK
         )
@@ -85,22 +138,45 @@ class FollowUnfollowView(APIView):
         email = serializer.validated_data["email"]
         user_to_unfollow = get_object_or_404(CustomerUser, email=email)
         request.user.unfollow(user_to_unfollow)
+        TimelineEntry.objects.filter(
+            user=request.user, post__author=user_to_unfollow
+        ).delete()
         return Response(
             {"detail": f"You have unfollowed {email}"}, status=status.HTTP_200_OK
         )
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="view_type",
+                type=OpenApiTypes.STR,
+                enum=["following", "followers"],
+                required=True,
+                description="List the accounts you follow or your followers",
+            ),
+        ],
+        responses=UserCardSerializer(many=True),
+    )
     def get(self, request, *args, **kwargs):
         view_type = request.query_params.get("view_type")
         if view_type == "following":
-            following_users = request.user.following.all()
-            serializer = UserSerializer(following_users, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            edges = Follow.objects.filter(follower=request.user)
+            user_field = "followee"
         elif view_type == "followers":
-            followers = request.user.followers.all()
-            serializer = UserSerializer(followers, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            edges = Follow.objects.filter(followee=request.user)
+            user_field = "follower"
         else:
             return Response(
                 {"detail": "Invalid view_type parameter"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+
+        edges = edges.select_related(user_field).only(
+            "created_at",
+            *(f"{user_field}__{field}" for field in UserCardSerializer.Meta.fields),
+        )
+        paginator = FollowCursorPagination()
+        page = paginator.paginate_queryset(edges, request, view=self)
+        users = [getattr(edge, user_field) for edge in page]
+        serializer = UserCardSerializer(users, many=True)
+        return paginator.get_paginated_response(serializer.data)